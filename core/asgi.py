@@ -2,6 +2,8 @@
 ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests are handled by Django; WebSocket connections to
+``/ws/boards/<pk>/`` stream the change events of a board.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +15,12 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from taskboard.realtime import board_socket
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        return await board_socket(scope, receive, send)
+    return await django_application(scope, receive, send)
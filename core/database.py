@@ -0,0 +1,138 @@
+"""
+Builds the DATABASES setting from environment variables.
+
+DB_ENGINE              sqlite (default), postgresql or mysql
+DB_NAME                database name, or the file path for SQLite (default: db.sqlite3 in the project)
+DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+DB_CONN_MAX_AGE        seconds a connection is reused across requests; 0 closes it after each request,
+                       "none" keeps it open indefinitely (default: 60)
+DB_CONN_HEALTH_CHECKS  check reused connections before a request uses them (default: true)
+DB_POOL                PostgreSQL only: use a psycopg connection pool instead of persistent connections
+DB_REPLICAS            comma-separated read replicas, added as replica1, replica2, ...; file paths for SQLite,
+                       host names otherwise (the replicas share all other settings with the primary)
+DB_SQLITE_BUSY_TIMEOUT milliseconds a writer waits for the lock before failing (default: 5000)
+DB_SQLITE_SYNCHRONOUS  SQLite synchronous pragma (default: NORMAL, safe in WAL mode)
+DB_SQLITE_MMAP_SIZE    bytes of the database file SQLite maps into memory (default: 256 MiB)
+"""
+
+ENGINES = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'postgresql': 'django.db.backends.postgresql',
+    'mysql': 'django.db.backends.mysql',
+}
+
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def env_flag(env, name, default):
+    """
+    Reads a boolean environment variable; accepts true/false, 1/0, yes/no and on/off.
+    """
+    value = env.get(name)
+    if value is None or value == '':
+        return default
+    value = value.strip().lower()
+    if value in ('1', 'true', 'yes', 'on'):
+        return True
+    if value in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f'{name} must be true or false, got {value!r}.')
+
+
+def env_int(env, name, default):
+    """
+    Reads a non-negative integer environment variable.
+    """
+    value = env.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer, got {value!r}.')
+    if number < 0:
+        raise ValueError(f'{name} must not be negative.')
+    return number
+
+
+def conn_max_age(env):
+    """
+    Returns CONN_MAX_AGE; "none" means connections are never closed for age.
+    """
+    if env.get('DB_CONN_MAX_AGE', '').strip().lower() == 'none':
+        return None
+    return env_int(env, 'DB_CONN_MAX_AGE', 60)
+
+
+def sqlite_options(env):
+    """
+    Returns the SQLite options: WAL journal, busy timeout, synchronous and mmap pragmas run on every new connection.
+    Write transactions start with BEGIN IMMEDIATE so concurrent writers queue on the busy timeout
+    instead of failing with "database is locked" when a read transaction upgrades to a write.
+    """
+    busy_timeout = env_int(env, 'DB_SQLITE_BUSY_TIMEOUT', 5000)
+    synchronous = env.get('DB_SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+    if synchronous not in SYNCHRONOUS_MODES:
+        raise ValueError(f'DB_SQLITE_SYNCHRONOUS must be one of {", ".join(SYNCHRONOUS_MODES)}.')
+    mmap_size = env_int(env, 'DB_SQLITE_MMAP_SIZE', 256 * 1024 * 1024)
+    pragmas = [
+        'PRAGMA journal_mode=WAL',
+        f'PRAGMA busy_timeout={busy_timeout}',
+        f'PRAGMA synchronous={synchronous}',
+        f'PRAGMA mmap_size={mmap_size}',
+    ]
+    return {
+        'timeout': busy_timeout / 1000,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': ';'.join(pragmas),
+    }
+
+
+def database_config(env, base_dir):
+    """
+    Returns the default database settings for the given environment mapping.
+    """
+    engine = env.get('DB_ENGINE', 'sqlite').strip().lower()
+    if engine not in ENGINES:
+        raise ValueError(f'DB_ENGINE must be one of {", ".join(ENGINES)}.')
+
+    config = {
+        'ENGINE': ENGINES[engine],
+        'CONN_MAX_AGE': conn_max_age(env),
+        'CONN_HEALTH_CHECKS': env_flag(env, 'DB_CONN_HEALTH_CHECKS', True),
+    }
+    if engine == 'sqlite':
+        config['NAME'] = env.get('DB_NAME') or base_dir / 'db.sqlite3'
+        config['OPTIONS'] = sqlite_options(env)
+        return config
+
+    config.update({
+        'NAME': env.get('DB_NAME', 'taskboard'),
+        'USER': env.get('DB_USER', ''),
+        'PASSWORD': env.get('DB_PASSWORD', ''),
+        'HOST': env.get('DB_HOST', ''),
+        'PORT': env.get('DB_PORT', ''),
+        'OPTIONS': {},
+    })
+    if engine == 'postgresql' and env_flag(env, 'DB_POOL', False):
+        # Django's pool replaces persistent connections; both together are rejected.
+        config['OPTIONS']['pool'] = True
+        config['CONN_MAX_AGE'] = 0
+    return config
+
+
+def replica_configs(env, primary):
+    """
+    Returns the settings of the read replicas listed in DB_REPLICAS, keyed by alias.
+    Tests mirror the replicas to the primary test database.
+    """
+    names = [name.strip() for name in env.get('DB_REPLICAS', '').split(',') if name.strip()]
+    replicas = {}
+    for index, name in enumerate(names, start=1):
+        config = {**primary, 'OPTIONS': dict(primary['OPTIONS']), 'TEST': {'MIRROR': 'default'}}
+        if primary['ENGINE'] == ENGINES['sqlite']:
+            config['NAME'] = name
+        else:
+            config['HOST'] = name
+        replicas[f'replica{index}'] = config
+    return replicas
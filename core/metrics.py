@@ -0,0 +1,313 @@
+import hmac
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SERVER_TIMING': False,
+    'QUERY_ALARM': 30,
+    'TOKEN': None,
+}
+
+SUMMARIES = (
+    ('http_request_duration_seconds', 'Wall time of requests.', 'duration'),
+    ('http_request_db_seconds', 'Time spent executing database queries.', 'db_time'),
+    ('http_request_serialize_seconds', 'Time spent in views and serializers outside the database.', 'serialize_time'),
+    ('http_request_render_seconds', 'Time spent rendering responses to bytes.', 'render_time'),
+    ('http_request_queries', 'Database queries per request.', 'queries'),
+    ('http_response_size_bytes', 'Size of response bodies.', 'size'),
+)
+
+current_metrics = ContextVar('request_metrics', default=None)
+
+
+def metrics_config():
+    """
+    Returns the REQUEST_METRICS setting merged with the defaults.
+    """
+    return {**DEFAULTS, **getattr(settings, 'REQUEST_METRICS', {})}
+
+
+class RequestMetrics:
+    """
+    Measurements of a single request; the database wrapper adds to it while it is current.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.view_started = None
+        self.view_db_time = 0.0
+        self.view_finished = None
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+        self.duration = 0.0
+        self.size = 0
+
+    def start_view(self):
+        """
+        Marks the start of the view.
+        """
+        self.view_started = time.perf_counter()
+        self.view_db_time = self.db_time
+
+    def finish_view(self):
+        """
+        Marks the end of the view; the view's time outside the database counts as serializer time.
+        """
+        if self.view_started is None or self.view_finished is not None:
+            return
+        self.view_finished = time.perf_counter()
+        self.serialize_time = max(self.view_finished - self.view_started - (self.db_time - self.view_db_time), 0.0)
+
+    def finish(self, response):
+        """
+        Closes the measurements once the response is rendered.
+        """
+        finished = time.perf_counter()
+        if self.view_finished is None:
+            self.finish_view()
+        elif not response.streaming:
+            self.render_time = finished - self.view_finished
+        self.duration = finished - self.started
+        self.size = 0 if response.streaming else len(response.content)
+
+    def server_timing(self):
+        """
+        Returns the Server-Timing header value with durations in milliseconds.
+        """
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize_time * 1000:.1f}, '
+            f'render;dur={self.render_time * 1000:.1f}, '
+            f'total;dur={self.duration * 1000:.1f}'
+        )
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper counting queries and their time for the current request.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - started
+
+
+def instrument(connection):
+    """
+    Installs the query recorder on a connection once; it stays across reconnects.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def instrument_connections():
+    """
+    Instruments the connections already open in the current thread.
+    """
+    for connection in connections.all(initialized_only=True):
+        instrument(connection)
+
+
+def instrument_new_connection(sender, connection, **kwargs):
+    """
+    connection_created receiver instrumenting connections opened in any thread.
+    """
+    instrument(connection)
+
+
+connection_created.connect(instrument_new_connection)
+
+
+def escape_label(value):
+    """
+    Escapes a label value for the Prometheus text format.
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+    """
+    Process-wide aggregates per view, exposed in the Prometheus text format.
+    Each worker process keeps its own registry; Prometheus sums them over the scraped instances.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.summaries = {}
+        self.alarms = {}
+
+    def observe(self, view, method, status, metrics, alarm):
+        """
+        Adds a finished request to the aggregates.
+        """
+        with self.lock:
+            key = (view, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            for name, help_text, attribute in SUMMARIES:
+                total, count = self.summaries.get((name, view), (0, 0))
+                self.summaries[(name, view)] = (total + getattr(metrics, attribute), count + 1)
+            if alarm:
+                self.alarms[view] = self.alarms.get(view, 0) + 1
+
+    def render(self):
+        """
+        Returns all aggregates in the Prometheus text exposition format.
+        """
+        with self.lock:
+            lines = [
+                '# HELP http_requests_total Requests by view, method and status.',
+                '# TYPE http_requests_total counter',
+            ]
+            for (view, method, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{view="{escape_label(view)}",method="{method}",status="{status}"}} {count}')
+            for name, help_text, attribute in SUMMARIES:
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} summary']
+                for (summary, view), (total, count) in sorted(self.summaries.items()):
+                    if summary == name:
+                        label = escape_label(view)
+                        lines.append(f'{name}_sum{{view="{label}"}} {total}')
+                        lines.append(f'{name}_count{{view="{label}"}} {count}')
+            lines += [
+                '# HELP http_request_query_alarms_total Requests exceeding the query alarm threshold.',
+                '# TYPE http_request_query_alarms_total counter',
+            ]
+            for view, count in sorted(self.alarms.items()):
+                lines.append(f'http_request_query_alarms_total{{view="{escape_label(view)}"}} {count}')
+            return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        """
+        Removes all aggregates.
+        """
+        with self.lock:
+            self.requests.clear()
+            self.summaries.clear()
+            self.alarms.clear()
+
+
+registry = MetricsRegistry()
+
+
+def view_label(request):
+    """
+    Returns the URL name of the matched view, its route, or 'unmatched'.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, database time, serializer and render time and response size of every request.
+    Logs requests above the QUERY_ALARM threshold and optionally adds a Server-Timing header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Measures a request in sync mode.
+        """
+        if self.async_mode:
+            return self.__acall__(request)
+        config = metrics_config()
+        if not config['ENABLED']:
+            return self.get_response(request)
+        instrument_connections()
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.report(request, response, metrics, config)
+
+    async def __acall__(self, request):
+        """
+        Measures a request in async mode; connections of worker threads are instrumented on creation.
+        """
+        config = metrics_config()
+        if not config['ENABLED']:
+            return await self.get_response(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.report(request, response, metrics, config)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Marks the start of the view.
+        In async mode this hook runs in the thread serving the view's ORM calls, whose connections it instruments.
+        """
+        metrics = current_metrics.get()
+        if metrics is not None:
+            instrument_connections()
+            metrics.start_view()
+
+    def process_template_response(self, request, response):
+        """
+        Marks the end of the view; rendering of DRF responses happens after this hook.
+        """
+        metrics = current_metrics.get()
+        if metrics is not None:
+            metrics.finish_view()
+        return response
+
+    def report(self, request, response, metrics, config):
+        """
+        Stores the measurements, logs the query alarm and adds the Server-Timing header.
+        """
+        metrics.finish(response)
+        view = view_label(request)
+        alarm = config['QUERY_ALARM'] is not None and metrics.queries > config['QUERY_ALARM']
+        if alarm:
+            logger.warning(
+                'Query alarm: %s %s (%s) ran %d queries in %.1f ms',
+                request.method, request.path, view, metrics.queries, metrics.db_time * 1000,
+            )
+        registry.observe(view, request.method, response.status_code, metrics, alarm)
+        if config['SERVER_TIMING']:
+            response['Server-Timing'] = metrics.server_timing()
+        return response
+
+
+def metrics_view(request):
+    """
+    Serves the aggregated request metrics in the Prometheus text format.
+    Requires "Authorization: Bearer <TOKEN>"; without a configured TOKEN the endpoint does not exist.
+    """
+    config = metrics_config()
+    if not config['ENABLED'] or not config['TOKEN']:
+        return HttpResponseNotFound()
+    expected = f"Bearer {config['TOKEN']}".encode()
+    if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
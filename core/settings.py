@@ -10,7 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
+from core.database import database_config, replica_configs
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -45,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -53,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'taskboard.replicas.sticky_primary_middleware',
 ]
 
 CSRF_TRUSTED_ORIGINS = [
@@ -94,17 +98,43 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Configured through DB_* environment variables, see core/database.py.
+# Defaults to the SQLite file in WAL mode with persistent, health-checked connections.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(os.environ, BASE_DIR),
 }
+DATABASES.update(replica_configs(os.environ, DATABASES['default']))
+
+# Reads of the taskboard GET endpoints go to a replica; writes and the
+# permission lookups stay on the primary (see taskboard/replicas.py).
+DATABASE_ROUTERS = ['taskboard.replicas.ReplicaRouter']
 
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# Login by email first; the model backend keeps username logins (admin, browsable API) working.
+AUTHENTICATION_BACKENDS = [
+    'user_auth_app.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# New passwords are hashed with bcrypt. The remaining hashers verify existing
+# hashes, which are upgraded to the first hasher on the next successful login.
+PASSWORD_HASHERS = [
+    'user_auth_app.hashers.TunedBCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# bcrypt work factor and the size of the thread pool password hashes run in.
+USER_AUTH_PASSWORD_HASHING = {
+    'BCRYPT_ROUNDS': 12,
+    'THREADS': 4,
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -148,6 +178,60 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny'
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-    ]
+        'user_auth_app.api.authentication.CachedTokenAuthentication',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'taskboard.api.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+}
+
+# Process-local cache of token lookups used by CachedTokenAuthentication.
+# Entries are dropped when a token is deleted or rotated and when its user changes.
+USER_AUTH_TOKEN_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 300,
 }
+
+# Render board detail, task list and comment list reads from values() rows
+# instead of DRF serializers. The output is identical; switch off to compare.
+TASKBOARD_FAST_SERIALIZERS = True
+
+# Cross-request cache of board roles used by the taskboard permissions.
+# Set BACKEND to a Django cache alias to share it between worker processes.
+TASKBOARD_MEMBERSHIP_CACHE = {
+    'BACKEND': None,
+    'MAX_SIZE': 10000,
+    'TTL': 60,
+}
+
+# Cache of the rendered, unpaginated board list per user. Entries are dropped
+# when the user's boards, their titles, members or listed counters change.
+# Set BACKEND to a Django cache alias to share it between worker processes.
+TASKBOARD_BOARD_LIST_CACHE = {
+    'ENABLED': True,
+    'BACKEND': None,
+    'MAX_SIZE': 10000,
+    'TTL': 300,
+}
+
+# Per-view request metrics served at /metrics in the Prometheus text format.
+# Requests running more than QUERY_ALARM queries are logged as warnings.
+# SERVER_TIMING adds the timings to every response. /metrics requires
+# "Authorization: Bearer <TOKEN>" and returns 404 while no TOKEN is set.
+REQUEST_METRICS = {
+    'ENABLED': True,
+    'SERVER_TIMING': DEBUG,
+    'QUERY_ALARM': 30,
+    'TOKEN': os.environ.get('METRICS_TOKEN'),
+}
+
+# Read replica routing. ALIASES defaults to every database but 'default'.
+# After a successful write, a user's reads stay on the primary for
+# STICKY_SECONDS so they see their own changes despite replication lag.
+TASKBOARD_READ_REPLICAS = {
+    'ALIASES': None,
+    'STICKY_SECONDS': 5,
+    'MAX_SIZE': 10000,
+}
+
+# Broker that fans out board events to WebSocket connections (see core/asgi.py).
+TASKBOARD_REALTIME_BROKER = 'taskboard.realtime.LocalBroker'
@@ -1,7 +1,8 @@
 from django.contrib import admin
-from taskboard.models import Board, Task, Comment, Member
+from taskboard.models import Board, BoardStats, Task, Comment, Member
 
 admin.site.register(Member)
 admin.site.register(Board)
+admin.site.register(BoardStats)
 admin.site.register(Task)
 admin.site.register(Comment)
\ No newline at end of file
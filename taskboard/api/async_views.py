@@ -0,0 +1,124 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+from taskboard.models import Board, Task
+from taskboard.api.membership import OWNER, MEMBER, auser_board_role, remember_visible_boards
+from taskboard.api.membership_cache import membership_cache
+from taskboard.api.queries import board_list_queryset, board_detail_queryset
+from taskboard.api.filters import TaskFilter
+from taskboard.api.sparse import get_field_selection
+from taskboard.api.serializers import BoardSerializer, BoardDetailSerializer, TaskSerializer
+from user_auth_app.api.authentication import token_cache
+
+
+async def aauthenticate(request):
+    """
+    Resolves the "Token <key>" Authorization header to an active user from the token cache or the async ORM.
+    Returns None if the header is missing or the token is invalid.
+    """
+    parts = get_authorization_header(request).split()
+    if len(parts) != 2 or parts[0].lower() != TokenAuthentication.keyword.lower().encode():
+        return None
+    try:
+        key = parts[1].decode()
+    except UnicodeError:
+        return None
+    token = token_cache.get(key)
+    if token is not None:
+        return token.user
+    try:
+        token = await Token.objects.select_related('user').aget(key=key)
+    except Token.DoesNotExist:
+        return None
+    if not token.user.is_active:
+        return None
+    token_cache.set(token)
+    return token.user
+
+
+class AsyncAuthenticatedView(View):
+    """
+    Base class for ASGI-native read views that require a valid DRF token.
+    Subclasses implement get_data and return serializable data or a JsonResponse.
+    """
+    async def get(self, request, *args, **kwargs):
+        """
+        Authenticates the request and returns the subclass data as JSON.
+        Returns 401 if no valid token was sent.
+        """
+        user = await aauthenticate(request)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=status.HTTP_401_UNAUTHORIZED)
+        request.user = user
+        data = await self.get_data(request, *args, **kwargs)
+        if isinstance(data, JsonResponse):
+            return data
+        return JsonResponse(data, safe=False)
+
+
+class AsyncBoardListView(AsyncAuthenticatedView):
+    """
+    Async variant of BoardListView returning all boards the user owns or belongs to.
+    """
+    async def get_data(self, request):
+        """
+        Loads the annotated board list with the async ORM and serializes it.
+        """
+        board_ids = membership_cache.get_visible_board_ids(request.user.pk)
+        boards = [board async for board in board_list_queryset(request.user, board_ids)]
+        if board_ids is None:
+            remember_visible_boards(request.user, boards)
+        return BoardSerializer(boards, many=True).data
+
+
+class AsyncBoardDetailView(AsyncAuthenticatedView):
+    """
+    Async variant of the BoardDetailView GET; access is restricted to owners and members.
+    """
+    async def get_data(self, request, pk):
+        """
+        Checks membership asynchronously and returns the board with its tasks.
+        Returns 404 if the board does not exist, 403 for non-members and 400 for unknown task fields.
+        """
+        selection = get_field_selection(request)
+        if selection.error:
+            return JsonResponse({"error": selection.error}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            role = await auser_board_role(request.user.pk, pk)
+        except Board.DoesNotExist:
+            return JsonResponse({"detail": "Board does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        if role not in (OWNER, MEMBER):
+            return JsonResponse({"detail": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN)
+
+        tasks = selection.prepare_queryset(Task.objects.all())
+        boards = [board async for board in board_detail_queryset(tasks).filter(pk=pk)]
+        if not boards:
+            return JsonResponse({"detail": "Board does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        data = BoardDetailSerializer(boards[0], context={'request': request, 'task_fields': selection}).data
+        return await sync_to_async(selection.add_side_loaded_users)(data, data['tasks'])
+
+
+class AsyncUserTaskListView(AsyncAuthenticatedView):
+    """
+    Async variant of the assigned-to-me and reviewing task lists, with the same filter and field parameters.
+    The user field to filter on is set per URL through as_view(field=...).
+    """
+    field = 'assignee_id'
+
+    async def get_data(self, request):
+        """
+        Returns the filtered tasks linked to the user through the configured field.
+        Returns 400 if a filter or field parameter is invalid.
+        """
+        task_filter = TaskFilter(request.GET)
+        selection = get_field_selection(request)
+        error = task_filter.error or selection.error
+        if error:
+            return JsonResponse({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        tasks = selection.prepare_queryset(Task.objects.filter(**{self.field: request.user.pk}))
+        tasks = [task async for task in task_filter.filter_queryset(tasks)]
+        data = TaskSerializer(tasks, many=True, context={'task_fields': selection}).data
+        return await sync_to_async(selection.add_side_loaded_users)(data, data)
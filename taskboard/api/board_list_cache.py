@@ -0,0 +1,173 @@
+import uuid
+from django.conf import settings
+from django.db import transaction
+from taskboard.api.membership_cache import DjangoCacheStore, LocalLRUCache
+
+
+DEFAULTS = {
+    'ENABLED': True,
+    'BACKEND': None,
+    'MAX_SIZE': 10000,
+    'TTL': 300,
+}
+
+LISTED_STATUS = 'to-do'
+LISTED_PRIORITY = 'high'
+
+
+def new_token():
+    """
+    Returns a version token that is unique across processes sharing a cache backend.
+    """
+    return uuid.uuid4().hex
+
+
+def listed_counters(counted):
+    """
+    Returns what a counted (board_id, status, priority) task contributes to the board list counters.
+    """
+    if counted is None:
+        return None
+    board_id, status, priority = counted
+    return board_id, status == LISTED_STATUS, priority == LISTED_PRIORITY
+
+
+def listed_counter_boards(changes):
+    """
+    Returns the IDs of boards whose ticket, to-do or high priority count changes with the given
+    (previous, current) task states; either side may be None.
+    """
+    board_ids = set()
+    for previous, current in changes:
+        before, after = listed_counters(previous), listed_counters(current)
+        if before == after:
+            continue
+        for counted in (before, after):
+            if counted is not None:
+                board_ids.add(counted[0])
+    return board_ids
+
+
+class BoardListCache:
+    """
+    Per-user cache of the rendered board list, stored under the user's current board-set version.
+    Entries remember a version token per listed board; a hit needs every token to be unchanged.
+    Membership changes replace the user's version, board and counter changes replace the board's token.
+    """
+    def __init__(self, store, enabled=True):
+        self.store = store
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        """
+        Returns the cached board list payload of a user, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        version = self.store.get(('version', user_id))
+        entry = self.store.get(('list', user_id, version)) if version is not None else None
+        if entry is not None:
+            board_tokens, data = entry
+            current = self.store.get_many([('board', board_id) for board_id in board_tokens])
+            if all(current.get(('board', board_id)) == token for board_id, token in board_tokens.items()):
+                self.hits += 1
+                return data
+        self.misses += 1
+        return None
+
+    def start_fill(self, user_id):
+        """
+        Returns the state to pass to set() once the payload is rendered; call it before reading the database.
+        """
+        if not self.enabled:
+            return None
+        version = self.store.get(('version', user_id))
+        if version is None:
+            version = new_token()
+            self.store.set(('version', user_id), version)
+        return version, self.store.get(('epoch',))
+
+    def set(self, user_id, state, board_ids, data):
+        """
+        Stores a payload rendered after start_fill.
+        Payloads are dropped if anything was invalidated in the meantime, as they may contain the old data.
+        """
+        if state is None:
+            return
+        version, epoch = state
+        board_tokens = {}
+        for board_id in board_ids:
+            token = self.store.get(('board', board_id))
+            if token is None:
+                token = new_token()
+                self.store.set(('board', board_id), token)
+            board_tokens[board_id] = token
+        if self.store.get(('epoch',)) != epoch:
+            return
+        self.store.set(('list', user_id, version), (board_tokens, data))
+
+    def replace_tokens(self, keys):
+        """
+        Gives the keys and the epoch new tokens, so entries filled with the old ones miss.
+        """
+        for key in keys:
+            self.store.set(key, new_token())
+        self.store.set(('epoch',), new_token())
+
+    def invalidate(self, keys):
+        """
+        Replaces the tokens right away and again once the surrounding transaction commits.
+        A fill running before the commit still reads the old rows; the second replacement drops what it stored.
+        """
+        keys = list(keys)
+        self.replace_tokens(keys)
+        transaction.on_commit(lambda: self.replace_tokens(keys))
+
+    def invalidate_boards(self, board_ids):
+        """
+        Drops the cached lists showing any of the boards, e.g. after a title, member or counter change.
+        """
+        self.invalidate([('board', board_id) for board_id in set(board_ids) if board_id is not None])
+
+    def invalidate_users(self, user_ids):
+        """
+        Drops the cached lists of users whose set of visible boards changed.
+        """
+        self.invalidate([('version', user_id) for user_id in set(user_ids) if user_id is not None])
+
+    def stats(self):
+        """
+        Returns hit and miss counters so the cache size can be tuned.
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        self.store.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def build_board_list_cache():
+    """
+    Creates the board list cache from the TASKBOARD_BOARD_LIST_CACHE setting.
+    Uses the process-local LRU store unless a Django cache alias is configured as BACKEND.
+    """
+    config = {**DEFAULTS, **getattr(settings, 'TASKBOARD_BOARD_LIST_CACHE', {})}
+    if config['BACKEND']:
+        store = DjangoCacheStore(config['BACKEND'], config['TTL'], prefix='taskboard:board-list:')
+    else:
+        store = LocalLRUCache(config['MAX_SIZE'], config['TTL'])
+    return BoardListCache(store, enabled=config['ENABLED'])
+
+
+board_list_cache = build_board_list_cache()
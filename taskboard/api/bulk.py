@@ -0,0 +1,174 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from taskboard.models import Board, BoardStats, Task
+from taskboard.changes import record_changes, task_payload
+from taskboard.api.membership import OWNER, MEMBER, board_role
+from taskboard.api.board_list_cache import board_list_cache, listed_counter_boards
+from taskboard.api.queries import task_detail_queryset
+from taskboard.api.serializers import TaskSerializer, TaskBulkOperationSerializer
+
+
+BULK_UPDATE_FIELDS = ('status', 'priority', 'assignee_id')
+
+
+class TaskBatch:
+    """
+    Validates and applies a list of task create, update and delete operations in one transaction.
+    Permissions are checked once per distinct board; results are reported per operation.
+    """
+    def __init__(self, request, operations):
+        self.request = request
+        self.operations = operations
+        self.results = [None] * len(operations)
+        self.creates = []
+        self.updates = []
+        self.deletes = []
+
+    def fail(self, index, code, errors):
+        """
+        Records a failed operation with its HTTP-like status code and error details.
+        """
+        self.results[index] = {'index': index, 'status': code, 'errors': errors}
+
+    def has_access(self, board_id):
+        """
+        Returns True if the requesting user owns or belongs to the board.
+        """
+        try:
+            return board_role(self.request, board_id) in (OWNER, MEMBER)
+        except Board.DoesNotExist:
+            return False
+
+    def validate(self):
+        """
+        Validates every operation and sorts valid ones into creates, updates and deletes.
+        Returns True if all operations are valid.
+        """
+        parsed = []
+        for index, item in enumerate(self.operations):
+            serializer = TaskBulkOperationSerializer(data=item)
+            if serializer.is_valid():
+                parsed.append((index, serializer.validated_data))
+            else:
+                self.fail(index, status.HTTP_400_BAD_REQUEST, serializer.errors)
+
+        task_ids = [operation['id'] for _, operation in parsed if operation['op'] != 'create']
+        tasks = Task.objects.in_bulk(task_ids)
+
+        seen_ids = set()
+        for index, operation in parsed:
+            if operation['op'] != 'create':
+                if operation['id'] in seen_ids:
+                    self.fail(index, status.HTTP_400_BAD_REQUEST, {'id': ['Task appears more than once in this batch.']})
+                    continue
+                seen_ids.add(operation['id'])
+            handler = getattr(self, f"validate_{operation['op']}")
+            handler(index, operation, tasks)
+        return not any(result for result in self.results)
+
+    def validate_create(self, index, operation, tasks):
+        """
+        Validates a create operation with TaskSerializer and checks board access.
+        """
+        serializer = TaskSerializer(data=operation['data'], context={'request': self.request})
+        if not serializer.is_valid():
+            return self.fail(index, status.HTTP_400_BAD_REQUEST, serializer.errors)
+        if not self.has_access(serializer.validated_data['board'].pk):
+            return self.fail(index, status.HTTP_403_FORBIDDEN, {'board': ['Not a member of this board.']})
+        self.creates.append((index, Task(creator=self.request.user, **serializer.validated_data)))
+
+    def validate_update(self, index, operation, tasks):
+        """
+        Validates a partial update limited to status, priority and assignee.
+        """
+        task = tasks.get(operation['id'])
+        if task is None:
+            return self.fail(index, status.HTTP_404_NOT_FOUND, {'id': ['Task does not exist']})
+        unknown = set(operation['data']) - set(BULK_UPDATE_FIELDS)
+        if unknown:
+            return self.fail(index, status.HTTP_400_BAD_REQUEST, {field: ['Cannot be changed in bulk.'] for field in sorted(unknown)})
+        if not self.has_access(task.board_id):
+            return self.fail(index, status.HTTP_403_FORBIDDEN, {'id': ['Not a member of this board.']})
+        serializer = TaskSerializer(task, data=operation['data'], partial=True, context={'request': self.request})
+        if not serializer.is_valid():
+            return self.fail(index, status.HTTP_400_BAD_REQUEST, serializer.errors)
+        for field, value in serializer.validated_data.items():
+            setattr(task, field, value)
+        self.updates.append((index, task))
+
+    def validate_delete(self, index, operation, tasks):
+        """
+        Validates a delete operation; only the board owner or a task creator who is still a member may delete.
+        """
+        task = tasks.get(operation['id'])
+        if task is None:
+            return self.fail(index, status.HTTP_404_NOT_FOUND, {'id': ['Task does not exist']})
+        role = board_role(self.request, task.board_id)
+        if role not in (OWNER, MEMBER):
+            return self.fail(index, status.HTTP_403_FORBIDDEN, {'id': ['Not a member of this board.']})
+        if not (role == OWNER or task.creator_id == self.request.user.pk):
+            return self.fail(index, status.HTTP_403_FORBIDDEN, {'id': ['Only the board owner or task creator may delete.']})
+        self.deletes.append((index, task))
+
+    def mark_not_applied(self):
+        """
+        Marks valid operations as not applied because another operation failed.
+        """
+        for index, result in enumerate(self.results):
+            if result is None:
+                self.results[index] = {'index': index, 'status': status.HTTP_424_FAILED_DEPENDENCY}
+
+    def check_still_stored(self, stored):
+        """
+        Fails updates and deletes of tasks another request deleted since validation.
+        Returns True if all of them still exist.
+        """
+        for index, task in self.updates + self.deletes:
+            if task.pk not in stored:
+                self.fail(index, status.HTTP_404_NOT_FOUND, {'id': ['Task does not exist']})
+        return all(result is None for result in self.results)
+
+    def apply(self):
+        """
+        Applies all operations with bulk_create, bulk_update and one delete inside a transaction.
+        Board counters, versions and the change log are updated here because bulk operations skip the model signals.
+        Updated and deleted tasks are locked first, so the counters move from their stored values.
+        Returns False without changes if one of them was deleted in the meantime.
+        """
+        with transaction.atomic():
+            stored = Task.lock_counted_values([task.pk for _, task in self.updates + self.deletes])
+            if not self.check_still_stored(stored):
+                return False
+            for _, task in self.updates:
+                task._counted_as = stored[task.pk]
+            created = Task.objects.bulk_create([task for _, task in self.creates])
+            updated = [task for _, task in self.updates]
+            if updated:
+                now = timezone.now()
+                for task in updated:
+                    task.updated_at = now
+                fields = ['status', 'priority', 'assignee', 'updated_at']
+                Task.objects.bulk_update(updated, fields)
+            deleted_ids = [task.pk for _, task in self.deletes]
+            if deleted_ids:
+                Task.objects.filter(pk__in=deleted_ids).delete()
+
+            changes = [(None, (task.board_id, task.status, task.priority)) for task in created]
+            changes += [(task._counted_as, (task.board_id, task.status, task.priority)) for task in updated]
+            BoardStats.apply_many(changes)
+            board_list_cache.invalidate_boards(listed_counter_boards(changes))
+            Board.touch([task.board_id for task in created + updated])
+            record_changes(
+                [(task.board_id, 'task', 'create', task.pk, task_payload(task)) for task in created]
+                + [(task.board_id, 'task', 'update', task.pk, task_payload(task)) for task in updated]
+            )
+
+        rendered = task_detail_queryset().in_bulk([task.pk for task in created + updated])
+        for index, task in self.creates:
+            self.results[index] = {'index': index, 'status': status.HTTP_201_CREATED, 'data': TaskSerializer(rendered[task.pk]).data}
+        for index, task in self.updates:
+            self.results[index] = {'index': index, 'status': status.HTTP_200_OK, 'data': TaskSerializer(rendered[task.pk]).data}
+        for index, task in self.deletes:
+            self.results[index] = {'index': index, 'status': status.HTTP_204_NO_CONTENT, 'id': task.pk}
+        return True
@@ -0,0 +1,80 @@
+import hashlib
+from django.db.models import Count, Max
+from taskboard.models import Board, Task
+from taskboard.api.membership import OWNER, MEMBER, board_role
+
+
+def query_fingerprint(request):
+    """
+    Returns a short hash of the query string so paginated or filtered responses get distinct ETags.
+    """
+    return hashlib.sha1(request.META.get('QUERY_STRING', '').encode()).hexdigest()[:12]
+
+
+def memoized(request, key, compute):
+    """
+    Computes a validator value once per request; etag and last-modified functions share it.
+    """
+    cache = request.__dict__.setdefault('_conditional_cache', {})
+    if key not in cache:
+        cache[key] = compute()
+    return cache[key]
+
+
+def board_version(request, pk):
+    """
+    Returns (version, updated_at) of a board from one indexed lookup, or None if it is missing.
+    Also None for users who neither own nor belong to the board, as the validators run before the object permission check.
+    """
+    def compute():
+        try:
+            role = board_role(request, pk)
+        except Board.DoesNotExist:
+            return None
+        if role not in (OWNER, MEMBER):
+            return None
+        return Board.objects.filter(pk=pk).values_list('version', 'updated_at').first()
+    return memoized(request, ('board', pk), compute)
+
+
+def board_detail_etag(request, pk, *args, **kwargs):
+    """
+    Returns a weak ETag built from the board version.
+    The version changes with every task, comment or member change and with profile changes of the users shown.
+    """
+    version = board_version(request, pk)
+    if version is None:
+        return None
+    return f'W/"board-{pk}-{version[0]}-{query_fingerprint(request)}"'
+
+
+def board_detail_last_modified(request, pk, *args, **kwargs):
+    """
+    Returns the time the board or anything shown on it last changed.
+    """
+    version = board_version(request, pk)
+    return version[1] if version else None
+
+
+def user_task_version(request, field):
+    """
+    Returns (count, latest updated_at) of the tasks linked to the user through the given field.
+    The assignee and reviewer indexes answer this without reading the task rows of other users.
+    """
+    return memoized(
+        request,
+        ('tasks', field),
+        lambda: Task.objects.filter(**{field: request.user.pk}).aggregate(total=Count('id'), latest=Max('updated_at')),
+    )
+
+
+def user_tasks_etag(field):
+    """
+    Builds an etag function for a user's task list filtered on the given field.
+    No Last-Modified is derived here: a task leaving the list does not raise the latest timestamp.
+    """
+    def etag(request, *args, **kwargs):
+        version = user_task_version(request, field)
+        latest = version['latest'].timestamp() if version['latest'] else 0
+        return f'W/"{field}-{request.user.pk}-{version["total"]}-{latest}-{query_fingerprint(request)}"'
+    return etag
@@ -0,0 +1,202 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from rest_framework import serializers
+from taskboard.models import Task
+from taskboard.api.sparse import TASK_FIELDS, USER_RELATIONS, TaskFieldSelection, get_field_selection
+
+
+USER_COLUMNS = ('id', 'email', 'username', 'last_name')
+
+datetime_field = serializers.DateTimeField()
+
+
+def fast_serializers_enabled():
+    """
+    Returns True unless the fast read path is switched off with TASKBOARD_FAST_SERIALIZERS.
+    """
+    return getattr(settings, 'TASKBOARD_FAST_SERIALIZERS', True)
+
+
+def user_profile(row, prefix=''):
+    """
+    Builds the UserProfileSerializer output from a values() row; None if the user is missing.
+    """
+    user_id = row[prefix + 'id']
+    if user_id is None:
+        return None
+    return {'id': user_id, 'email': row[prefix + 'email'], 'fullname': row[prefix + 'username'] + ' ' + row[prefix + 'last_name']}
+
+
+def ordering_columns(*orderings):
+    """
+    Returns the plain column names of order_by expressions, so values() rows carry them for keyset cursors.
+    """
+    return [field.lstrip('-') for ordering in orderings for field in ordering if isinstance(field, str)]
+
+
+def unique(columns):
+    """
+    Returns the columns without duplicates, keeping their order.
+    """
+    return list(dict.fromkeys(columns))
+
+
+class FastTaskRenderer:
+    """
+    Builds TaskSerializer output straight from values() rows, honouring the task field selection.
+    The result is identical to TaskSerializer for reads; writes keep using the serializer.
+    """
+    def __init__(self, selection=None):
+        self.selection = selection or TaskFieldSelection({})
+        self.plan = []
+        self.columns = []
+        for field in TASK_FIELDS:
+            if not self.selection.includes(field):
+                continue
+            if field in USER_RELATIONS and field in self.selection.expand:
+                self.plan.append((field, 'user', f'{field}__'))
+                self.columns += [f'{field}__{column}' for column in USER_COLUMNS]
+            elif field in USER_RELATIONS or field == 'board':
+                self.plan.append((field, 'value', f'{field}_id'))
+                self.columns.append(f'{field}_id')
+            elif field == 'due_date':
+                self.plan.append((field, 'date', field))
+                self.columns.append(field)
+            else:
+                self.plan.append((field, 'value', field))
+                if field != 'comments_count':
+                    self.columns.append(field)
+        if self.selection.includes('comments_count'):
+            self.columns.append('comments_count')
+
+    def values(self, queryset, *orderings):
+        """
+        Turns a task queryset prepared by the field selection into a values() queryset.
+        Columns used by the given orderings are added so cursors can be built from the rows.
+        """
+        return queryset.values(*unique(self.columns + ordering_columns(queryset.query.order_by, *orderings)))
+
+    def render(self, row):
+        """
+        Returns the task payload for one values() row.
+        """
+        data = {}
+        for field, kind, column in self.plan:
+            if kind == 'value':
+                data[field] = row[column]
+            elif kind == 'user':
+                data[field] = user_profile(row, column)
+            else:
+                value = row[column]
+                data[field] = value.isoformat() if value is not None else None
+        return data
+
+
+class FastCommentRenderer:
+    """
+    Builds CommentSerializer output straight from values() rows.
+    """
+    columns = ['id', 'created_at', 'author__username', 'author__last_name', 'content']
+
+    def values(self, queryset, *orderings):
+        """
+        Turns a comment queryset into a values() queryset with the author name joined in.
+        """
+        return queryset.values(*unique(self.columns + ordering_columns(queryset.query.order_by, *orderings)))
+
+    def render(self, row):
+        """
+        Returns the comment payload for one values() row.
+        """
+        return {
+            'id': row['id'],
+            'created_at': datetime_field.to_representation(row['created_at']),
+            'author': f"{row['author__username']} {row['author__last_name']}".strip(),
+            'content': row['content'],
+        }
+
+
+def board_detail_data(board, selection):
+    """
+    Builds the BoardDetailSerializer GET payload of a board with two queries: members and tasks.
+    """
+    renderer = FastTaskRenderer(selection)
+    members = User.objects.filter(board_members=board.pk).order_by('id').values(*USER_COLUMNS)
+    tasks = renderer.values(selection.prepare_queryset(Task.objects.filter(board_id=board.pk)).order_by('id'))
+    return {
+        'id': board.pk,
+        'title': board.title,
+        'members': [user_profile(row) for row in members],
+        'tasks': [renderer.render(row) for row in tasks],
+        'owner_id': board.owner_id,
+    }
+
+
+class FastRows:
+    """
+    Stand-in for a many=True serializer whose data is rendered by a fast renderer.
+    """
+    def __init__(self, renderer, rows):
+        self.renderer = renderer
+        self.rows = rows
+
+    @property
+    def data(self):
+        """
+        Returns the rendered rows as a list.
+        """
+        return [self.renderer.render(row) for row in self.rows]
+
+
+class FastReadMixin:
+    """
+    Serves GET list requests of a generic view through a fast renderer instead of the serializer.
+    The view provides get_fast_renderer; this mixin must come first so it sees the fully filtered queryset.
+    """
+    def use_fast_path(self):
+        """
+        Returns True for GET requests while the fast path is enabled.
+        """
+        return self.request.method == 'GET' and fast_serializers_enabled()
+
+    def filter_queryset(self, queryset):
+        """
+        Returns values() rows including the columns the paginator orders by.
+        """
+        queryset = super().filter_queryset(queryset)
+        if not self.use_fast_path():
+            return queryset
+        orderings = []
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            orderings.append(self.paginator.get_ordering(self))
+        return self.get_fast_renderer().values(queryset, *orderings)
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Returns a fast row renderer for lists and the regular serializer otherwise.
+        """
+        if kwargs.get('many') and self.use_fast_path():
+            return FastRows(self.get_fast_renderer(), args[0])
+        return super().get_serializer(*args, **kwargs)
+
+
+class FastTaskListMixin(FastReadMixin):
+    """
+    Fast read path for task list views that also use TaskFieldsMixin.
+    """
+    def get_fast_renderer(self):
+        """
+        Returns a task renderer for the selected task fields.
+        """
+        return FastTaskRenderer(get_field_selection(self.request))
+
+
+class FastCommentListMixin(FastReadMixin):
+    """
+    Fast read path for comment list views.
+    """
+    def get_fast_renderer(self):
+        """
+        Returns the comment renderer.
+        """
+        return FastCommentRenderer()
@@ -0,0 +1,150 @@
+from datetime import date
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from taskboard.models import STATUS_SELECTION, PRIORITY_SELECTION
+
+
+STATUS_VALUES = [value for value, label in STATUS_SELECTION]
+PRIORITY_VALUES = [value for value, label in PRIORITY_SELECTION]
+
+# ordering=priority lists high before medium before low.
+PRIORITY_RANK = Case(
+    *[When(priority=value, then=Value(rank)) for rank, value in enumerate(reversed(PRIORITY_VALUES))],
+    output_field=IntegerField(),
+)
+
+ORDERINGS = {
+    'due_date': ('due_date', 'id'),
+    '-due_date': ('-due_date', '-id'),
+    'priority': ('priority_rank', 'due_date', 'id'),
+    '-priority': ('-priority_rank', 'due_date', 'id'),
+}
+
+
+class TaskFilter:
+    """
+    Whitelisted filters and orderings for task lists, read from the query parameters.
+    Supports status, priority, board, due_after, due_before, overdue and ordering; other parameters are ignored.
+    """
+    default_ordering = 'due_date'
+
+    def __init__(self, params):
+        self.params = params
+        self.conditions = []
+        self.error = None
+        self.ordering_name = params.get('ordering', self.default_ordering)
+        try:
+            self.parse()
+        except ValueError as error:
+            self.error = str(error)
+
+    def parse_list(self, name, allowed=None):
+        """
+        Returns the comma-separated values of a parameter, checked against the allowed values.
+        """
+        values = [value.strip() for value in self.params.get(name, '').split(',') if value.strip()]
+        if allowed is None:
+            if not all(value.isdigit() for value in values):
+                raise ValueError(f'{name} must be a comma-separated list of IDs.')
+            return [int(value) for value in values]
+        for value in values:
+            if value not in allowed:
+                raise ValueError(f'{name} must be one of {", ".join(allowed)}.')
+        return values
+
+    def parse_date(self, name):
+        """
+        Returns a YYYY-MM-DD parameter as a date, or None if it is missing.
+        """
+        value = self.params.get(name)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f'{name} must be a date in YYYY-MM-DD format.')
+
+    def parse(self):
+        """
+        Turns the parameters into filter conditions; raises ValueError on invalid input.
+        """
+        statuses = self.parse_list('status', STATUS_VALUES)
+        if statuses:
+            self.conditions.append(Q(status__in=statuses))
+        priorities = self.parse_list('priority', PRIORITY_VALUES)
+        if priorities:
+            self.conditions.append(Q(priority__in=priorities))
+        boards = self.parse_list('board')
+        if boards:
+            self.conditions.append(Q(board_id__in=boards))
+
+        due_after = self.parse_date('due_after')
+        if due_after:
+            self.conditions.append(Q(due_date__gte=due_after))
+        due_before = self.parse_date('due_before')
+        if due_before:
+            self.conditions.append(Q(due_date__lte=due_before))
+
+        overdue = self.params.get('overdue')
+        if overdue is not None:
+            if overdue not in ('true', 'false'):
+                raise ValueError('overdue must be true or false.')
+            condition = Q(due_date__lt=timezone.localdate()) & ~Q(status='done')
+            self.conditions.append(condition if overdue == 'true' else ~condition)
+
+        if self.ordering_name not in ORDERINGS:
+            raise ValueError(f'ordering must be one of {", ".join(ORDERINGS)}.')
+
+    @property
+    def ordering(self):
+        """
+        Returns the order_by fields of the requested ordering, ending with the ID as tie-breaker.
+        """
+        return ORDERINGS.get(self.ordering_name, ORDERINGS[self.default_ordering])
+
+    def filter_queryset(self, queryset):
+        """
+        Applies the conditions and the ordering to a task queryset.
+        """
+        for condition in self.conditions:
+            queryset = queryset.filter(condition)
+        if any(field.lstrip('-') == 'priority_rank' for field in self.ordering):
+            queryset = queryset.annotate(priority_rank=PRIORITY_RANK)
+        return queryset.order_by(*self.ordering)
+
+
+class TaskFilterMixin:
+    """
+    Adds TaskFilter to a task list view; invalid parameters return 400 before any task is loaded.
+    The keyset pagination follows the requested ordering.
+    """
+    def get_task_filter(self):
+        """
+        Returns the filter for the current request, parsed once.
+        """
+        if not hasattr(self, '_task_filter'):
+            self._task_filter = TaskFilter(self.request.query_params)
+        return self._task_filter
+
+    def get_keyset_ordering(self):
+        """
+        Returns the ordering the keyset pagination has to use for this request.
+        """
+        return self.get_task_filter().ordering
+
+    def filter_queryset(self, queryset):
+        """
+        Applies the whitelisted task filters after the view's own filtering.
+        """
+        return self.get_task_filter().filter_queryset(super().filter_queryset(queryset))
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns 400 with the first validation error if a filter parameter is invalid.
+        """
+        task_filter = self.get_task_filter()
+        if task_filter.error:
+            return Response({"error": task_filter.error}, status=status.HTTP_400_BAD_REQUEST)
+        return super().list(request, *args, **kwargs)
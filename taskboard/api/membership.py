@@ -0,0 +1,166 @@
+from django.db.models import Exists, OuterRef
+from taskboard.models import Board, Task
+from taskboard.api.membership_cache import membership_cache
+from taskboard.api.queries import visible_boards
+from taskboard.replicas import current_read_alias, primary_reads
+
+
+OWNER = 'owner'
+MEMBER = 'member'
+NONE = 'none'
+
+REQUEST_CACHE_ATTRIBUTE = '_board_roles'
+
+
+def get_request_cache(request):
+    """
+    Returns the per-request dictionary mapping board IDs to the user's role.
+    Task IDs are stored under ('task', id) keys pointing at their board ID.
+    """
+    cache = getattr(request, REQUEST_CACHE_ATTRIBUTE, None)
+    if cache is None:
+        cache = {}
+        setattr(request, REQUEST_CACHE_ATTRIBUTE, cache)
+    return cache
+
+
+def membership_exists(user_id, board_ref):
+    """
+    Returns an EXISTS expression checking the member through-table for one user and board.
+    The lookup is answered by the unique (board_id, user_id) index of the through-table.
+    """
+    through = Board.members.through
+    return Exists(through.objects.filter(board_id=board_ref, user_id=user_id))
+
+
+def role_for(user_id, owner_id, is_member):
+    """
+    Translates owner ID and membership flag into OWNER, MEMBER or NONE.
+    """
+    if user_id is not None and user_id == owner_id:
+        return OWNER
+    if is_member:
+        return MEMBER
+    return NONE
+
+
+def remember_role(user_id, board_id, role):
+    """
+    Stores a freshly queried role in the cross-request cache and returns it.
+    Anonymous users are not cached.
+    """
+    if user_id is not None:
+        membership_cache.set_role(user_id, board_id, role)
+    return role
+
+
+def user_board_role(user_id, board_id):
+    """
+    Returns the role of a user on a board outside of a request.
+    Consults the cross-request membership cache before running a single query on the primary.
+    Raises Board.DoesNotExist if the board is missing.
+    """
+    if user_id is not None and board_id is not None:
+        role = membership_cache.get_role(user_id, board_id)
+        if role is not None:
+            return role
+
+    with primary_reads():
+        row = (
+            Board.objects.filter(pk=board_id)
+            .annotate(is_member=membership_exists(user_id, OuterRef('pk')))
+            .values_list('owner_id', 'is_member')
+            .first()
+        )
+    if row is None:
+        raise Board.DoesNotExist
+    return remember_role(user_id, board_id, role_for(user_id, *row))
+
+
+async def auser_board_role(user_id, board_id):
+    """
+    Async variant of user_board_role using the async ORM for the single lookup query.
+    Raises Board.DoesNotExist if the board is missing.
+    """
+    if user_id is not None and board_id is not None:
+        role = membership_cache.get_role(user_id, board_id)
+        if role is not None:
+            return role
+
+    row = await (
+        Board.objects.filter(pk=board_id)
+        .annotate(is_member=membership_exists(user_id, OuterRef('pk')))
+        .values_list('owner_id', 'is_member')
+        .afirst()
+    )
+    if row is None:
+        raise Board.DoesNotExist
+    return remember_role(user_id, board_id, role_for(user_id, *row))
+
+
+def board_role(request, board_id):
+    """
+    Returns the role of the requesting user on a board, memoized for the request.
+    Raises Board.DoesNotExist if the board is missing.
+    """
+    cache = get_request_cache(request)
+    if board_id not in cache:
+        cache[board_id] = user_board_role(request.user.pk, board_id)
+    return cache[board_id]
+
+
+def task_board_role(request, task_id):
+    """
+    Returns the role of the requesting user on the board of a task, memoized for the request.
+    Raises Task.DoesNotExist if the task is missing; board and role come from one query on the primary.
+    """
+    cache = get_request_cache(request)
+    task_key = ('task', task_id)
+    if task_key in cache:
+        return cache[cache[task_key]]
+
+    user_id = request.user.pk
+    with primary_reads():
+        row = (
+            Task.objects.filter(pk=task_id)
+            .annotate(is_member=membership_exists(user_id, OuterRef('board_id')))
+            .values_list('board_id', 'board__owner_id', 'is_member')
+            .first()
+        )
+    if row is None:
+        raise Task.DoesNotExist
+    board_id, owner_id, is_member = row
+    cache[task_key] = board_id
+    cache[board_id] = remember_role(user_id, board_id, role_for(user_id, owner_id, is_member))
+    return cache[board_id]
+
+
+def is_owner_or_member(request, board_id):
+    """
+    Returns True if the requesting user owns the board or is one of its members.
+    """
+    return board_role(request, board_id) in (OWNER, MEMBER)
+
+
+def remember_visible_boards(user, boards):
+    """
+    Stores the listed boards and the user's role on each of them in the membership cache.
+    Lists read from a replica are not stored, as they may predate an invalidation.
+    """
+    if current_read_alias() is not None:
+        return
+    for board in boards:
+        membership_cache.set_role(user.pk, board.pk, OWNER if board.owner_id == user.pk else MEMBER)
+    membership_cache.set_visible_board_ids(user.pk, [board.pk for board in boards])
+
+
+def visible_board_ids(user):
+    """
+    Returns the IDs of all boards the user owns or belongs to, from the membership cache or the primary.
+    """
+    board_ids = membership_cache.get_visible_board_ids(user.pk)
+    if board_ids is None:
+        with primary_reads():
+            board_ids = list(visible_boards(user).values_list('id', flat=True))
+        membership_cache.set_visible_board_ids(user.pk, board_ids)
+    return board_ids
@@ -0,0 +1,220 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+
+
+DEFAULTS = {
+    'BACKEND': None,
+    'MAX_SIZE': 10000,
+    'TTL': 60,
+}
+
+
+class LocalLRUCache:
+    """
+    Thread-safe, process-local LRU cache whose entries expire after a fixed TTL.
+    Used as the default store for board membership roles.
+    """
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the stored value or None if it is missing or expired.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys):
+        """
+        Returns a dict with the stored values of the given keys; missing and expired keys are left out.
+        """
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set(self, key, value):
+        """
+        Stores a value and evicts the least recently used entries beyond max_size.
+        """
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete_many(self, keys):
+        """
+        Removes the given keys if present.
+        """
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        """
+        Returns the number of stored entries, including ones not yet evicted after expiry.
+        """
+        return len(self.entries)
+
+
+class DjangoCacheStore:
+    """
+    Adapter storing membership entries in a configured Django cache backend.
+    Lets several worker processes share one membership cache.
+    """
+    def __init__(self, alias, ttl, prefix='taskboard:membership:'):
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def make_key(self, key):
+        """
+        Turns a tuple key into a prefixed string key for the cache backend.
+        """
+        return self.prefix + ':'.join(str(part) for part in key)
+
+    def get(self, key):
+        """
+        Returns the stored value or None if it is missing or expired.
+        """
+        return self.cache.get(self.make_key(key))
+
+    def get_many(self, keys):
+        """
+        Returns a dict with the stored values of the given keys in one backend call.
+        """
+        made_keys = {self.make_key(key): key for key in keys}
+        return {made_keys[made_key]: value for made_key, value in self.cache.get_many(list(made_keys)).items()}
+
+    def set(self, key, value):
+        """
+        Stores a value with the configured TTL.
+        """
+        self.cache.set(self.make_key(key), value, self.ttl)
+
+    def delete_many(self, keys):
+        """
+        Removes the given keys if present.
+        """
+        self.cache.delete_many([self.make_key(key) for key in keys])
+
+    def clear(self):
+        """
+        Clears the whole backend; use a dedicated cache alias for membership entries.
+        """
+        self.cache.clear()
+
+
+class MembershipCache:
+    """
+    Cross-request cache mapping (user_id, board_id) to 'owner', 'member' or 'none'.
+    Also keeps the visible board IDs per user; signals invalidate both on changes.
+    """
+    def __init__(self, store):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key):
+        """
+        Reads a key from the store and updates the hit and miss counters.
+        """
+        value = self.store.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_role(self, user_id, board_id):
+        """
+        Returns the cached role of a user on a board or None on a cache miss.
+        """
+        return self.lookup(('role', user_id, board_id))
+
+    def set_role(self, user_id, board_id, role):
+        """
+        Stores the role of a user on a board.
+        """
+        self.store.set(('role', user_id, board_id), role)
+
+    def get_visible_board_ids(self, user_id):
+        """
+        Returns the cached IDs of all boards the user owns or belongs to, or None on a miss.
+        """
+        return self.lookup(('boards', user_id))
+
+    def set_visible_board_ids(self, user_id, board_ids):
+        """
+        Stores the IDs of all boards the user owns or belongs to.
+        """
+        self.store.set(('boards', user_id), list(board_ids))
+
+    def invalidate(self, board_id, user_ids):
+        """
+        Drops the roles of the given users on a board together with their board lists.
+        """
+        keys = []
+        for user_id in user_ids:
+            keys.append(('role', user_id, board_id))
+            keys.append(('boards', user_id))
+        self.store.delete_many(keys)
+
+    def stats(self):
+        """
+        Returns hit and miss counters so the cache size can be tuned.
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        self.store.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def build_membership_cache():
+    """
+    Creates the membership cache from the TASKBOARD_MEMBERSHIP_CACHE setting.
+    Uses the process-local LRU store unless a Django cache alias is configured as BACKEND.
+    """
+    config = {**DEFAULTS, **getattr(settings, 'TASKBOARD_MEMBERSHIP_CACHE', {})}
+    if config['BACKEND']:
+        store = DjangoCacheStore(config['BACKEND'], config['TTL'])
+    else:
+        store = LocalLRUCache(config['MAX_SIZE'], config['TTL'])
+    return MembershipCache(store)
+
+
+membership_cache = build_membership_cache()
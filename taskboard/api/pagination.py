@@ -0,0 +1,210 @@
+import base64
+import json
+from datetime import date
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def cursor_int(value):
+    """
+    Returns an integer cursor value; raises ValueError for anything else.
+    """
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError
+    return value
+
+
+def cursor_float(value):
+    """
+    Returns a numeric cursor value as float; raises ValueError for anything else.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError
+    return float(value)
+
+
+def cursor_date(value):
+    """
+    Returns the date of an ISO formatted cursor value; raises ValueError for anything else.
+    """
+    if not isinstance(value, str):
+        raise ValueError
+    return date.fromisoformat(value)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset pagination that filters on the last seen ordering values instead of an offset.
+    Only applies when the request passes a cursor or page_size, so plain lists stay unchanged.
+    """
+    ordering = ('id',)
+    cursor_fields = {'id': cursor_int}
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_requested(self, request):
+        """
+        Returns True if the client asked for a paginated response.
+        """
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        """
+        Returns the requested page size, capped at max_page_size; falls back to page_size.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size < 1:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, values):
+        """
+        Encodes the ordering values of the last row into an opaque URL-safe cursor.
+        """
+        values = [value.isoformat() if isinstance(value, date) else value for value in values]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def get_ordering(self, view):
+        """
+        Returns the view's ordering for this request if it provides one, else the class ordering.
+        Fields prefixed with '-' are descending.
+        """
+        get_keyset_ordering = getattr(view, 'get_keyset_ordering', None)
+        return tuple(get_keyset_ordering()) if get_keyset_ordering else self.ordering
+
+    def decode_cursor(self, cursor):
+        """
+        Decodes a cursor back into ordering values converted by cursor_fields.
+        Raises NotFound if it is malformed or a value does not fit its field.
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                self.cursor_fields[field.lstrip('-')](value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def after(self, values):
+        """
+        Builds the filter selecting rows strictly after the given ordering values.
+        Expands (a, b, c) > (x, y, z) so every branch can use the composite index.
+        """
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            branch = Q(**{f'{field.lstrip("-")}__{lookup}': values[index]})
+            for previous, value in zip(self.ordering[:index], values[:index]):
+                branch &= Q(**{previous.lstrip('-'): value})
+            condition |= branch
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns one page of rows after the cursor, or None if pagination was not requested.
+        """
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after(self.decode_cursor(cursor)))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_values = None
+        if self.has_next:
+            last = rows[-1]
+            if isinstance(last, dict):
+                self.next_values = [last[field.lstrip('-')] for field in self.ordering]
+            else:
+                self.next_values = [getattr(last, field.lstrip('-')) for field in self.ordering]
+        return rows
+
+    def get_next_link(self):
+        """
+        Returns the URL of the next page or None on the last page.
+        """
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_values))
+
+    def get_paginated_response(self, data):
+        """
+        Wraps a page of results together with the link to the next page.
+        """
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        """
+        Describes the paginated response layout for schema generation.
+        """
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class TaskPagination(KeysetPagination):
+    """
+    Keyset pagination for task lists ordered by due date, with the ID as tie-breaker.
+    """
+    ordering = ('due_date', 'id')
+    cursor_fields = {'id': cursor_int, 'due_date': cursor_date, 'priority_rank': cursor_int}
+
+
+class SearchPagination(KeysetPagination):
+    """
+    Always-on keyset pagination over ranked search hits ordered by (rank, id).
+    Paginates a TaskSearch instead of a queryset.
+    """
+    ordering = ('rank', 'id')
+    cursor_fields = {'id': cursor_int, 'rank': cursor_float}
+    page_size = 20
+    max_page_size = 100
+
+    def is_requested(self, request):
+        """
+        Search results are always paginated.
+        """
+        return True
+
+    def paginate_queryset(self, search, request, view=None):
+        """
+        Returns the tasks of one page of hits after the cursor.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        hits = search.hits(page_size + 1, self.decode_cursor(cursor) if cursor else None)
+        self.has_next = len(hits) > page_size
+        hits = hits[:page_size]
+        self.next_values = list(hits[-1]) if self.has_next else None
+        return search.tasks(hits)
@@ -1,6 +1,17 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from taskboard.models import Board, Task, Comment
 from rest_framework.exceptions import NotFound
+from taskboard.api.membership import OWNER, MEMBER, board_role, task_board_role, is_owner_or_member
+
+
+def to_pk(value):
+    """
+    Converts a URL or payload ID to an int; anything else is treated as missing.
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 class IsOwnerOrMember(BasePermission):
     """
@@ -13,27 +24,25 @@ class IsOwnerOrMember(BasePermission):
         Checks if the user is the board owner or a member; safe methods are always allowed.
         Raises a 404 error if the board does not exist.
         """
-        user = request.user
-        method = request.method
-
         try:
-            board = Board.objects.get(pk=view.kwargs.get('pk'))
+            role = board_role(request, to_pk(view.kwargs.get('pk')))
         except Board.DoesNotExist:
             raise NotFound("Board does not exist")
-        if method in SAFE_METHODS:
+        if request.method in SAFE_METHODS:
             return True
-        return bool(user == board.owner or user in board.members.all())
+        return role in (OWNER, MEMBER)
     
     def has_object_permission(self, request, view, obj): 
         """
         Allows access if the user is the board owner or a member; only the owner can delete the board.
+        Reuses the role resolved in has_permission instead of querying the members again.
         """
         board = obj
 
         if request.method == 'DELETE':
-            return bool(request.user == board.owner)
+            return bool(request.user.pk == board.owner_id)
         else:
-            return bool(request.user == board.owner or request.user in board.members.all())
+            return is_owner_or_member(request, board.pk)
         
 class IsBoardMember(BasePermission):
     """
@@ -48,34 +57,31 @@ class IsBoardMember(BasePermission):
         board_id = request.data.get("board")
         if board_id:
             try:
-                board = Board.objects.get(pk=board_id)
+                role = board_role(request, to_pk(board_id))
             except Board.DoesNotExist:
                 raise NotFound("Board does not exist")
         else:
             try:
-                task = Task.objects.get(pk=view.kwargs.get("pk"))
-                board = task.board
-            except:
+                role = task_board_role(request, to_pk(view.kwargs.get("pk")))
+            except Task.DoesNotExist:
                 raise NotFound("Task does not exist")
-        return (
-            request.user == board.owner or
-            board.members.filter(id=request.user.id).exists()
-        )
+        return role in (OWNER, MEMBER)
     
     def has_object_permission(self, request, view, obj):
         """
         Allows access if user is board owner or member; only owner or task creator may delete.
+        Reuses the role resolved in has_permission instead of querying the members again.
         """
         task = obj
         try:
-            board = task.board
-        except:
+            role = board_role(request, task.board_id)
+        except Board.DoesNotExist:
             return False
         
         if request.method == "DELETE":
-            return bool(request.user == board.owner or request.user == task.creator)
+            return bool(role == OWNER or request.user.pk == task.creator_id)
         
-        return bool(request.user == board.owner or request.user in board.members.all())
+        return role in (OWNER, MEMBER)
     
 class IsCommentAuthor(BasePermission):
     """
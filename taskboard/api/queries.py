@@ -0,0 +1,76 @@
+from django.db.models import Count, F, Q, OuterRef, Subquery, IntegerField, Prefetch
+from django.db.models.functions import Coalesce
+from django.contrib.auth.models import User
+from taskboard.models import Board, Task
+
+
+def member_count_subquery():
+    """
+    Returns a correlated subquery counting the members of the outer board.
+    Kept separate from the task join so member rows never multiply task counts.
+    """
+    through = Board.members.through
+    counts = (
+        through.objects.filter(board_id=OuterRef('pk'))
+        .order_by()
+        .values('board_id')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def annotate_board_counters(queryset):
+    """
+    Adds member and task counters to a board queryset within a single query.
+    Task counters are read from the BoardStats row, so no tasks are counted per request.
+    The names match the BoardSerializer fields so the serializer can read them directly.
+    """
+    return queryset.annotate(
+        member_count=member_count_subquery(),
+        ticket_count=Coalesce(F('stats__ticket_count'), 0),
+        tasks_to_do_count=Coalesce(F('stats__to_do_count'), 0),
+        tasks_high_prio_count=Coalesce(F('stats__high_priority_count'), 0),
+    )
+
+
+def visible_boards(user):
+    """
+    Returns boards where the user is owner or member without joining the member table.
+    Membership is resolved through a subquery so later aggregates are not duplicated.
+    """
+    member_board_ids = Board.members.through.objects.filter(user_id=user.pk).values('board_id')
+    return Board.objects.filter(Q(owner_id=user.pk) | Q(pk__in=member_board_ids))
+
+
+def board_list_queryset(user, board_ids=None):
+    """
+    Returns the annotated board list for a user with members prefetched in bulk.
+    Known visible board IDs replace the membership subquery when they are passed in.
+    """
+    if board_ids is None:
+        boards = visible_boards(user)
+    else:
+        boards = Board.objects.filter(pk__in=board_ids)
+    return annotate_board_counters(boards).prefetch_related('members')
+
+
+def task_detail_queryset():
+    """
+    Returns tasks with assignee and reviewer joined and the comment count annotated.
+    Serializing these tasks with TaskSerializer needs no further queries.
+    """
+    return Task.objects.select_related('assignee', 'reviewer').annotate(comments_count=Count('comments'))
+
+
+def board_detail_queryset(tasks=None):
+    """
+    Returns boards with owner, members and fully prepared tasks loaded up front.
+    Rendering BoardDetailSerializer then costs a bounded number of queries per board.
+    A narrower task queryset can be passed when only some task fields are rendered.
+    """
+    tasks = task_detail_queryset() if tasks is None else tasks
+    return Board.objects.select_related('owner').prefetch_related(
+        Prefetch('members', queryset=User.objects.order_by('id')),
+        Prefetch('tasks', queryset=tasks.order_by('id')),
+    )
@@ -0,0 +1,103 @@
+import re
+from django.db import connections, router
+from django.db.models import Q
+from taskboard.models import Task
+from taskboard.api.queries import task_detail_queryset
+
+
+SEARCH_TABLE = 'taskboard_task_search'
+WORD = re.compile(r'\w+')
+MAX_TERMS = 10
+
+
+def search_terms(query):
+    """
+    Splits free text into at most MAX_TERMS words; FTS syntax characters are dropped.
+    """
+    return WORD.findall(query)[:MAX_TERMS]
+
+
+def match_expression(terms):
+    """
+    Builds an FTS5 expression requiring every term, the last one as a prefix for search-as-you-type.
+    """
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def read_connection():
+    """
+    Returns the connection the router picks for task reads, so raw searches follow replica routing.
+    """
+    return connections[router.db_for_read(Task)]
+
+
+def uses_full_text_index():
+    """
+    Returns True if the FTS5 index from migration 0007 is available on the read database.
+    """
+    return read_connection().vendor == 'sqlite'
+
+
+class TaskSearch:
+    """
+    Ranked search over task titles, descriptions and comments on a fixed set of boards.
+    Hits are (rank, task_id) pairs ordered by rank and ID, so pages can continue after the last hit.
+    """
+    def __init__(self, board_ids, query, tasks=None):
+        self.board_ids = list(board_ids)
+        self.terms = search_terms(query)
+        self.task_queryset = task_detail_queryset() if tasks is None else tasks
+
+    def hits(self, limit, after=None):
+        """
+        Returns up to limit hits following the (rank, task_id) pair in after.
+        """
+        if not self.terms or not self.board_ids:
+            return []
+        if uses_full_text_index():
+            return self.index_hits(limit, after)
+        return self.fallback_hits(limit, after)
+
+    def index_hits(self, limit, after):
+        """
+        Reads hits from the FTS5 index; lower bm25 ranks are better matches.
+        The task join restricts hits to the visible boards.
+        """
+        board_placeholders = ', '.join(['%s'] * len(self.board_ids))
+        params = [match_expression(self.terms), *self.board_ids]
+        sql = (
+            f'SELECT {SEARCH_TABLE}.rank, {SEARCH_TABLE}.rowid FROM {SEARCH_TABLE} '
+            f'JOIN taskboard_task ON taskboard_task.id = {SEARCH_TABLE}.rowid '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND taskboard_task.board_id IN ({board_placeholders})'
+        )
+        if after is not None:
+            sql += f' AND ({SEARCH_TABLE}.rank > %s OR ({SEARCH_TABLE}.rank = %s AND {SEARCH_TABLE}.rowid > %s))'
+            params += [after[0], after[0], after[1]]
+        sql += f' ORDER BY {SEARCH_TABLE}.rank, {SEARCH_TABLE}.rowid LIMIT %s'
+        params.append(limit)
+        with read_connection().cursor() as cursor:
+            cursor.execute(sql, params)
+            return [(rank, task_id) for rank, task_id in cursor.fetchall()]
+
+    def fallback_hits(self, limit, after):
+        """
+        Matches every term with LIKE on databases without the FTS5 index; all hits share rank 0.
+        """
+        tasks = Task.objects.filter(board_id__in=self.board_ids)
+        for term in self.terms:
+            tasks = tasks.filter(
+                Q(title__icontains=term) | Q(description__icontains=term) | Q(comments__content__icontains=term)
+            )
+        if after is not None:
+            tasks = tasks.filter(id__gt=after[1])
+        task_ids = tasks.order_by('id').values_list('id', flat=True).distinct()[:limit]
+        return [(0.0, task_id) for task_id in task_ids]
+
+    def tasks(self, hits):
+        """
+        Loads the tasks of the given hits in hit order with the task list preloading.
+        """
+        tasks = self.task_queryset.in_bulk([task_id for rank, task_id in hits])
+        return [tasks[task_id] for rank, task_id in hits if task_id in tasks]
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from taskboard.models import Board, Task, Comment
+from taskboard.models import Board, Task, Comment, BoardChange
 from django.contrib.auth.models import User
 from user_auth_app.api.serializers import UserProfileSerializer
 from rest_framework.request import Request
@@ -24,19 +24,26 @@ class MembersField(serializers.Field):
         """
         return UserProfileSerializer(value.all(), many=True).data
     
-    def to_internal_value(self, data):    
+    def to_internal_value(self, data):
         """
-        Validates and resolves a list of user IDs into User objects.
-        Raises a validation error if a user does not exist.
+        Resolves a list of user IDs into User objects with a single query.
+        Raises a validation error naming every ID that is malformed or does not exist.
         """
-        users=[]
+        if not isinstance(data, list):
+            raise serializers.ValidationError("Members must be a list of user IDs.")
+
+        member_ids = []
+        invalid = []
         for pk in data:
-            try:
-                user = User.objects.get(pk=pk)
-                users.append(user)
-            except User.DoesNotExist:
-                raise serializers.ValidationError("User dont exist")
-        return users
+            if isinstance(pk, bool) or not (isinstance(pk, int) or str(pk).isdigit()):
+                invalid.append(pk)
+            else:
+                member_ids.append(int(pk))
+        users = User.objects.in_bulk(member_ids)
+        missing = invalid + [pk for pk in member_ids if pk not in users]
+        if missing:
+            raise serializers.ValidationError(f"User dont exist: {', '.join(str(pk) for pk in missing)}")
+        return list({pk: users[pk] for pk in member_ids}.values())
 
 class BoardSerializer(serializers.ModelSerializer):
     """
@@ -58,25 +65,37 @@ class BoardSerializer(serializers.ModelSerializer):
     def get_member_count(self, obj):   
         """
         Returns the number of members associated with the board.
+        Uses the annotated value from the board list query when available.
         """
+        if hasattr(obj, 'member_count'):
+            return obj.member_count
         return obj.members.count()
     
     def get_ticket_count(self, obj):    
         """
         Returns the total number of tasks associated with the board.
+        Uses the annotated value from the board list query when available.
         """
+        if hasattr(obj, 'ticket_count'):
+            return obj.ticket_count
         return obj.tasks.count()
     
     def get_tasks_to_do_count(self, obj):
         """
         Counts tasks with status 'to-do' for the given board.
+        Uses the annotated value from the board list query when available.
         """
+        if hasattr(obj, 'tasks_to_do_count'):
+            return obj.tasks_to_do_count
         return obj.tasks.filter(status='to-do').count()
     
     def get_tasks_high_prio_count(self, obj):
         """
         Counts tasks with priority 'high' for the given board.
+        Uses the annotated value from the board list query when available.
         """
+        if hasattr(obj, 'tasks_high_prio_count'):
+            return obj.tasks_high_prio_count
         return obj.tasks.filter(priority='high').count()
     
     def create(self, validated_data):  
@@ -90,7 +109,7 @@ class BoardSerializer(serializers.ModelSerializer):
 
         board = Board.objects.create(owner=owner, **validated_data)
 
-        board.members.set(members)
+        board.members.add(*members)
         return board
     
 class TaskSerializer(serializers.ModelSerializer):
@@ -120,10 +139,21 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = ['id', 'board', 'title', 'description', 'status', 'priority', 'assignee', 'reviewer', 'assignee_id', 'reviewer_id', 'due_date', 'comments_count']
 
+    def get_fields(self):
+        """
+        Returns the fields picked by the task field selection in the context, or all fields.
+        """
+        fields = super().get_fields()
+        selection = self.context.get('task_fields')
+        return selection.apply(fields) if selection else fields
+
     def get_comments_count(self, obj):
         """
         Returns the number of comments associated with the task.
+        Uses the annotated value from the task detail query when available.
         """
+        if hasattr(obj, 'comments_count'):
+            return obj.comments_count
         return obj.comments.count()
 
     def create(self, validated_data):    
@@ -136,6 +166,23 @@ class TaskSerializer(serializers.ModelSerializer):
 
         return task
     
+class TaskBulkOperationSerializer(serializers.Serializer):
+    """
+    Serializer for a single operation of a bulk task request.
+    Create operations carry task data; update and delete operations also need the task ID.
+    """
+    op = serializers.ChoiceField(choices=['create', 'update', 'delete'])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        """
+        Requires a task ID for update and delete operations.
+        """
+        if attrs['op'] != 'create' and 'id' not in attrs:
+            raise serializers.ValidationError({'id': ['This field is required.']})
+        return attrs
+    
 class BoardDetailSerializer(BoardSerializer):
     """
     Extends BoardSerializer to include related tasks and dynamic user representation.
@@ -152,16 +199,15 @@ class BoardDetailSerializer(BoardSerializer):
         """
         Customizes the board representation depending on the HTTP method.
         Returns full user data for owner and members in PATCH; otherwise uses IDs.
+        The members are serialized once by MembersField and reused for both layouts.
         """
         rep = super().to_representation(instance)
         request: Request = self.context.get("request")
         if request and request.method == "PATCH":
             rep["owner_data"] = UserProfileSerializer(instance.owner).data
-            rep["members_data"] = UserProfileSerializer(instance.members.all(), many=True).data
-            rep.pop("members", None)
+            rep["members_data"] = rep.pop("members")
         else:
             rep["owner_id"] = instance.owner_id
-            rep["members"] = UserProfileSerializer(instance.members.all(), many=True).data
         return rep
     
 class CommentSerializer(serializers.ModelSerializer):
@@ -179,4 +225,12 @@ class CommentSerializer(serializers.ModelSerializer):
         """
         Returns the author's full username as a string.
         """
-        return get_full_username(obj.author)
\ No newline at end of file
+        return get_full_username(obj.author)
+    
+class BoardChangeSerializer(serializers.ModelSerializer):
+    """
+    Serializer for change log entries with their per-board sequence number.
+    """
+    class Meta:
+        model = BoardChange
+        fields = ['seq', 'entity', 'action', 'object_id', 'data', 'created_at']
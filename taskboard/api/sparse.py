@@ -0,0 +1,159 @@
+from django.contrib.auth.models import User
+from django.db.models import Count
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from user_auth_app.api.serializers import UserProfileSerializer
+
+
+TASK_FIELDS = ('id', 'board', 'title', 'description', 'status', 'priority', 'assignee', 'reviewer', 'due_date', 'comments_count')
+USER_RELATIONS = ('assignee', 'reviewer')
+
+
+class TaskFieldSelection:
+    """
+    Task fields requested through ?fields=, ?expand= and ?compact=true.
+    Without parameters every field is rendered and both users are nested objects, as before.
+    With fields or compact, users are rendered as IDs unless listed in expand; compact side-loads them once.
+    """
+    def __init__(self, params):
+        self.error = None
+        self.fields = None
+        self.expand = USER_RELATIONS
+        self.compact = False
+        try:
+            self.parse(params)
+        except ValueError as error:
+            self.error = str(error)
+
+    def parse_names(self, params, name, allowed):
+        """
+        Returns the comma-separated names of a parameter or None if it is absent; rejects unknown names.
+        """
+        if name not in params:
+            return None
+        names = tuple(value.strip() for value in params[name].split(',') if value.strip())
+        for value in names:
+            if value not in allowed:
+                raise ValueError(f'{name} must be a subset of {", ".join(allowed)}.')
+        return names
+
+    def parse(self, params):
+        """
+        Reads the selection from the query parameters; raises ValueError on unknown names.
+        """
+        compact = params.get('compact', 'false')
+        if compact not in ('true', 'false'):
+            raise ValueError('compact must be true or false.')
+        self.compact = compact == 'true'
+        self.fields = self.parse_names(params, 'fields', TASK_FIELDS)
+        expand = self.parse_names(params, 'expand', USER_RELATIONS)
+        if expand is not None:
+            self.expand = expand
+        elif self.fields is not None or self.compact:
+            self.expand = ()
+
+    def includes(self, field):
+        """
+        Returns True if the field is rendered.
+        """
+        return self.fields is None or field in self.fields
+
+    def referenced_relations(self):
+        """
+        Returns the user relations rendered as IDs.
+        """
+        return [relation for relation in USER_RELATIONS if self.includes(relation) and relation not in self.expand]
+
+    def prepare_queryset(self, queryset):
+        """
+        Joins and annotates only what the rendered fields need.
+        """
+        related = [relation for relation in USER_RELATIONS if self.includes(relation) and relation in self.expand]
+        if related:
+            queryset = queryset.select_related(*related)
+        if self.includes('comments_count'):
+            queryset = queryset.annotate(comments_count=Count('comments'))
+        return queryset
+
+    def apply(self, fields):
+        """
+        Drops unrequested readable fields and turns unexpanded users into ID fields.
+        Write-only fields stay so the serializer keeps validating input.
+        """
+        selected = {}
+        for name, field in fields.items():
+            if not field.write_only and not self.includes(name):
+                continue
+            if name in USER_RELATIONS and name not in self.expand:
+                field = serializers.ReadOnlyField(source=f'{name}_id')
+            selected[name] = field
+        return selected
+
+    def side_loaded_users(self, tasks):
+        """
+        Returns the deduplicated profiles of all users the rendered tasks reference by ID, loaded with one query.
+        """
+        user_ids = {task[relation] for task in tasks for relation in self.referenced_relations()}
+        user_ids.discard(None)
+        if not user_ids:
+            return []
+        return UserProfileSerializer(User.objects.filter(pk__in=user_ids).order_by('id'), many=True).data
+
+    def add_side_loaded_users(self, data, tasks):
+        """
+        Adds the users table for the rendered tasks to a compact payload.
+        Lists are wrapped as {'results': ..., 'users': ...}.
+        """
+        if not self.compact:
+            return data
+        users = self.side_loaded_users(tasks)
+        if isinstance(data, list):
+            return {'results': data, 'users': users}
+        data['users'] = users
+        return data
+
+
+def get_field_selection(request):
+    """
+    Returns the task field selection of a request, parsed once per request.
+    Only GET and HEAD requests are shaped; writes always return the full representation.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    if not hasattr(request, '_task_field_selection'):
+        request._task_field_selection = TaskFieldSelection(request.GET)
+    return request._task_field_selection
+
+
+class TaskFieldsMixin:
+    """
+    Adds sparse fieldsets and compact mode to a generic task list view.
+    """
+    def get_serializer_context(self):
+        """
+        Passes the field selection to TaskSerializer.
+        """
+        context = super().get_serializer_context()
+        context['task_fields'] = get_field_selection(self.request)
+        return context
+
+    def filter_queryset(self, queryset):
+        """
+        Loads only the joins and annotations the selected fields need.
+        """
+        queryset = super().filter_queryset(queryset)
+        selection = get_field_selection(self.request)
+        return selection.prepare_queryset(queryset) if selection else queryset
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns 400 for unknown field names and adds the users table in compact mode.
+        """
+        selection = get_field_selection(request)
+        if selection.error:
+            return Response({"error": selection.error}, status=status.HTTP_400_BAD_REQUEST)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            tasks = response.data['results'] if isinstance(response.data, dict) else response.data
+            response.data = selection.add_side_loaded_users(response.data, tasks)
+        return response
@@ -1,13 +1,21 @@
 from django.urls import path
-from taskboard.api.views import BoardListView, BoardDetailView, TaskListView, TaskListAssignedView, TaskListReviewingView, TaskDetailView, CommentCreateView, CommentDeleteView
+from taskboard.api.async_views import AsyncBoardListView, AsyncBoardDetailView, AsyncUserTaskListView
+from taskboard.api.views import BoardListView, BoardDetailView, BoardChangeListView, TaskListView, TaskListAssignedView, TaskListReviewingView, TaskDetailView, TaskBulkView, TaskSearchView, CommentCreateView, CommentDeleteView
 
 urlpatterns = [
     path('boards/', BoardListView.as_view(), name='board-list'),
     path('boards/<int:pk>/', BoardDetailView.as_view(), name='board-detail'),
+    path('boards/<int:pk>/changes/', BoardChangeListView.as_view(), name='board-changes'),
     path('tasks/', TaskListView.as_view(), name='tasks-list'),
+    path('tasks/bulk/', TaskBulkView.as_view(), name='tasks-bulk'),
+    path('tasks/search/', TaskSearchView.as_view(), name='tasks-search'),
     path('tasks/<int:pk>/', TaskDetailView.as_view(), name='tasks-detail'),
     path('tasks/assigned-to-me/', TaskListAssignedView.as_view(), name='tasks-assignee'),
     path('tasks/reviewing/', TaskListReviewingView.as_view(), name='tasks-review'),
     path('tasks/<int:pk>/comments/', CommentCreateView.as_view(), name='comment-create'),
     path('tasks/<int:pk>/comments/<int:comment_id>/', CommentDeleteView.as_view(), name='comment-delete'),
+    path('async/boards/', AsyncBoardListView.as_view(), name='async-board-list'),
+    path('async/boards/<int:pk>/', AsyncBoardDetailView.as_view(), name='async-board-detail'),
+    path('async/tasks/assigned-to-me/', AsyncUserTaskListView.as_view(field='assignee_id'), name='async-tasks-assignee'),
+    path('async/tasks/reviewing/', AsyncUserTaskListView.as_view(field='reviewer_id'), name='async-tasks-review'),
 ]
\ No newline at end of file
@@ -1,13 +1,30 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
 from taskboard.models import Board, Task, Comment
-from taskboard.api.serializers import BoardSerializer, BoardDetailSerializer, TaskSerializer, CommentSerializer
+from taskboard.api.serializers import BoardSerializer, BoardDetailSerializer, TaskSerializer, CommentSerializer, BoardChangeSerializer
 from taskboard.api.permissions import IsOwnerOrMember, IsBoardMember, IsCommentAuthor
+from taskboard.api.queries import board_list_queryset, board_detail_queryset
+from taskboard.api.membership import remember_visible_boards, visible_board_ids
+from taskboard.api.membership_cache import membership_cache
+from taskboard.api.board_list_cache import board_list_cache
+from taskboard.api.pagination import TaskPagination, SearchPagination
+from taskboard.api.search import TaskSearch
+from taskboard.api.filters import TaskFilterMixin
+from taskboard.api.sparse import TaskFieldsMixin, get_field_selection
+from taskboard.api.fast import FastTaskListMixin, FastCommentListMixin, board_detail_data, fast_serializers_enabled
+from taskboard.api.bulk import TaskBatch
+from taskboard.replicas import ReplicaReadMixin, primary_reads
+from contextlib import nullcontext
+from taskboard.api.conditional import board_detail_etag, board_detail_last_modified, user_tasks_etag
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
 
-class BoardListView(generics.ListCreateAPIView):
+class BoardListView(ReplicaReadMixin, generics.ListCreateAPIView):
     """
     API view to list and create boards accessible to the authenticated user.
     Lists boards where the user is owner or member and validates members on creation.
@@ -18,56 +35,149 @@ class BoardListView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         """
-        Returns boards where the user is either the owner or a member, without duplicates
+        Returns boards where the user is either the owner or a member, without duplicates.
+        Visible board IDs come from the membership cache when it holds them.
         """
-        user = self.request.user        
-        boards = Board.objects.filter(members=user) | Board.objects.filter(owner=user)
-
-        return boards.distinct()
+        user = self.request.user
+        board_ids = membership_cache.get_visible_board_ids(user.pk)
+        return board_list_queryset(user, board_ids)
     
     def get(self, request, *args, **kwargs):
         """
         Returns a serialized list of all boards the user has access to.
+        Paginates on request; full lists are served from the board list cache when it holds them.
         """
-        queryset = self.get_queryset()
+        if self.paginator is not None and self.paginator.is_requested(request):
+            queryset = self.get_queryset()
+            page = self.paginate_queryset(queryset)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        data = board_list_cache.get(request.user.pk)
+        if data is not None:
+            return Response(data)
+        return Response(self.render_board_list(request.user))
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    def render_board_list(self, user):
+        """
+        Renders the full board list and stores it in the membership and board list caches.
+        Lists that get cached are read from the primary to keep replication lag out of the cached payload.
+        """
+        state = board_list_cache.start_fill(user.pk)
+        with primary_reads() if state is not None else nullcontext():
+            boards = list(self.get_queryset())
+            remember_visible_boards(user, boards)
+            data = list(self.get_serializer(boards, many=True).data)
+        board_list_cache.set(user.pk, state, [board.pk for board in boards], data)
+        return data
     
     def create(self, request, *args, **kwargs):
         """
-        Validates members input and delegates to the parent create method.
-        Returns a 400 error if members is not a list of valid user IDs.
+        Creates a board after MembersField resolved all member IDs in one query.
+        Returns a 400 error naming the invalid IDs if members is not a list of existing user IDs.
         """
-        member_ids = request.data.get('members', [])
-
-        if not isinstance(member_ids, list):
-            return Response({"error": "Members must be a list of user IDs."}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            if 'members' in serializer.errors:
+                return Response({"error": serializer.errors['members'][0]}, status=status.HTTP_400_BAD_REQUEST)
+            raise ValidationError(serializer.errors)
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
-        for member_id in member_ids:
-            if not isinstance(member_id, int) and not str(member_id).isdigit():
-                return Response({"error": "User dont exist"}, status=status.HTTP_400_BAD_REQUEST)
-
-        return super().create(request, *args, **kwargs)
-
-class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
+@method_decorator(condition(etag_func=board_detail_etag, last_modified_func=board_detail_last_modified), name='get')
+class BoardDetailView(ReplicaReadMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve, update, or delete a board with detailed info.
     Access restricted to board owners or members.
     """
-    queryset = Board.objects.all()
     serializer_class = BoardDetailSerializer
     permission_classes = [IsOwnerOrMember]
+
+    def get_queryset(self):
+        """
+        Returns boards with owner, members, tasks, task users and comment counts preloaded.
+        Only the joins the selected task fields need are made; the fast read path loads them itself.
+        Deletes load the plain board and updates only the owner; the update response is reloaded in perform_update.
+        """
+        if self.request.method == 'DELETE':
+            return Board.objects.all()
+        if self.request.method in ('PATCH', 'PUT'):
+            return Board.objects.select_related('owner')
+        if fast_serializers_enabled():
+            return Board.objects.all()
+        selection = get_field_selection(self.request)
+        if selection is None:
+            return board_detail_queryset()
+        return board_detail_queryset(selection.prepare_queryset(Task.objects.all()))
+
+    def get_serializer_context(self):
+        """
+        Passes the task field selection to the nested TaskSerializer.
+        """
+        context = super().get_serializer_context()
+        context['task_fields'] = get_field_selection(self.request)
+        return context
+
+    def perform_update(self, serializer):
+        """
+        Saves the board and reloads it through the detail query for the response payload.
+        """
+        board = serializer.save()
+        serializer.instance = board_detail_queryset().get(pk=board.pk)
     
     def get(self, request, *args, **kwargs):
         """
         Retrieves and returns detailed information for a single board instance.
+        Supports the task field selection; returns 400 for unknown field names.
         """
+        selection = get_field_selection(request)
+        if selection.error:
+            return Response({"error": selection.error}, status=status.HTTP_400_BAD_REQUEST)
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if fast_serializers_enabled():
+            data = board_detail_data(instance, selection)
+        else:
+            data = self.get_serializer(instance).data
+        data = selection.add_side_loaded_users(data, data['tasks'])
+        return Response(data, status=status.HTTP_200_OK)
         
-class TaskListView(generics.ListCreateAPIView):
+class BoardChangeListView(ReplicaReadMixin, generics.GenericAPIView):
+    """
+    API view returning the changes of a board after a given sequence number.
+    Lets clients apply small deltas instead of reloading the whole board.
+    """
+    queryset = Board.objects.all()
+    serializer_class = BoardChangeSerializer
+    permission_classes = [IsOwnerOrMember]
+    max_changes = 500
+
+    def get(self, request, *args, **kwargs):
+        """
+        Returns up to max_changes entries after ?since=<seq>; without since only the latest seq.
+        Returns 410 if the requested entries were compacted and the board must be reloaded.
+        """
+        board = self.get_object()
+        since = request.query_params.get('since')
+        if since is None:
+            return Response({"last_seq": board.last_change_seq, "changes": [], "has_more": False})
+        if not since.isdigit():
+            return Response({"error": "since must be a sequence number."}, status=status.HTTP_400_BAD_REQUEST)
+
+        since = int(since)
+        if since < board.changes_compacted_until:
+            return Response({"error": "Changes were compacted, reload the board.", "compacted_until": board.changes_compacted_until}, status=status.HTTP_410_GONE)
+
+        changes = list(board.changes.filter(seq__gt=since).order_by('seq')[:self.max_changes + 1])
+        has_more = len(changes) > self.max_changes
+        changes = changes[:self.max_changes]
+        return Response({
+            "last_seq": changes[-1].seq if changes else since,
+            "changes": self.get_serializer(changes, many=True).data,
+            "has_more": has_more,
+        })
+
+class TaskListView(ReplicaReadMixin, generics.ListCreateAPIView):
     """
     API view to list and create tasks accessible to board members.
     Restricts access to users who are owners or members of the related board.
@@ -75,8 +185,9 @@ class TaskListView(generics.ListCreateAPIView):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsBoardMember]
+    pagination_class = TaskPagination
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(ReplicaReadMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve, update, or delete a task within a board.
     Access restricted to board owners and members.
@@ -91,12 +202,68 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
         """
         return self.destroy(request, *args, **kwargs)
 
-class TaskListAssignedView(generics.ListAPIView):
+class TaskBulkView(APIView):
+    """
+    API view to create, update and delete many tasks in a single request and transaction.
+    Checks board access once per distinct board and reports a result for every operation.
+    """
+    permission_classes = [IsAuthenticated]
+    max_operations = 200
+
+    def post(self, request, *args, **kwargs):
+        """
+        Validates all operations and applies them together, or none of them if any is invalid.
+        Returns 400 with per-operation results if validation fails.
+        """
+        operations = request.data.get('operations') if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            return Response({"error": "Operations must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(operations) > self.max_operations:
+            return Response({"error": f"At most {self.max_operations} operations are allowed per request."}, status=status.HTTP_400_BAD_REQUEST)
+
+        batch = TaskBatch(request, operations)
+        if not (batch.validate() and batch.apply()):
+            batch.mark_not_applied()
+            return Response({"results": batch.results}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": batch.results}, status=status.HTTP_200_OK)
+
+class TaskSearchView(ReplicaReadMixin, APIView):
+    """
+    API view to search task titles, descriptions and comments on the boards of the user.
+    Returns ranked, cursor-paginated tasks.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchPagination
+
+    def get(self, request, *args, **kwargs):
+        """
+        Returns the tasks matching every word of ?q=, best matches first.
+        Returns 400 if the query contains no searchable word.
+        """
+        selection = get_field_selection(request)
+        if selection.error:
+            return Response({"error": selection.error}, status=status.HTTP_400_BAD_REQUEST)
+        tasks = selection.prepare_queryset(Task.objects.all())
+        search = TaskSearch(visible_board_ids(request.user), request.query_params.get('q', ''), tasks)
+        if not search.terms:
+            return Response({"error": "Query parameter q must contain at least one word."}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = self.pagination_class()
+        tasks = paginator.paginate_queryset(search, request, view=self)
+        serializer = TaskSerializer(tasks, many=True, context={'request': request, 'task_fields': selection})
+        response = paginator.get_paginated_response(serializer.data)
+        response.data = selection.add_side_loaded_users(response.data, serializer.data)
+        return response
+
+@method_decorator(condition(etag_func=user_tasks_etag('assignee_id')), name='get')
+class TaskListAssignedView(ReplicaReadMixin, FastTaskListMixin, TaskFieldsMixin, TaskFilterMixin, generics.ListAPIView):
     """
     API view to list tasks assigned to the authenticated user.
-    """ 
+    Supports the TaskFilter parameters and the task field selection.
+    """
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskPagination
 
     def get_queryset(self):
         """
@@ -105,12 +272,15 @@ class TaskListAssignedView(generics.ListAPIView):
         user = self.request.user
         return Task.objects.filter(assignee_id=user)
     
-class TaskListReviewingView(generics.ListAPIView):
+@method_decorator(condition(etag_func=user_tasks_etag('reviewer_id')), name='get')
+class TaskListReviewingView(ReplicaReadMixin, FastTaskListMixin, TaskFieldsMixin, TaskFilterMixin, generics.ListAPIView):
     """
     API view to list tasks assigned to the authenticated user as reviewer.
+    Supports the TaskFilter parameters and the task field selection.
     """
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskPagination
 
     def get_queryset(self):
         """
@@ -119,9 +289,9 @@ class TaskListReviewingView(generics.ListAPIView):
         user = self.request.user
         return Task.objects.filter(reviewer_id=user)
     
-class CommentCreateView(generics.ListCreateAPIView):
+class CommentCreateView(ReplicaReadMixin, FastCommentListMixin, generics.ListCreateAPIView):
     """
-    API view to list and create comments on a specific task.
+    API view to list and create comments on a specific task; lists are rendered by the fast read path.
     Ensures comments are linked to the task and authored by the current user.
     """
     serializer_class = CommentSerializer
@@ -137,9 +307,9 @@ class CommentCreateView(generics.ListCreateAPIView):
         
     def get_queryset(self):
         """
-        Returns all comments associated with the specified task.
+        Returns all comments associated with the specified task in creation order.
         """
-        return Comment.objects.filter(task__id=self.kwargs.get("pk"))
+        return Comment.objects.filter(task__id=self.kwargs.get("pk")).order_by('id')
     
 class CommentDeleteView(generics.DestroyAPIView):
     """
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class taskboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'taskboard'
+
+    def ready(self):
+        """
+        Connects the taskboard signal handlers once the app registry is ready.
+        """
+        import taskboard.signals
@@ -0,0 +1,138 @@
+from collections import Counter
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from taskboard.models import Board, BoardChange
+from taskboard.realtime import get_broker
+from user_auth_app.api.serializers import UserProfileSerializer
+
+
+def task_payload(task):
+    """
+    Returns the stored column values of a task as a JSON-ready dict for the change log.
+    """
+    return {
+        'id': task.pk,
+        'board': task.board_id,
+        'title': task.title,
+        'description': task.description,
+        'status': task.status,
+        'priority': task.priority,
+        'assignee_id': task.assignee_id,
+        'reviewer_id': task.reviewer_id,
+        'due_date': task.due_date,
+    }
+
+
+def comment_payload(comment):
+    """
+    Returns the stored column values of a comment as a JSON-ready dict for the change log.
+    """
+    return {
+        'id': comment.pk,
+        'task': comment.task_id,
+        'author_id': comment.author_id,
+        'content': comment.content,
+        'created_at': comment.created_at,
+    }
+
+
+def member_payloads(user_ids):
+    """
+    Returns profile data for the given users keyed by ID, loaded with one query.
+    """
+    users = User.objects.filter(pk__in=user_ids)
+    return {user.pk: UserProfileSerializer(user).data for user in users}
+
+
+def change_event(change):
+    """
+    Returns the realtime event for a change log entry, shaped like the changes endpoint output.
+    """
+    return {
+        'board': change.board_id,
+        'seq': change.seq,
+        'entity': change.entity,
+        'action': change.action,
+        'object_id': change.object_id,
+        'data': change.data,
+        'created_at': change.created_at,
+    }
+
+
+def publish_on_commit(changes):
+    """
+    Pushes the entries to WebSocket subscribers once the surrounding transaction commits.
+    Rolled back changes are never published.
+    """
+    publish_events_on_commit([change_event(change) for change in changes])
+
+
+def publish_events_on_commit(events):
+    """
+    Publishes realtime events to their board subscribers once the surrounding transaction commits.
+    """
+    if not events:
+        return
+
+    def publish():
+        broker = get_broker()
+        for event in events:
+            broker.publish(event['board'], event)
+    transaction.on_commit(publish)
+
+
+def publish_board_deleted(board_id):
+    """
+    Tells the subscribers of a deleted board after commit; the change log is deleted with the board.
+    """
+    publish_events_on_commit([{
+        'board': board_id,
+        'seq': None,
+        'entity': 'board',
+        'action': 'delete',
+        'object_id': board_id,
+        'data': None,
+        'created_at': timezone.now(),
+    }])
+
+
+def reserve_seqs(counts):
+    """
+    Reserves consecutive sequence numbers per board by incrementing Board.last_change_seq.
+    The update keeps the board row locked until commit, so the entries of a board commit in sequence order.
+    Returns the last reserved number by board ID; boards that no longer exist are left out.
+    """
+    last_seqs = {}
+    for board_id in sorted(counts):
+        if Board.objects.filter(pk=board_id).update(last_change_seq=F('last_change_seq') + counts[board_id]):
+            last_seqs[board_id] = Board.objects.filter(pk=board_id).values_list('last_change_seq', flat=True).get()
+    return last_seqs
+
+
+def record_change(board_id, entity, action, object_id, data=None):
+    """
+    Appends a single entry to the change log of a board and publishes it after commit.
+    """
+    changes = record_changes([(board_id, entity, action, object_id, data)])
+    return changes[0] if changes else None
+
+
+def record_changes(entries):
+    """
+    Appends many (board_id, entity, action, object_id, data) entries with one bulk insert.
+    The entries are numbered per board and published after commit.
+    """
+    entries = list(entries)
+    with transaction.atomic():
+        counts = Counter(board_id for board_id, *_ in entries)
+        next_seqs = {board_id: last_seq - counts[board_id] for board_id, last_seq in reserve_seqs(counts).items()}
+        changes = []
+        for board_id, entity, action, object_id, data in entries:
+            if board_id in next_seqs:
+                next_seqs[board_id] += 1
+                changes.append(BoardChange(board_id=board_id, seq=next_seqs[board_id], entity=entity, action=action, object_id=object_id, data=data))
+        changes = BoardChange.objects.bulk_create(changes)
+    publish_on_commit(changes)
+    return changes
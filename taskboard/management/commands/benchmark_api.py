@@ -0,0 +1,330 @@
+import json
+import math
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from taskboard.api import urls as taskboard_urls
+from taskboard.api.queries import visible_boards
+from taskboard.models import Board, Task, Comment
+from user_auth_app.api import urls as user_auth_urls
+from user_auth_app.hashers import hash_password
+
+
+HOST = 'localhost'
+SCRATCH_TITLE = 'Benchmark scratch'
+LOGIN_PASSWORD = 'benchmark-login'
+
+
+def percentile(durations, percent):
+    """
+    Returns the nearest-rank percentile of the durations.
+    """
+    ordered = sorted(durations)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def route_names():
+    """
+    Returns the URL names of every route in the taskboard and user_auth_app API.
+    """
+    return [pattern.name for module in (taskboard_urls, user_auth_urls) for pattern in module.urlpatterns]
+
+
+def git_commit():
+    """
+    Returns the short hash of the checked out commit, or None outside a git checkout.
+    """
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class QueryCounter:
+    """
+    Execute wrapper counting the queries of one request.
+    """
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    """
+    Management command driving every route of the taskboard and user_auth_app API through core.wsgi in-process.
+    Reports p50/p95/p99 latency, queries per request and throughput per scenario and can compare with a previous run.
+    Writes go to a scratch board and throwaway users; only the rows the run created are removed afterwards.
+    """
+    help = 'Benchmarks all API routes in-process and writes comparable JSON results.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, help='User the requests are made as; defaults to the dataset user with the most boards.')
+        parser.add_argument('--requests', type=int, default=100, help='Measured requests per scenario.')
+        parser.add_argument('--login-requests', type=int, default=10, help='Measured requests of the password hashing scenarios.')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests before each scenario.')
+        parser.add_argument('--concurrency', type=int, default=1, help='Requests in flight at the same time.')
+        parser.add_argument('--only', help='Comma-separated scenario names to run.')
+        parser.add_argument('--prefix', default='bench', help='Prefix of the generate_dataset users; also names the throwaway users.')
+        parser.add_argument('--yes', action='store_true', help='Allow running as a user outside the generated dataset.')
+        parser.add_argument('--json', dest='json_path', help='Write the results to this JSON file.')
+        parser.add_argument('--compare', help='Print the change against the results in this JSON file.')
+
+    def handle(self, *args, **options):
+        """
+        Prepares the fixtures, runs the scenarios, prints a table and writes and compares the results.
+        """
+        from core.wsgi import application
+
+        self.options = options
+        self.user = self.get_user(options['user_id'])
+        self.created_board_ids = []
+        self.created_user_ids = []
+        token, self.created_token = Token.objects.get_or_create(user=self.user)
+        self.token = token.key
+        try:
+            self.prepare()
+            scenarios = self.scenarios()
+            missing = sorted(set(route_names()) - {scenario['route'] for scenario in scenarios})
+            if missing:
+                self.stderr.write(f"Routes without a scenario: {', '.join(missing)}")
+            if options['only']:
+                names = set(options['only'].split(','))
+                scenarios = [scenario for scenario in scenarios if scenario['name'] in names]
+            results = [self.run(application, scenario) for scenario in scenarios]
+        finally:
+            self.cleanup()
+
+        self.print_results(results)
+        report = {
+            'commit': git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'dataset': {'users': User.objects.count(), 'boards': Board.objects.count(),
+                        'tasks': Task.objects.count(), 'comments': Comment.objects.count()},
+            'results': results,
+        }
+        if options['json_path']:
+            with open(options['json_path'], 'w') as file:
+                json.dump(report, file, indent=2)
+        if options['compare']:
+            with open(options['compare']) as file:
+                self.print_comparison(json.load(file), report)
+
+    def get_user(self, user_id):
+        """
+        Returns the given user or the dataset user belonging to the most boards.
+        Users outside the generated dataset need --yes, because the run writes to their account.
+        """
+        prefix = self.options['prefix']
+        if user_id is not None:
+            try:
+                user = User.objects.get(pk=user_id)
+            except User.DoesNotExist:
+                raise CommandError('User does not exist')
+            if not user.username.startswith(f'{prefix}-') and not self.options['yes']:
+                raise CommandError(f'User {user.username!r} is not part of the {prefix!r} dataset; pass --yes to benchmark as this user.')
+            return user
+        user = (User.objects.filter(username__startswith=f'{prefix}-').annotate(boards=Count('board_members'))
+                .filter(boards__gt=0).order_by('-boards', 'id').first())
+        if user is None:
+            raise CommandError(f'No {prefix!r} dataset user belongs to a board; run generate_dataset first.')
+        return user
+
+    def prepare(self):
+        """
+        Picks the read fixtures and creates the scratch board, login user and objects the delete scenarios remove.
+        """
+        board = (visible_boards(self.user).annotate(size=Count('tasks')).filter(size__gt=0).order_by('-size', 'id').first()
+                 or visible_boards(self.user).first())
+        if board is None:
+            raise CommandError('The user has no boards; pass --user-id or run generate_dataset first.')
+        self.board = board
+        self.task = Task.objects.filter(board=board).annotate(size=Count('comments')).order_by('-size', 'id').first()
+        self.search_term = self.task.title.split()[-1] if self.task else 'task'
+
+        rounds = self.options['warmup'] + self.options['requests']
+        self.scratch = Board.objects.create(title=SCRATCH_TITLE, owner=self.user)
+        self.created_board_ids.append(self.scratch.pk)
+        self.scratch.members.add(self.user)
+        if self.task is None:
+            self.task = Task.objects.create(board=self.scratch, title='Benchmark task', creator=self.user)
+        self.scratch_task = Task.objects.create(board=self.scratch, title='Benchmark task', creator=self.user)
+        self.doomed_boards = [Board.objects.create(title=SCRATCH_TITLE, owner=self.user) for _ in range(rounds)]
+        self.created_board_ids += [board.pk for board in self.doomed_boards]
+        self.doomed_tasks = [Task.objects.create(board=self.scratch, title='Benchmark task', creator=self.user) for _ in range(rounds)]
+        self.doomed_comments = [Comment.objects.create(task=self.scratch_task, author=self.user, content='Benchmark') for _ in range(rounds)]
+        self.login_user = User.objects.create(username=f"{self.options['prefix']}-login", email=f"{self.options['prefix']}-login@example.com",
+                                              password=hash_password(LOGIN_PASSWORD))
+        self.created_user_ids.append(self.login_user.pk)
+
+    def cleanup(self):
+        """
+        Removes the boards, users and token the run created, with everything attached to them.
+        Tasks and comments were created on the scratch boards or by the throwaway users and go with them.
+        """
+        Board.objects.filter(pk__in=self.created_board_ids).delete()
+        User.objects.filter(pk__in=self.created_user_ids).delete()
+        if self.created_token:
+            Token.objects.filter(key=self.token).delete()
+
+    def scenarios(self):
+        """
+        Returns the scenarios; paths and bodies are functions of the request number so writes never collide.
+        """
+        board, task, scratch, scratch_task = self.board.pk, self.task.pk, self.scratch.pk, self.scratch_task.pk
+        prefix = self.options['prefix']
+        login_requests = self.options['login_requests']
+
+        def get(name, route, path):
+            return {'name': name, 'route': route, 'method': 'GET', 'path': lambda i: path}
+
+        return [
+            get('board list', 'board-list', '/api/boards/'),
+            get('board detail', 'board-detail', f'/api/boards/{board}/'),
+            get('board changes', 'board-changes', f'/api/boards/{board}/changes/'),
+            get('task detail', 'tasks-detail', f'/api/tasks/{task}/'),
+            get('task search', 'tasks-search', f'/api/tasks/search/?q={self.search_term}'),
+            get('assigned to me', 'tasks-assignee', '/api/tasks/assigned-to-me/'),
+            get('reviewing', 'tasks-review', '/api/tasks/reviewing/'),
+            get('comment list', 'comment-create', f'/api/tasks/{task}/comments/'),
+            get('async board list', 'async-board-list', '/api/async/boards/'),
+            get('async board detail', 'async-board-detail', f'/api/async/boards/{board}/'),
+            get('async assigned to me', 'async-tasks-assignee', '/api/async/tasks/assigned-to-me/'),
+            get('async reviewing', 'async-tasks-review', '/api/async/tasks/reviewing/'),
+            get('email check', 'email-check', f'/api/email-check/?email={self.user.email}'),
+            {'name': 'board create', 'route': 'board-list', 'method': 'POST', 'path': lambda i: '/api/boards/',
+             'body': lambda i: {'title': SCRATCH_TITLE, 'members': [self.user.pk]}, 'created': (self.created_board_ids, 'id')},
+            {'name': 'board update', 'route': 'board-detail', 'method': 'PATCH', 'path': lambda i: f'/api/boards/{scratch}/',
+             'body': lambda i: {'title': SCRATCH_TITLE}},
+            {'name': 'task create', 'route': 'tasks-list', 'method': 'POST', 'path': lambda i: '/api/tasks/',
+             'body': lambda i: {'board': scratch, 'title': f'Benchmark task {i}', 'status': 'to-do', 'priority': 'medium'}},
+            {'name': 'task update', 'route': 'tasks-detail', 'method': 'PATCH', 'path': lambda i: f'/api/tasks/{scratch_task}/',
+             'body': lambda i: {'status': ['to-do', 'in-progress', 'review', 'done'][i % 4]}},
+            {'name': 'task bulk', 'route': 'tasks-bulk', 'method': 'POST', 'path': lambda i: '/api/tasks/bulk/',
+             'body': lambda i: {'operations': [{'op': 'create', 'data': {'board': scratch, 'title': f'Bulk {i}-{n}'}} for n in range(10)]}},
+            {'name': 'comment create', 'route': 'comment-create', 'method': 'POST', 'path': lambda i: f'/api/tasks/{scratch_task}/comments/',
+             'body': lambda i: {'content': f'Benchmark comment {i}'}},
+            {'name': 'comment delete', 'route': 'comment-delete', 'method': 'DELETE',
+             'path': lambda i: f'/api/tasks/{scratch_task}/comments/{self.doomed_comments[i].pk}/'},
+            {'name': 'task delete', 'route': 'tasks-detail', 'method': 'DELETE', 'path': lambda i: f'/api/tasks/{self.doomed_tasks[i].pk}/'},
+            {'name': 'board delete', 'route': 'board-detail', 'method': 'DELETE', 'path': lambda i: f'/api/boards/{self.doomed_boards[i].pk}/'},
+            {'name': 'registration', 'route': 'registration', 'method': 'POST', 'path': lambda i: '/api/registration/', 'anonymous': True,
+             'requests': login_requests,
+             'body': lambda i: {'fullname': f'{prefix}-register-{i} Benchmark', 'email': f'{prefix}-register-{i}@example.com',
+                                'password': LOGIN_PASSWORD, 'repeated_password': LOGIN_PASSWORD},
+             'created': (self.created_user_ids, 'user_id')},
+            {'name': 'login', 'route': 'login', 'method': 'POST', 'path': lambda i: '/api/login/', 'anonymous': True,
+             'requests': login_requests,
+             'body': lambda i: {'email': self.login_user.email, 'password': LOGIN_PASSWORD}},
+        ]
+
+    def call(self, application, scenario, number):
+        """
+        Sends one request to the WSGI application; returns its duration, status and query count.
+        For scenarios that create rows, the ID from the response is remembered for the cleanup.
+        """
+        headers = {'HTTP_HOST': HOST}
+        if not scenario.get('anonymous'):
+            headers['HTTP_AUTHORIZATION'] = f'Token {self.token}'
+        body = scenario['body'](number) if 'body' in scenario else None
+        environ = RequestFactory().generic(
+            scenario['method'], scenario['path'](number), json.dumps(body) if body is not None else '',
+            content_type='application/json', **headers,
+        ).environ
+
+        counter = QueryCounter()
+        status_holder = []
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            started = time.perf_counter()
+            response = application(environ, lambda status, headers, exc_info=None: status_holder.append(status))
+            content = b''.join(response)
+            if hasattr(response, 'close'):
+                response.close()
+            duration = time.perf_counter() - started
+        code = int(status_holder[0].split()[0])
+        if 'created' in scenario and 200 <= code < 300:
+            created_ids, key = scenario['created']
+            created_ids.append(json.loads(content)[key])
+        return duration, code, counter.queries
+
+    def run(self, application, scenario):
+        """
+        Runs the warmup and measured requests of a scenario and summarizes them.
+        """
+        warmup = self.options['warmup']
+        amount = scenario.get('requests', self.options['requests'])
+        for number in range(warmup):
+            self.call(application, scenario, number)
+
+        numbers = range(warmup, warmup + amount)
+        started = time.perf_counter()
+        if self.options['concurrency'] > 1:
+            with ThreadPoolExecutor(max_workers=self.options['concurrency']) as pool:
+                outcomes = list(pool.map(lambda number: self.call(application, scenario, number), numbers))
+        else:
+            outcomes = [self.call(application, scenario, number) for number in numbers]
+        elapsed = time.perf_counter() - started
+
+        durations = [duration for duration, _, _ in outcomes]
+        statuses = {}
+        for _, code, _ in outcomes:
+            statuses[str(code)] = statuses.get(str(code), 0) + 1
+        return {
+            'name': scenario['name'],
+            'route': scenario['route'],
+            'method': scenario['method'],
+            'requests': amount,
+            'p50_ms': percentile(durations, 50) * 1000,
+            'p95_ms': percentile(durations, 95) * 1000,
+            'p99_ms': percentile(durations, 99) * 1000,
+            'mean_ms': sum(durations) / amount * 1000,
+            'queries': sum(queries for _, _, queries in outcomes) / amount,
+            'throughput': amount / elapsed if elapsed else 0.0,
+            'statuses': statuses,
+        }
+
+    def print_results(self, results):
+        """
+        Prints one line per scenario.
+        """
+        self.stdout.write(f"{'scenario':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'req/s':>8}  statuses")
+        for result in results:
+            statuses = ' '.join(f'{code}x{count}' for code, count in sorted(result['statuses'].items()))
+            self.stdout.write(
+                f"{result['name']:<22} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{result['queries']:>8.1f} {result['throughput']:>8.1f}  {statuses}"
+            )
+
+    def print_comparison(self, baseline, report):
+        """
+        Prints the p95 latency, query and throughput changes of every scenario present in both runs.
+        """
+        previous = {result['name']: result for result in baseline['results']}
+        self.stdout.write(f"Compared with {baseline.get('commit') or 'baseline'}:")
+        for result in report['results']:
+            before = previous.get(result['name'])
+            if before is None:
+                continue
+            p95 = (result['p95_ms'] / before['p95_ms'] - 1) * 100 if before['p95_ms'] else 0.0
+            throughput = (result['throughput'] / before['throughput'] - 1) * 100 if before['throughput'] else 0.0
+            self.stdout.write(
+                f"{result['name']:<22} p95 {p95:>+7.1f}%  queries {result['queries'] - before['queries']:>+6.1f}  "
+                f"req/s {throughput:>+7.1f}%"
+            )
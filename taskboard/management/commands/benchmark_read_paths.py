@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.authtoken.models import Token
+from taskboard.api.queries import visible_boards
+
+
+HOST = 'localhost'
+
+
+class Command(BaseCommand):
+    """
+    Management command comparing the sync read endpoints served through core.wsgi
+    with their async variants served through core.asgi under the same concurrent load.
+    """
+    help = 'Benchmarks sync (WSGI) against async (ASGI) read endpoints in-process.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, required=True, help='User whose token is used for the requests.')
+        parser.add_argument('--board-id', type=int, help='Board for the detail endpoint; defaults to the first visible board.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and path.')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight at the same time.')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        """
+        Runs every endpoint pair through both paths and prints throughput and mean latency.
+        """
+        from core.asgi import application as asgi_application
+        from core.wsgi import application as wsgi_application
+
+        try:
+            user = User.objects.get(pk=options['user_id'])
+        except User.DoesNotExist:
+            raise CommandError('User does not exist')
+        board_id = options['board_id'] or visible_boards(user).values_list('id', flat=True).first()
+        if board_id is None:
+            raise CommandError('The user has no boards; pass --board-id or create one first.')
+        token, created = Token.objects.get_or_create(user=user)
+
+        endpoints = [
+            ('board list', '/api/boards/', '/api/async/boards/'),
+            ('board detail', f'/api/boards/{board_id}/', f'/api/async/boards/{board_id}/'),
+            ('assigned to me', '/api/tasks/assigned-to-me/', '/api/async/tasks/assigned-to-me/'),
+            ('reviewing', '/api/tasks/reviewing/', '/api/async/tasks/reviewing/'),
+        ]
+        results = []
+        for name, sync_path, async_path in endpoints:
+            sync_result = self.run_wsgi(wsgi_application, sync_path, token.key, options)
+            async_result = self.run_asgi(asgi_application, async_path, token.key, options)
+            results.append({'endpoint': name, 'sync_wsgi': sync_result, 'async_asgi': async_result})
+            self.stdout.write(
+                f"{name:<16} sync {sync_result['throughput']:>8.1f} req/s {sync_result['mean_ms']:>7.2f} ms | "
+                f"async {async_result['throughput']:>8.1f} req/s {async_result['mean_ms']:>7.2f} ms"
+            )
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as file:
+                json.dump({'requests': options['requests'], 'concurrency': options['concurrency'], 'results': results}, file, indent=2)
+
+    def summarize(self, durations, elapsed, statuses):
+        """
+        Returns throughput, mean latency and status code counts of one run.
+        """
+        counts = {}
+        for code in statuses:
+            counts[code] = counts.get(code, 0) + 1
+        return {
+            'throughput': len(durations) / elapsed if elapsed else 0.0,
+            'mean_ms': sum(durations) / len(durations) * 1000,
+            'statuses': counts,
+        }
+
+    def run_wsgi(self, application, path, token, options):
+        """
+        Sends the requests to the WSGI application from a pool of worker threads.
+        """
+        factory = RequestFactory()
+
+        def call():
+            environ = factory.get(path, HTTP_AUTHORIZATION=f'Token {token}', HTTP_HOST=HOST).environ
+            status_holder = []
+            started = time.perf_counter()
+            body = application(environ, lambda status, headers, exc_info=None: status_holder.append(status))
+            for _ in body:
+                pass
+            if hasattr(body, 'close'):
+                body.close()
+            return time.perf_counter() - started, int(status_holder[0].split()[0])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            outcomes = list(pool.map(lambda _: call(), range(options['requests'])))
+        elapsed = time.perf_counter() - started
+        return self.summarize([duration for duration, _ in outcomes], elapsed, [code for _, code in outcomes])
+
+    def run_asgi(self, application, path, token, options):
+        """
+        Sends the requests to the ASGI application as concurrent coroutines on one event loop.
+        """
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [(b'host', HOST.encode()), (b'authorization', f'Token {token}'.encode())],
+            'client': ('127.0.0.1', 0),
+            'server': (HOST, 80),
+        }
+
+        async def call(limit):
+            async with limit:
+                response = {}
+                finished = asyncio.Event()
+                messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+                async def receive():
+                    if messages:
+                        return messages.pop()
+                    await finished.wait()
+                    return {'type': 'http.disconnect'}
+
+                async def send(message):
+                    if message['type'] == 'http.response.start':
+                        response['status'] = message['status']
+                    elif not message.get('more_body'):
+                        finished.set()
+
+                started = time.perf_counter()
+                await application(dict(scope), receive, send)
+                return time.perf_counter() - started, response.get('status')
+
+        async def run():
+            limit = asyncio.Semaphore(options['concurrency'])
+            return await asyncio.gather(*(call(limit) for _ in range(options['requests'])))
+
+        started = time.perf_counter()
+        outcomes = asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        return self.summarize([duration for duration, _ in outcomes], elapsed, [code for _, code in outcomes])
@@ -0,0 +1,107 @@
+import json
+import time
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+from taskboard.models import Board, Task, Comment
+from taskboard.api.fast import board_detail_data
+from taskboard.api.queries import board_detail_queryset
+from taskboard.api.serializers import BoardDetailSerializer
+from taskboard.api.sparse import TaskFieldSelection
+
+
+class Command(BaseCommand):
+    """
+    Management command comparing BoardDetailSerializer with the fast values() renderer on a large board.
+    Builds a synthetic board inside a transaction that is rolled back, unless --board-id is given.
+    """
+    help = 'Benchmarks the DRF board detail serializer against the fast read path.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000, help='Tasks on the synthetic board.')
+        parser.add_argument('--board-id', type=int, help='Benchmark an existing board instead of a synthetic one.')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per path; the fastest run is reported.')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        """
+        Renders the board through both paths and prints total time and time per task.
+        """
+        with transaction.atomic():
+            if options['board_id']:
+                try:
+                    board = Board.objects.get(pk=options['board_id'])
+                except Board.DoesNotExist:
+                    raise CommandError('Board does not exist')
+            else:
+                board = self.create_board(options['tasks'])
+            results = self.run(board, options['repeat'])
+            transaction.set_rollback(True)
+
+        for name in ('drf', 'fast'):
+            result = results[name]
+            self.stdout.write(f"{name:<5} {result['total_ms']:>9.1f} ms {result['per_task_us']:>8.1f} us/task")
+        self.stdout.write(f"speed-up {results['speedup']:.1f}x for {results['tasks']} tasks")
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as file:
+                json.dump(results, file, indent=2)
+
+    def create_board(self, amount):
+        """
+        Creates a board with the given number of tasks, two users and a comment on every fifth task.
+        """
+        owner = User.objects.create_user(username='benchmark-owner', email='benchmark-owner@example.com')
+        member = User.objects.create_user(username='benchmark-member', last_name='Member', email='benchmark-member@example.com')
+        board = Board.objects.create(title='Benchmark', owner=owner)
+        board.members.set([owner, member])
+        tasks = Task.objects.bulk_create([
+            Task(board=board, title=f'Task {index}', description=f'Description {index}',
+                 status=['to-do', 'in-progress', 'review', 'done'][index % 4], priority=['low', 'medium', 'high'][index % 3],
+                 assignee=owner if index % 2 else member, reviewer=member if index % 3 else None,
+                 due_date=date.today() + timedelta(days=index % 30), creator=owner)
+            for index in range(amount)
+        ], batch_size=1000)
+        Comment.objects.bulk_create([Comment(task=task, author=member, content='Looks good') for task in tasks[::5]], batch_size=1000)
+        return board
+
+    def time_best(self, render, repeat):
+        """
+        Returns the fastest of repeat runs in seconds together with the rendered payload.
+        """
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, data
+
+    def run(self, board, repeat):
+        """
+        Times both paths including their queries and checks that they render the same payload.
+        """
+        request = APIRequestFactory().get(f'/api/boards/{board.pk}/')
+        selection = TaskFieldSelection({})
+
+        def drf():
+            instance = board_detail_queryset().get(pk=board.pk)
+            return BoardDetailSerializer(instance, context={'request': request}).data
+
+        def fast():
+            return board_detail_data(board, selection)
+
+        drf_seconds, drf_data = self.time_best(drf, repeat)
+        fast_seconds, fast_data = self.time_best(fast, repeat)
+        if json.dumps(drf_data) != json.dumps(fast_data):
+            raise CommandError('The fast path rendered a different payload.')
+
+        tasks = max(len(fast_data['tasks']), 1)
+        return {
+            'tasks': len(fast_data['tasks']),
+            'drf': {'total_ms': drf_seconds * 1000, 'per_task_us': drf_seconds / tasks * 1e6},
+            'fast': {'total_ms': fast_seconds * 1000, 'per_task_us': fast_seconds / tasks * 1e6},
+            'speedup': drf_seconds / fast_seconds if fast_seconds else 0.0,
+        }
@@ -0,0 +1,31 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from taskboard.models import Board, BoardChange
+
+
+class Command(BaseCommand):
+    """
+    Management command that deletes old change log entries and records how far each board was compacted.
+    Clients asking for compacted sequence numbers are told to reload the board.
+    """
+    help = 'Deletes board change log entries older than the given number of days.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Keep entries newer than this many days.')
+
+    def handle(self, *args, **options):
+        """
+        Deletes entries up to the newest expired sequence of every board in one transaction.
+        """
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        expired = BoardChange.objects.filter(created_at__lt=cutoff).order_by().values('board_id').annotate(last_seq=Max('seq'))
+
+        deleted = 0
+        with transaction.atomic():
+            for row in expired:
+                Board.objects.filter(pk=row['board_id']).update(changes_compacted_until=row['last_seq'])
+                deleted += BoardChange.objects.filter(board_id=row['board_id'], seq__lte=row['last_seq']).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} change log entries.'))
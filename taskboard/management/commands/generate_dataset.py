@@ -0,0 +1,192 @@
+import json
+import math
+import random
+import time
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from taskboard.models import Board, BoardStats, Task, Comment
+from user_auth_app.hashers import hash_password
+from user_auth_app.models import UserEmail
+
+
+STATUS_WEIGHTS = {'to-do': 35, 'in-progress': 25, 'review': 15, 'done': 25}
+PRIORITY_WEIGHTS = {'low': 30, 'medium': 50, 'high': 20}
+
+VERBS = ['Fix', 'Add', 'Refactor', 'Review', 'Document', 'Test', 'Deploy', 'Design', 'Update', 'Remove', 'Migrate', 'Optimize']
+NOUNS = ['login', 'dashboard', 'invoice', 'export', 'search', 'settings', 'onboarding', 'report', 'payment', 'profile',
+         'notification', 'upload', 'calendar', 'permissions', 'sidebar', 'checkout', 'webhook', 'api', 'cache', 'backup']
+WORDS = ['customer', 'mobile', 'layout', 'timeout', 'error', 'slow', 'page', 'button', 'email', 'sync', 'import', 'filter',
+         'legacy', 'release', 'staging', 'metrics', 'translation', 'accessibility', 'security', 'database']
+COMMENTS = ['Looks good to me.', 'Can you add a test for this?', 'Blocked by the API change.', 'Moved to next sprint.',
+            'I can reproduce this on staging.', 'Done, please review.', 'Needs a decision from the product team.']
+FIRST_NAMES = ['Anna', 'Ben', 'Clara', 'David', 'Eva', 'Felix', 'Greta', 'Hannah', 'Jonas', 'Lea', 'Max', 'Nina', 'Paul', 'Sofia']
+LAST_NAMES = ['Schmidt', 'Meyer', 'Weber', 'Fischer', 'Wagner', 'Becker', 'Hoffmann', 'Koch', 'Richter', 'Wolf']
+
+
+class Command(BaseCommand):
+    """
+    Management command generating a reproducible synthetic dataset for load tests and benchmarks.
+    User activity follows a Zipf distribution, so few users belong to many boards and board and task sizes are heavy-tailed.
+    """
+    help = 'Generates synthetic users, boards, tasks and comments from a seed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help='Users to create.')
+        parser.add_argument('--boards', type=int, default=50, help='Boards to create.')
+        parser.add_argument('--tasks-per-board', type=float, default=100, help='Mean tasks per board; sizes are log-normal.')
+        parser.add_argument('--comments-per-task', type=float, default=1.5, help='Mean comments per task; counts are geometric.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed creates the same dataset.')
+        parser.add_argument('--prefix', default='bench', help='Prefix of the generated usernames and emails.')
+        parser.add_argument('--password', default='benchmark', help='Password of every generated user.')
+        parser.add_argument('--clear', action='store_true', help='Delete a dataset with the same prefix first.')
+        parser.add_argument('--json', dest='json_path', help='Also write the dataset summary to this JSON file.')
+
+    def handle(self, *args, **options):
+        """
+        Creates the dataset in one transaction and prints a summary.
+        """
+        if options['users'] < 1 or options['boards'] < 0:
+            raise CommandError('At least one user is required and boards must not be negative.')
+        started = time.perf_counter()
+        with transaction.atomic():
+            if options['clear']:
+                self.clear(options['prefix'])
+            elif User.objects.filter(username__startswith=f"{options['prefix']}-").exists():
+                raise CommandError(f"A dataset with prefix {options['prefix']!r} exists; pass --clear to replace it.")
+            summary = self.generate(random.Random(options['seed']), options)
+        summary['seconds'] = round(time.perf_counter() - started, 2)
+
+        self.stdout.write(
+            f"Created {summary['users']} users, {summary['boards']} boards, {summary['memberships']} memberships, "
+            f"{summary['tasks']} tasks and {summary['comments']} comments in {summary['seconds']} s"
+        )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as file:
+                json.dump(summary, file, indent=2)
+
+    def clear(self, prefix):
+        """
+        Deletes the users of a previous dataset together with their boards, tasks and comments.
+        """
+        users = User.objects.filter(username__startswith=f'{prefix}-')
+        Board.objects.filter(owner__in=users).delete()
+        Task.objects.filter(creator__in=users).delete()
+        users.delete()
+
+    def generate(self, rng, options):
+        """
+        Creates all rows with bulk inserts and rebuilds the board counters the task signals would keep.
+        """
+        users = self.create_users(rng, options)
+        weights = [1 / (rank + 1) for rank in range(len(users))]
+        rng.shuffle(weights)
+
+        boards, members = self.create_boards(rng, users, weights, options['boards'])
+        tasks = self.create_tasks(rng, boards, members, options['tasks_per_board'])
+        comments = self.create_comments(rng, tasks, members, options['comments_per_task'])
+        BoardStats.rebuild([board.pk for board in boards])
+        return {
+            'seed': options['seed'],
+            'prefix': options['prefix'],
+            'users': len(users),
+            'boards': len(boards),
+            'memberships': sum(len(board_members) for board_members in members.values()),
+            'tasks': len(tasks),
+            'comments': comments,
+        }
+
+    def create_users(self, rng, options):
+        """
+        Creates the users with one shared password hash and their email lookup rows.
+        """
+        password = hash_password(options['password'])
+        prefix = options['prefix']
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}-{index}', first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                 email=f'{prefix}-{index}@example.com', password=password)
+            for index in range(options['users'])
+        ], batch_size=1000)
+        UserEmail.objects.bulk_create([UserEmail(user=user, email=UserEmail.normalize(user.email)) for user in users], batch_size=1000)
+        return users
+
+    def weighted_sample(self, rng, users, weights, amount):
+        """
+        Picks up to amount distinct users, favouring users with higher weights.
+        """
+        chosen = {}
+        amount = min(amount, len(users))
+        for _ in range(amount * 20):
+            if len(chosen) == amount:
+                break
+            user = rng.choices(users, weights)[0]
+            chosen[user.pk] = user
+        return list(chosen.values())
+
+    def create_boards(self, rng, users, weights, amount):
+        """
+        Creates boards whose owners and members are drawn by activity; member counts are Pareto distributed.
+        Returns the boards and a dict mapping board IDs to their members.
+        """
+        owners = [rng.choices(users, weights)[0] for _ in range(amount)]
+        boards = Board.objects.bulk_create([
+            Board(title=f'{rng.choice(NOUNS).capitalize()} {rng.choice(WORDS)} {index}', owner=owner)
+            for index, owner in enumerate(owners)
+        ], batch_size=1000)
+
+        members = {}
+        rows = []
+        through = Board.members.through
+        for board, owner in zip(boards, owners):
+            size = min(int(rng.paretovariate(1.2)) + 1, 50)
+            board_members = {owner.pk: owner}
+            for user in self.weighted_sample(rng, users, weights, size):
+                board_members[user.pk] = user
+            members[board.pk] = list(board_members.values())
+            rows += [through(board_id=board.pk, user_id=user_id) for user_id in board_members]
+        through.objects.bulk_create(rows, batch_size=1000)
+        return boards, members
+
+    def create_tasks(self, rng, boards, members, mean):
+        """
+        Creates log-normally sized task lists with weighted status and priority and mostly assigned tasks.
+        """
+        sigma = 1.0
+        mu = math.log(mean) - sigma ** 2 / 2 if mean > 0 else None
+        today = date.today()
+        statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+        priorities, priority_weights = zip(*PRIORITY_WEIGHTS.items())
+
+        tasks = []
+        for board in boards:
+            board_members = members[board.pk]
+            size = round(rng.lognormvariate(mu, sigma)) if mu is not None else 0
+            for _ in range(size):
+                assignee = rng.choice(board_members) if rng.random() < 0.8 else None
+                reviewer = rng.choice(board_members) if rng.random() < 0.5 else None
+                tasks.append(Task(
+                    board=board,
+                    title=f'{rng.choice(VERBS)} {rng.choice(NOUNS)} {rng.choice(WORDS)}',
+                    description=' '.join(rng.choices(WORDS, k=rng.randint(0, 12))) or None,
+                    status=rng.choices(statuses, status_weights)[0],
+                    priority=rng.choices(priorities, priority_weights)[0],
+                    assignee=assignee,
+                    reviewer=reviewer if reviewer != assignee else None,
+                    due_date=today + timedelta(days=rng.randint(-30, 60)),
+                    creator=rng.choice(board_members),
+                ))
+        return Task.objects.bulk_create(tasks, batch_size=1000)
+
+    def create_comments(self, rng, tasks, members, mean):
+        """
+        Creates a geometrically distributed number of comments per task by board members.
+        Returns the number of comments.
+        """
+        keep_going = mean / (1 + mean) if mean > 0 else 0
+        comments = []
+        for task in tasks:
+            while rng.random() < keep_going:
+                comments.append(Comment(task=task, author=rng.choice(members[task.board_id]), content=rng.choice(COMMENTS)))
+        Comment.objects.bulk_create(comments, batch_size=1000)
+        return len(comments)
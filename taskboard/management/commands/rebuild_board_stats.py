@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from taskboard.models import BoardStats
+from taskboard.api.board_list_cache import board_list_cache
+
+
+class Command(BaseCommand):
+    """
+    Management command that rebuilds the denormalized BoardStats counters and verifies them.
+    With --verify-only it reports drift without changing anything.
+    """
+    help = 'Rebuilds and verifies the per-board task counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board_ids', nargs='*', type=int, help='Only handle these boards.')
+        parser.add_argument('--verify-only', action='store_true', help='Report mismatches without rebuilding.')
+
+    def handle(self, *args, **options):
+        """
+        Rebuilds the counters unless --verify-only is set, then compares them to fresh counts.
+        Raises CommandError if any board still has mismatching counters.
+        """
+        board_ids = options['board_ids'] or None
+        if not options['verify_only']:
+            rebuilt = BoardStats.rebuild(board_ids)
+            if board_ids:
+                board_list_cache.invalidate_boards(board_ids)
+            else:
+                board_list_cache.clear()
+            self.stdout.write(f'Rebuilt counters for {rebuilt} boards.')
+
+        mismatches = self.find_mismatches(board_ids)
+        for board_id, field, stored, expected in mismatches:
+            self.stdout.write(f'Board {board_id}: {field} is {stored}, expected {expected}')
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} counter mismatches found.')
+        self.stdout.write(self.style.SUCCESS('All board counters are correct.'))
+
+    def find_mismatches(self, board_ids):
+        """
+        Returns (board_id, field, stored, expected) tuples for every counter that drifted.
+        """
+        expected = BoardStats.expected_counts(board_ids)
+        stored = {stats['board_id']: stats for stats in BoardStats.objects.filter(board_id__in=expected).values()}
+        mismatches = []
+        for board_id, values in expected.items():
+            row = stored.get(board_id)
+            for field, value in values.items():
+                current = row[field] if row else None
+                if current != value:
+                    mismatches.append((board_id, field, current, value))
+        return mismatches
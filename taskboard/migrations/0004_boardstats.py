@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+STATUS_FIELDS = {
+    'to-do': 'to_do_count',
+    'in-progress': 'in_progress_count',
+    'review': 'review_count',
+    'done': 'done_count',
+}
+
+PRIORITY_FIELDS = {
+    'low': 'low_priority_count',
+    'medium': 'medium_priority_count',
+    'high': 'high_priority_count',
+}
+
+
+def backfill_board_stats(apps, schema_editor):
+    """
+    Creates a BoardStats row with the current task counts for every existing board.
+    """
+    Board = apps.get_model('taskboard', 'Board')
+    BoardStats = apps.get_model('taskboard', 'BoardStats')
+    Task = apps.get_model('taskboard', 'Task')
+
+    aggregates = {'ticket_count': Count('id')}
+    for status, field in STATUS_FIELDS.items():
+        aggregates[field] = Count('id', filter=Q(status=status))
+    for priority, field in PRIORITY_FIELDS.items():
+        aggregates[field] = Count('id', filter=Q(priority=priority))
+
+    counts = {row.pop('board_id'): row for row in Task.objects.order_by().values('board_id').annotate(**aggregates)}
+    BoardStats.objects.bulk_create([
+        BoardStats(board_id=board_id, **counts.get(board_id, {}))
+        for board_id in Board.objects.values_list('id', flat=True)
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taskboard', '0003_task_board_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardStats',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='taskboard.board')),
+                ('ticket_count', models.PositiveIntegerField(default=0)),
+                ('to_do_count', models.PositiveIntegerField(default=0)),
+                ('in_progress_count', models.PositiveIntegerField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('done_count', models.PositiveIntegerField(default=0)),
+                ('low_priority_count', models.PositiveIntegerField(default=0)),
+                ('medium_priority_count', models.PositiveIntegerField(default=0)),
+                ('high_priority_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_board_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations
+
+
+COMMENTS_OF = "(SELECT coalesce(group_concat(content, ' '), '') FROM taskboard_comment WHERE task_id = {task})"
+
+CREATE_SEARCH = [
+    "CREATE VIRTUAL TABLE taskboard_task_search USING fts5(title, description, comments, tokenize = 'unicode61 remove_diacritics 2')",
+    # Title hits weigh most, comment hits least.
+    "INSERT INTO taskboard_task_search(taskboard_task_search, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0)')",
+    f"""INSERT INTO taskboard_task_search(rowid, title, description, comments)
+        SELECT id, title, description, {COMMENTS_OF.format(task='taskboard_task.id')} FROM taskboard_task""",
+    """CREATE TRIGGER taskboard_task_search_insert AFTER INSERT ON taskboard_task BEGIN
+        INSERT INTO taskboard_task_search(rowid, title, description, comments) VALUES (new.id, new.title, new.description, '');
+    END""",
+    """CREATE TRIGGER taskboard_task_search_update AFTER UPDATE OF title, description ON taskboard_task BEGIN
+        UPDATE taskboard_task_search SET title = new.title, description = new.description WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER taskboard_task_search_delete AFTER DELETE ON taskboard_task BEGIN
+        DELETE FROM taskboard_task_search WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER taskboard_comment_search_insert AFTER INSERT ON taskboard_comment BEGIN
+        UPDATE taskboard_task_search SET comments = {COMMENTS_OF.format(task='new.task_id')} WHERE rowid = new.task_id;
+    END""",
+    f"""CREATE TRIGGER taskboard_comment_search_update AFTER UPDATE OF content, task_id ON taskboard_comment BEGIN
+        UPDATE taskboard_task_search SET comments = {COMMENTS_OF.format(task='old.task_id')} WHERE rowid = old.task_id;
+        UPDATE taskboard_task_search SET comments = {COMMENTS_OF.format(task='new.task_id')} WHERE rowid = new.task_id;
+    END""",
+    f"""CREATE TRIGGER taskboard_comment_search_delete AFTER DELETE ON taskboard_comment BEGIN
+        UPDATE taskboard_task_search SET comments = {COMMENTS_OF.format(task='old.task_id')} WHERE rowid = old.task_id;
+    END""",
+]
+
+DROP_SEARCH = [
+    "DROP TRIGGER IF EXISTS taskboard_comment_search_delete",
+    "DROP TRIGGER IF EXISTS taskboard_comment_search_update",
+    "DROP TRIGGER IF EXISTS taskboard_comment_search_insert",
+    "DROP TRIGGER IF EXISTS taskboard_task_search_delete",
+    "DROP TRIGGER IF EXISTS taskboard_task_search_update",
+    "DROP TRIGGER IF EXISTS taskboard_task_search_insert",
+    "DROP TABLE IF EXISTS taskboard_task_search",
+]
+
+
+def run_on_sqlite(statements):
+    """
+    Returns a migration function executing the statements on SQLite only.
+    Other databases fall back to the LIKE based search in taskboard.api.search.
+    """
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taskboard', '0006_boardchange'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_sqlite(CREATE_SEARCH), run_on_sqlite(DROP_SEARCH)),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:40
+
+from django.db import migrations, models
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_change_seqs(apps, schema_editor):
+    """
+    Numbers existing entries by their ID, so sequence numbers clients already hold stay valid.
+    Each board continues after its newest entry or compaction point.
+    """
+    Board = apps.get_model('taskboard', 'Board')
+    BoardChange = apps.get_model('taskboard', 'BoardChange')
+
+    BoardChange.objects.update(seq=F('id'))
+    newest = BoardChange.objects.filter(board=OuterRef('pk')).order_by().values('board').annotate(last=Max('id')).values('last')
+    Board.objects.update(last_change_seq=Greatest(Coalesce(Subquery(newest), 0), F('changes_compacted_until')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taskboard', '0007_task_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='last_change_seq',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='boardchange',
+            name='seq',
+            field=models.BigIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_change_seqs, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='boardchange',
+            name='boardchange_board_seq_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='boardchange',
+            constraint=models.UniqueConstraint(fields=('board', 'seq'), name='boardchange_board_seq_uniq'),
+        ),
+    ]
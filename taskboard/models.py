@@ -1,4 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth.models import User
 from datetime import date
 
@@ -35,6 +38,34 @@ class Board(models.Model):
     title = models.CharField(max_length=50)
     members = models.ManyToManyField(User, related_name="board_members")
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    changes_compacted_until = models.BigIntegerField(default=0)
+    last_change_seq = models.BigIntegerField(default=0)
+
+    # Maintained with F() updates only; saving a loaded board must not write them back.
+    COUNTER_FIELDS = ('version', 'changes_compacted_until', 'last_change_seq')
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the board without overwriting counters another transaction may have moved on.
+        """
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def touch(cls, board_ids):
+        """
+        Increments the version and refreshes updated_at of the given boards.
+        Called whenever anything shown in a board payload changes.
+        """
+        board_ids = [board_id for board_id in set(board_ids) if board_id is not None]
+        if board_ids:
+            cls.objects.filter(pk__in=board_ids).update(version=F('version') + 1, updated_at=timezone.now())
 
     def __str__(self):
         return self.title
@@ -51,12 +82,167 @@ class Task(models.Model):
     priority = models.CharField(max_length=10, choices=PRIORITY_SELECTION, default='medium')
     assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="task_assignees")
     reviewer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="task_reviewer")
-    due_date = models.DateField(editable=True, default=date.today())
+    due_date = models.DateField(editable=True, default=date.today)
     creator = models.ForeignKey(User, on_delete=models.DO_NOTHING, related_name='task_creator')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'status'], name='task_board_status_idx'),
+            models.Index(fields=['board', 'priority'], name='task_board_priority_idx'),
+            models.Index(fields=['due_date', 'id'], name='task_due_date_id_idx'),
+            models.Index(fields=['assignee', 'due_date', 'id'], name='task_assignee_due_idx'),
+            models.Index(fields=['reviewer', 'due_date', 'id'], name='task_reviewer_due_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the loaded board, status and priority for the counter updates of cascade deletes.
+        save() and delete() replace them with the values locked in their own transaction.
+        """
+        instance = super().from_db(db, field_names, values)
+        if {'board_id', 'status', 'priority'}.issubset(field_names):
+            instance._counted_as = (instance.board_id, instance.status, instance.priority)
+        return instance
+
+    @classmethod
+    def lock_counted_values(cls, task_ids):
+        """
+        Locks the tasks and returns their stored (board_id, status, priority) by ID; missing tasks are left out.
+        Call it inside the transaction changing the tasks, so concurrent writes cannot move the counters from stale values.
+        """
+        rows = cls.objects.select_for_update().filter(pk__in=task_ids).values_list('id', 'board_id', 'status', 'priority')
+        return {task_id: (board_id, status, priority) for task_id, board_id, status, priority in rows}
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the task and its board counter updates in one transaction.
+        The counters move from the stored values, not from the ones loaded earlier.
+        """
+        with transaction.atomic():
+            if self.pk is not None and not self._state.adding:
+                self._counted_as = Task.lock_counted_values([self.pk]).get(self.pk)
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """
+        Deletes the task and removes its stored values from the board counters in one transaction.
+        """
+        with transaction.atomic():
+            if self.pk is not None:
+                self._counted_as = Task.lock_counted_values([self.pk]).get(self.pk)
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return self.title
 
+class BoardStats(models.Model):
+    """
+    Denormalized task counters of a board, split by status and by priority.
+    Kept up to date by the task signals so board lists can read them without COUNT queries.
+    """
+    board = models.OneToOneField(Board, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    ticket_count = models.PositiveIntegerField(default=0)
+    to_do_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    done_count = models.PositiveIntegerField(default=0)
+    low_priority_count = models.PositiveIntegerField(default=0)
+    medium_priority_count = models.PositiveIntegerField(default=0)
+    high_priority_count = models.PositiveIntegerField(default=0)
+
+    STATUS_FIELDS = {
+        'to-do': 'to_do_count',
+        'in-progress': 'in_progress_count',
+        'review': 'review_count',
+        'done': 'done_count',
+    }
+    PRIORITY_FIELDS = {
+        'low': 'low_priority_count',
+        'medium': 'medium_priority_count',
+        'high': 'high_priority_count',
+    }
+
+    @classmethod
+    def counter_fields(cls):
+        """
+        Returns the names of all counter columns.
+        """
+        return ['ticket_count', *cls.STATUS_FIELDS.values(), *cls.PRIORITY_FIELDS.values()]
+
+    @classmethod
+    def apply(cls, board_id, status, priority, delta):
+        """
+        Adds delta to the total, status and priority counters of a board with one UPDATE.
+        """
+        fields = ['ticket_count', cls.STATUS_FIELDS.get(status), cls.PRIORITY_FIELDS.get(priority)]
+        changes = {field: F(field) + delta for field in fields if field}
+        cls.objects.filter(board_id=board_id).update(**changes)
+
+    @classmethod
+    def apply_many(cls, changes):
+        """
+        Applies many (previous, current) task states at once; either side may be None.
+        Deltas are summed per board so each affected board gets a single UPDATE.
+        """
+        deltas = {}
+        for previous, current in changes:
+            if previous == current:
+                continue
+            for counted, delta in ((previous, -1), (current, 1)):
+                if not counted:
+                    continue
+                board_id, status, priority = counted
+                board_deltas = deltas.setdefault(board_id, {})
+                for field in ('ticket_count', cls.STATUS_FIELDS.get(status), cls.PRIORITY_FIELDS.get(priority)):
+                    if field:
+                        board_deltas[field] = board_deltas.get(field, 0) + delta
+        for board_id, board_deltas in deltas.items():
+            changes = {field: F(field) + delta for field, delta in board_deltas.items() if delta}
+            if changes:
+                cls.objects.filter(board_id=board_id).update(**changes)
+
+    @classmethod
+    def expected_counts(cls, board_ids=None):
+        """
+        Counts the tasks of every board from scratch, grouped by board.
+        Returns a dict mapping board IDs to counter values; boards without tasks map to zeros.
+        """
+        aggregates = {'ticket_count': models.Count('id')}
+        for status, field in cls.STATUS_FIELDS.items():
+            aggregates[field] = models.Count('id', filter=models.Q(status=status))
+        for priority, field in cls.PRIORITY_FIELDS.items():
+            aggregates[field] = models.Count('id', filter=models.Q(priority=priority))
+
+        boards = Board.objects.all()
+        tasks = Task.objects.order_by().values('board_id')
+        if board_ids is not None:
+            boards = boards.filter(pk__in=board_ids)
+            tasks = tasks.filter(board_id__in=board_ids)
+
+        counts = {board_id: dict.fromkeys(cls.counter_fields(), 0) for board_id in boards.values_list('id', flat=True)}
+        for row in tasks.annotate(**aggregates):
+            board_id = row.pop('board_id')
+            if board_id in counts:
+                counts[board_id] = row
+        return counts
+
+    @classmethod
+    def rebuild(cls, board_ids=None):
+        """
+        Recomputes and stores the counters of the given boards, or of all boards.
+        Returns the number of rebuilt boards.
+        """
+        counts = cls.expected_counts(board_ids)
+        with transaction.atomic():
+            for board_id, values in counts.items():
+                cls.objects.update_or_create(board_id=board_id, defaults=values)
+        return len(counts)
+
+    def __str__(self):
+        return f'Stats for {self.board_id}'
+
 class Comment(models.Model):
     """
     Represents a comment made on a specific task by a user.
@@ -66,6 +252,50 @@ class Comment(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="comment_author")
     content = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'id'], name='comment_task_id_idx'),
+        ]
+
+    def __str__(self):
+        return self.text
+
+CHANGE_ENTITIES=(
+    ('board','Board'),
+    ('task','Task'),
+    ('comment','Comment'),
+    ('member','Member')
+)
+
+CHANGE_ACTIONS=(
+    ('create','Create'),
+    ('update','Update'),
+    ('delete','Delete')
+)
+
+class BoardChange(models.Model):
+    """
+    Append-only log entry describing one change on a board, numbered per board by seq.
+    Clients fetch entries after the last sequence they saw instead of the whole board.
+    """
+    id = models.BigAutoField(primary_key=True)
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="changes")
+    seq = models.BigIntegerField()
+    entity = models.CharField(max_length=10, choices=CHANGE_ENTITIES)
+    action = models.CharField(max_length=10, choices=CHANGE_ACTIONS)
+    object_id = models.BigIntegerField()
+    data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'seq'], name='boardchange_board_seq_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='boardchange_created_idx'),
+        ]
 
     def __str__(self):
-        return self.text
\ No newline at end of file
+        return f'{self.seq} {self.entity} {self.action}'
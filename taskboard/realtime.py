@@ -0,0 +1,230 @@
+import asyncio
+import json
+import re
+import threading
+from collections import defaultdict
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from taskboard.models import Board
+from taskboard.api.membership import OWNER, MEMBER, user_board_role
+from user_auth_app.api.authentication import CachedTokenAuthentication
+
+
+BOARD_SOCKET_PATH = re.compile(r'^/ws/boards/(?P<pk>\d+)/$')
+
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+CLOSE_TOO_SLOW = 4408
+
+
+class Subscription:
+    """
+    Receives events for one board on the event loop of a single WebSocket connection.
+    Events are handed over thread-safely because they are published from sync request threads.
+    """
+    def __init__(self, board_id, max_pending=1000):
+        self.board_id = board_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def deliver(self, event):
+        """
+        Queues an event on the subscriber's loop; may be called from any thread.
+        """
+        self.loop.call_soon_threadsafe(self.put, event)
+
+    def put(self, event):
+        """
+        Puts an event into the queue; a full queue marks the subscriber as too slow.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class LocalBroker:
+    """
+    In-process broker fanning out board events to the WebSocket connections of this process.
+    Other brokers only need the same subscribe, unsubscribe and publish methods.
+    """
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, board_id):
+        """
+        Registers and returns a subscription for the events of a board.
+        """
+        subscription = Subscription(board_id)
+        with self.lock:
+            self.subscriptions[board_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Removes a subscription; no further events are delivered to it.
+        """
+        with self.lock:
+            subscribers = self.subscriptions.get(subscription.board_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscriptions[subscription.board_id]
+
+    def publish(self, board_id, event):
+        """
+        Delivers an event to every subscriber of the board.
+        """
+        with self.lock:
+            subscribers = list(self.subscriptions.get(board_id, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+
+broker_instance = None
+broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Returns the process-wide broker configured by TASKBOARD_REALTIME_BROKER.
+    """
+    global broker_instance
+    with broker_lock:
+        if broker_instance is None:
+            path = getattr(settings, 'TASKBOARD_REALTIME_BROKER', 'taskboard.realtime.LocalBroker')
+            broker_instance = import_string(path)()
+        return broker_instance
+
+
+def get_token(scope):
+    """
+    Reads the DRF token from the ?token= query parameter or a "Token <key>" Authorization header.
+    Browsers cannot set headers on WebSockets, so the query parameter is the usual way.
+    """
+    query = parse_qs(scope.get('query_string', b'').decode())
+    if query.get('token'):
+        return query['token'][0]
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0] == TokenAuthentication.keyword:
+                return parts[1]
+    return None
+
+
+@sync_to_async
+def authenticate(token):
+    """
+    Resolves a token to its active user through the cached token authentication.
+    Returns None if the token is missing or invalid.
+    """
+    if not token:
+        return None
+    try:
+        user, _ = CachedTokenAuthentication().authenticate_credentials(token)
+    except AuthenticationFailed:
+        return None
+    return user
+
+
+@sync_to_async
+def get_role(user_id, board_id):
+    """
+    Returns the user's role on the board or None if the board does not exist.
+    """
+    try:
+        return user_board_role(user_id, board_id)
+    except Board.DoesNotExist:
+        return None
+
+
+def access_close_code(role):
+    """
+    Returns the close code for a user without access to the board, or None if the user may listen.
+    """
+    if role is None:
+        return CLOSE_NOT_FOUND
+    if role not in (OWNER, MEMBER):
+        return CLOSE_FORBIDDEN
+    return None
+
+
+async def lost_access(event, user_id):
+    """
+    Returns the close code if the event may have taken the user's access away, or None.
+    Board and member events re-check the role, whose cache is dropped before such events are published.
+    """
+    if event['entity'] == 'board' and event['action'] == 'delete':
+        return CLOSE_NOT_FOUND
+    if event['entity'] == 'member' and event['action'] == 'delete' and event['object_id'] == user_id:
+        return CLOSE_FORBIDDEN
+    if event['entity'] in ('board', 'member'):
+        return access_close_code(await get_role(user_id, event['board']))
+    return None
+
+
+async def board_socket(scope, receive, send):
+    """
+    ASGI application streaming the change events of one board to an authenticated member.
+    Closes with 4401, 4403 or 4404 if the token, membership or board check fails.
+    """
+    match = BOARD_SOCKET_PATH.match(scope['path'])
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    if match is None:
+        return await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+
+    board_id = int(match['pk'])
+    user = await authenticate(get_token(scope))
+    if user is None:
+        return await send({'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+    close_code = access_close_code(await get_role(user.pk, board_id))
+    if close_code is not None:
+        return await send({'type': 'websocket.close', 'code': close_code})
+
+    broker = get_broker()
+    subscription = broker.subscribe(board_id)
+    await send({'type': 'websocket.accept'})
+    try:
+        await stream_events(subscription, user.pk, receive, send)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def stream_events(subscription, user_id, receive, send):
+    """
+    Sends queued events until the client disconnects, loses access to the board or falls too far behind.
+    Slow clients are closed with 4408 and are expected to resync through the changes endpoint.
+    """
+    incoming = asyncio.ensure_future(receive())
+    outgoing = asyncio.ensure_future(subscription.queue.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait({incoming, outgoing}, return_when=asyncio.FIRST_COMPLETED)
+            if incoming in done:
+                if incoming.result()['type'] == 'websocket.disconnect':
+                    return
+                incoming = asyncio.ensure_future(receive())
+            if outgoing in done:
+                event = outgoing.result()
+                if subscription.overflowed:
+                    return await send({'type': 'websocket.close', 'code': CLOSE_TOO_SLOW})
+                await send({'type': 'websocket.send', 'text': json.dumps(event, cls=DjangoJSONEncoder)})
+                close_code = await lost_access(event, user_id)
+                if close_code is not None:
+                    return await send({'type': 'websocket.close', 'code': close_code})
+                outgoing = asyncio.ensure_future(subscription.queue.get())
+    finally:
+        incoming.cancel()
+        outgoing.cancel()
+
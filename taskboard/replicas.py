@@ -0,0 +1,175 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework.permissions import SAFE_METHODS
+from taskboard.api.membership_cache import LocalLRUCache
+
+
+DEFAULTS = {
+    'ALIASES': None,
+    'STICKY_SECONDS': 5,
+    'MAX_SIZE': 10000,
+}
+
+read_alias = ContextVar('taskboard_read_alias', default=None)
+
+
+def replica_config():
+    """
+    Returns the TASKBOARD_READ_REPLICAS setting merged with the defaults.
+    """
+    return {**DEFAULTS, **getattr(settings, 'TASKBOARD_READ_REPLICAS', {})}
+
+
+def replica_aliases():
+    """
+    Returns the database aliases serving replica reads; all aliases but the primary unless configured.
+    """
+    aliases = replica_config()['ALIASES']
+    if aliases is None:
+        aliases = [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+    return list(aliases)
+
+
+def build_recent_writers():
+    """
+    Creates the store of users whose reads stick to the primary after a write.
+    """
+    config = replica_config()
+    return LocalLRUCache(config['MAX_SIZE'], config['STICKY_SECONDS'])
+
+
+recent_writers = build_recent_writers()
+
+
+def mark_recent_write(user_id):
+    """
+    Sends the user's reads to the primary for the next STICKY_SECONDS.
+    """
+    recent_writers.set(user_id, True)
+
+
+def wrote_recently(user_id):
+    """
+    Returns True if the user wrote within the sticky window.
+    """
+    return recent_writers.get(user_id) is not None
+
+
+def current_read_alias():
+    """
+    Returns the replica alias chosen for the current request, or None if reads go to the primary.
+    """
+    return read_alias.get()
+
+
+@contextmanager
+def replica_reads(alias):
+    """
+    Routes reads inside the block to the given replica alias; None routes them to the primary.
+    """
+    token = read_alias.set(alias)
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+def primary_reads():
+    """
+    Routes reads inside the block to the primary, e.g. for lookups whose results are cached across requests.
+    """
+    return replica_reads(None)
+
+
+class ReplicaRouter:
+    """
+    Database router sending reads of replica-enabled requests to the replica chosen for the request.
+    Everything else, including all writes, uses the primary.
+    """
+    def db_for_read(self, model, **hints):
+        """
+        Returns the request's replica alias, or None to fall back to the primary.
+        """
+        return current_read_alias()
+
+    def db_for_write(self, model, **hints):
+        """
+        Writes always go to the primary, also for objects that were read from a replica.
+        """
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Allows relations between objects read from the primary and its replicas.
+        """
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Serves safe requests of an API view from a read replica once the user is authenticated.
+    Users who wrote within the sticky window keep reading from the primary to see their own writes.
+    """
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Authenticates against the primary and restores primary reads when the request ends.
+        """
+        with primary_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Switches the remaining reads of the request to a replica after authentication and permission checks.
+        """
+        super().initial(request, *args, **kwargs)
+        aliases = replica_aliases()
+        if aliases and request.method in SAFE_METHODS and not wrote_recently(request.user.pk):
+            read_alias.set(random.choice(aliases))
+
+
+def resolved_user_id(request):
+    """
+    Returns the ID of the authenticated user of a request without triggering a lazy session lookup.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+        return None
+    return user.pk if user.is_authenticated else None
+
+
+def remember_writer(request, response):
+    """
+    Marks the user of a successful unsafe request as a recent writer.
+    """
+    if request.method in SAFE_METHODS or response.status_code >= 400:
+        return
+    user_id = resolved_user_id(request)
+    if user_id is not None:
+        mark_recent_write(user_id)
+
+
+@sync_and_async_middleware
+def sticky_primary_middleware(get_response):
+    """
+    Middleware keeping a user's reads on the primary for a short window after each write.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            response = await get_response(request)
+            remember_writer(request, response)
+            return response
+    else:
+        def middleware(request):
+            response = get_response(request)
+            remember_writer(request, response)
+            return response
+    return middleware
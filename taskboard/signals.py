@@ -0,0 +1,214 @@
+from django.db.models.signals import m2m_changed, pre_save, post_save, pre_delete, post_delete
+from django.db import transaction
+from django.db.models import Q
+from django.dispatch import receiver
+import threading
+from django.utils import timezone
+from taskboard.models import Board, Task, BoardStats, Comment
+from django.contrib.auth.models import User
+from taskboard.api.membership_cache import membership_cache
+from taskboard.api.board_list_cache import board_list_cache, listed_counter_boards
+from taskboard.changes import record_change, record_changes, publish_board_deleted, task_payload, comment_payload, member_payloads
+
+
+deleting = threading.local()
+
+
+def is_being_deleted(board_id):
+    """
+    Returns True while the board is deleted by the current thread.
+    Cascade deletes then skip change log entries that would point at the vanishing board.
+    """
+    return board_id in getattr(deleting, 'board_ids', set())
+
+
+def invalidate_roles(board_id, user_ids):
+    """
+    Drops cached roles right away and again once the surrounding transaction commits.
+    A role read by another request before the commit still sees the old membership and would be cached again.
+    """
+    user_ids = list(user_ids)
+    membership_cache.invalidate(board_id, user_ids)
+    transaction.on_commit(lambda: membership_cache.invalidate(board_id, user_ids))
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def invalidate_member_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drops cached roles and board lists when board members are added, removed or cleared.
+    Handles both board.members and user.board_members as the changed side.
+    """
+    if action == 'pre_clear':
+        if reverse:
+            instance._cleared_ids = list(instance.board_members.values_list('id', flat=True))
+        else:
+            instance._cleared_ids = list(instance.members.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    changed_ids = pk_set if action != 'post_clear' else getattr(instance, '_cleared_ids', [])
+    change_action = 'create' if action == 'post_add' else 'delete'
+    if reverse:
+        for board_id in changed_ids:
+            invalidate_roles(board_id, [instance.pk])
+        board_list_cache.invalidate_boards(changed_ids)
+        board_list_cache.invalidate_users([instance.pk])
+        Board.touch(changed_ids)
+        data = member_payloads([instance.pk]).get(instance.pk) if change_action == 'create' else None
+        record_changes([(board_id, 'member', change_action, instance.pk, data) for board_id in changed_ids])
+    else:
+        invalidate_roles(instance.pk, changed_ids)
+        board_list_cache.invalidate_boards([instance.pk])
+        board_list_cache.invalidate_users(changed_ids)
+        Board.touch([instance.pk])
+        payloads = member_payloads(changed_ids) if change_action == 'create' else {}
+        record_changes([(instance.pk, 'member', change_action, user_id, payloads.get(user_id)) for user_id in changed_ids])
+
+
+@receiver(pre_save, sender=Board)
+def remember_previous_owner(sender, instance, **kwargs):
+    """
+    Stores the owner ID before an update so an owner change can be invalidated.
+    """
+    instance._previous_owner_id = None
+    if instance.pk:
+        instance._previous_owner_id = Board.objects.filter(pk=instance.pk).values_list('owner_id', flat=True).first()
+
+
+@receiver(post_save, sender=Board)
+def invalidate_owner_roles(sender, instance, created, **kwargs):
+    """
+    Drops cached roles and board lists of the current and any previous board owner.
+    Creates the empty counter row for new boards.
+    """
+    user_ids = {instance.owner_id}
+    previous_owner_id = getattr(instance, '_previous_owner_id', None)
+    if previous_owner_id is not None:
+        user_ids.add(previous_owner_id)
+    # Invalidate first: the roles must be dropped on commit before sockets re-check them for the update event.
+    invalidate_roles(instance.pk, user_ids)
+    if created:
+        BoardStats.objects.get_or_create(board=instance)
+    else:
+        Board.touch([instance.pk])
+        record_change(instance.pk, 'board', 'update', instance.pk, {'id': instance.pk, 'title': instance.title, 'owner_id': instance.owner_id})
+    if not created:
+        board_list_cache.invalidate_boards([instance.pk])
+    if created or previous_owner_id != instance.owner_id:
+        board_list_cache.invalidate_users(user_ids)
+
+
+@receiver(pre_delete, sender=Board)
+def remember_board_users(sender, instance, **kwargs):
+    """
+    Collects owner and members before the board and its member rows are deleted.
+    Marks the board as being deleted so cascaded task and comment deletes are not logged.
+    """
+    if not hasattr(deleting, 'board_ids'):
+        deleting.board_ids = set()
+    deleting.board_ids.add(instance.pk)
+    instance._deleted_user_ids = [instance.owner_id, *instance.members.values_list('id', flat=True)]
+
+
+@receiver(post_delete, sender=Board)
+def invalidate_deleted_board(sender, instance, **kwargs):
+    """
+    Drops cached roles and board lists of everyone who could see a deleted board and closes its sockets.
+    """
+    getattr(deleting, 'board_ids', set()).discard(instance.pk)
+    user_ids = getattr(instance, '_deleted_user_ids', [instance.owner_id])
+    invalidate_roles(instance.pk, user_ids)
+    board_list_cache.invalidate_users(user_ids)
+    publish_board_deleted(instance.pk)
+
+
+@receiver(pre_save, sender=Task)
+def remember_counted_values(sender, instance, **kwargs):
+    """
+    Makes sure the board, status and priority last counted for a task are known before saving.
+    Task.save() already locked and read them; this covers saves that bypass it, such as fixture loading.
+    """
+    if instance.pk and not hasattr(instance, '_counted_as'):
+        instance._counted_as = Task.objects.filter(pk=instance.pk).values_list('board_id', 'status', 'priority').first()
+
+
+@receiver(post_save, sender=Task)
+def track_task_change(sender, instance, created, **kwargs):
+    """
+    Moves the task between board counters when it is created or its board, status or priority changes.
+    Bumps the version of the task's current and previous board and logs the change.
+    Cached board lists are only dropped if a counter they show changed.
+    """
+    current = (instance.board_id, instance.status, instance.priority)
+    previous = None if created else getattr(instance, '_counted_as', None)
+    if previous != current:
+        if previous:
+            BoardStats.apply(*previous, -1)
+        BoardStats.apply(*current, 1)
+        board_list_cache.invalidate_boards(listed_counter_boards([(previous, current)]))
+    previous_board_id = previous[0] if previous else None
+    Board.touch([instance.board_id, previous_board_id])
+    instance._counted_as = current
+
+    if previous_board_id is not None and previous_board_id != instance.board_id:
+        record_change(previous_board_id, 'task', 'delete', instance.pk)
+        record_change(instance.board_id, 'task', 'create', instance.pk, task_payload(instance))
+    else:
+        record_change(instance.board_id, 'task', 'create' if created else 'update', instance.pk, task_payload(instance))
+
+
+@receiver(post_delete, sender=Task)
+def track_task_delete(sender, instance, **kwargs):
+    """
+    Removes a deleted task from its board counters, including cascade deletes, and logs it.
+    Skipped if the task was already deleted by another transaction.
+    """
+    counted = getattr(instance, '_counted_as', (instance.board_id, instance.status, instance.priority))
+    if counted is None:
+        return
+    BoardStats.apply(*counted, -1)
+    if not is_being_deleted(counted[0]):
+        board_list_cache.invalidate_boards([counted[0]])
+        Board.touch([counted[0]])
+        record_change(counted[0], 'task', 'delete', instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def track_comment_change(sender, instance, **kwargs):
+    """
+    Refreshes the task's updated_at, bumps its board version and logs the comment change.
+    Keeps the comment counts in task payloads covered by the conditional GET validators.
+    """
+    Task.objects.filter(pk=instance.task_id).update(updated_at=timezone.now())
+    board_id = Task.objects.filter(pk=instance.task_id).values_list('board_id', flat=True).first()
+    if board_id is None or is_being_deleted(board_id):
+        return
+    Board.touch([board_id])
+    if 'created' not in kwargs:
+        record_change(board_id, 'comment', 'delete', instance.pk)
+    else:
+        record_change(board_id, 'comment', 'create' if kwargs['created'] else 'update', instance.pk, comment_payload(instance))
+
+
+@receiver(post_save, sender=User)
+def track_profile_change(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Handles name or email changes of a user shown as owner, member, assignee or reviewer.
+    Bumps the versions of those boards and the updated_at of those tasks so conditional GETs revalidate,
+    and drops cached board lists showing the user.
+    Skipped for new users and saves that cannot touch the profile, such as last_login updates.
+    """
+    if created or kwargs.get('raw'):
+        return
+    if update_fields is not None and not {'username', 'last_name', 'email'} & set(update_fields):
+        return
+    board_ids = set(Board.objects.filter(members=instance).values_list('id', flat=True))
+    board_ids.update(Board.objects.filter(owner=instance).values_list('id', flat=True))
+    board_list_cache.invalidate_boards(board_ids)
+
+    tasks = Task.objects.filter(Q(assignee=instance) | Q(reviewer=instance))
+    board_ids.update(tasks.values_list('board_id', flat=True).distinct())
+    tasks.update(updated_at=timezone.now())
+    Board.touch(board_ids)
@@ -1,3 +1,1450 @@
-from django.test import TestCase
+import asyncio
+import base64
+import json
+import os
+import tempfile
+import re
+from pathlib import Path
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, router
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from core.database import database_config, replica_configs
+from core.metrics import registry
+from taskboard.models import Board, BoardChange, BoardStats, Task, Comment
+from taskboard.api.membership import OWNER
+from taskboard.api.membership_cache import membership_cache
+from taskboard.api.board_list_cache import board_list_cache
+from taskboard.api.bulk import TaskBatch
+from taskboard.realtime import board_socket
+from taskboard.replicas import ReplicaRouter, recent_writers, replica_reads
+from user_auth_app.api.authentication import token_cache
 
-# Create your tests here.
+
+FAST_PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class TaskboardTestCase(TestCase):
+    """
+    Base test case that resets the process-wide membership, board list, token and recent writer caches before each test.
+    Passwords use a fast hasher; bcrypt is covered by the user_auth_app tests.
+    """
+    def setUp(self):
+        """
+        Clears the caches and creates the board owner, a second user and an empty board.
+        The client is authenticated as the owner; classes add the members, tasks and users they need.
+        """
+        membership_cache.clear()
+        board_list_cache.clear()
+        token_cache.clear()
+        recent_writers.clear()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='pw')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class BoardListQueryTests(TaskboardTestCase):
+    """
+    Regression tests for the board list endpoint counters and query budget.
+    The number of queries must not grow with the number of boards.
+    """
+    def create_boards(self, amount):
+        for index in range(amount):
+            board = Board.objects.create(title=f'Board {index}', owner=self.user)
+            board.members.set([self.user, self.other])
+            Task.objects.create(board=board, title='a', status='to-do', priority='high', creator=self.user)
+            Task.objects.create(board=board, title='b', status='done', priority='low', creator=self.user)
+
+    def test_counters_are_correct(self):
+        self.create_boards(1)
+        response = self.client.get(reverse('board-list'))
+        self.assertEqual(response.status_code, 200)
+        board = response.data[1]
+        self.assertEqual(board['member_count'], 2)
+        self.assertEqual(board['ticket_count'], 2)
+        self.assertEqual(board['tasks_to_do_count'], 1)
+        self.assertEqual(board['tasks_high_prio_count'], 1)
+        self.assertEqual(len(board['members']), 2)
+
+    def test_member_boards_are_listed_once(self):
+        board = Board.objects.create(title='Shared', owner=self.other)
+        board.members.set([self.user, self.other])
+        response = self.client.get(reverse('board-list'))
+        self.assertEqual([item['id'] for item in response.data], [self.board.id, board.id])
+
+    def test_query_count_is_constant(self):
+        self.create_boards(3)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('board-list'))
+        self.create_boards(20)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('board-list'))
+        self.assertEqual(len(response.data), 24)
+
+
+class BoardDetailQueryTests(TaskboardTestCase):
+    """
+    Regression tests for the board detail payload and its query budget.
+    Adding tasks, assignees or comments must not add queries.
+    """
+    def setUp(self):
+        super().setUp()
+        self.board.members.set([self.user, self.other])
+
+    def create_tasks(self, amount):
+        for index in range(amount):
+            task = Task.objects.create(board=self.board, title=f'Task {index}', assignee=self.user, reviewer=self.other, creator=self.user)
+            Comment.objects.create(task=task, author=self.user, content='hi')
+
+    def test_query_count_is_constant(self):
+        url = reverse('board-detail', kwargs={'pk': self.board.pk})
+        self.create_tasks(2)
+        with self.assertNumQueries(5):
+            self.client.get(url)
+        self.create_tasks(30)
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data['tasks']), 32)
+        task = response.data['tasks'][0]
+        self.assertEqual(task['comments_count'], 1)
+        self.assertEqual(task['assignee']['id'], self.user.id)
+        self.assertEqual(task['reviewer']['id'], self.other.id)
+
+    def test_patch_returns_member_data(self):
+        url = reverse('board-detail', kwargs={'pk': self.board.pk})
+        response = self.client.patch(url, {'title': 'Renamed', 'members': [self.other.id]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'Renamed')
+        self.assertEqual([member['id'] for member in response.data['members_data']], [self.other.id])
+        self.assertEqual(response.data['owner_data']['id'], self.user.id)
+        self.assertNotIn('members', response.data)
+
+    def test_delete_does_not_load_tasks(self):
+        self.create_tasks(3)
+        url = reverse('board-detail', kwargs={'pk': self.board.pk})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(any('COUNT(' in query['sql'] or 'LEFT OUTER JOIN "auth_user"' in query['sql'] for query in queries.captured_queries))
+
+
+class BoardMembersTests(TaskboardTestCase):
+    """
+    Tests that member IDs are resolved in one query and member updates only touch changed rows.
+    """
+    def setUp(self):
+        super().setUp()
+        self.users = User.objects.bulk_create([User(username=f'member{index}') for index in range(40)])
+
+    def create_board(self, member_ids):
+        return self.client.post(reverse('board-list'), {'title': 'Board', 'members': member_ids}, format='json')
+
+    def test_member_count_does_not_add_queries(self):
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.create_board([user.pk for user in self.users[:2]]).status_code, 201)
+        with CaptureQueriesContext(connection) as many:
+            response = self.create_board([user.pk for user in self.users])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(response.data['member_count'], 40)
+
+    def test_all_missing_ids_are_reported(self):
+        response = self.create_board([self.users[0].pk, 99998, 'x', 99999])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'User dont exist: x, 99998, 99999')
+        self.assertEqual(list(Board.objects.all()), [self.board])
+
+    def test_members_must_be_a_list(self):
+        response = self.create_board(self.users[0].pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Members must be a list of user IDs.')
+
+    def test_patch_keeps_unchanged_member_rows(self):
+        board = Board.objects.create(title='Board', owner=self.user)
+        board.members.set(self.users[:30])
+        through = Board.members.through
+        kept = set(through.objects.filter(board=board, user__in=self.users[1:30]).values_list('id', flat=True))
+        url = reverse('board-detail', kwargs={'pk': board.pk})
+        response = self.client.patch(url, {'members': [user.pk for user in self.users[1:31]]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        rows = dict(through.objects.filter(board=board).values_list('user_id', 'id'))
+        self.assertEqual(set(rows), {user.pk for user in self.users[1:31]})
+        self.assertTrue(kept <= set(rows.values()))
+
+
+class MembershipPermissionTests(TaskboardTestCase):
+    """
+    Tests for the shared membership resolver used by the taskboard permissions.
+    Each board role is resolved once per request and reused for object checks.
+    """
+    def setUp(self):
+        super().setUp()
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        self.board.members.set([self.user, self.other])
+        self.task = Task.objects.create(board=self.board, title='Task', creator=self.user)
+
+    def test_member_task_detail_resolves_role_once(self):
+        self.client.force_authenticate(self.other)
+        url = reverse('tasks-detail', kwargs={'pk': self.task.pk})
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_stranger_is_rejected(self):
+        self.client.force_authenticate(self.stranger)
+        response = self.client.get(reverse('tasks-detail', kwargs={'pk': self.task.pk}))
+        self.assertEqual(response.status_code, 403)
+        response = self.client.patch(reverse('board-detail', kwargs={'pk': self.board.pk}), {'title': 'x'}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_only_owner_or_creator_deletes_task(self):
+        self.client.force_authenticate(self.other)
+        response = self.client.delete(reverse('tasks-detail', kwargs={'pk': self.task.pk}))
+        self.assertEqual(response.status_code, 403)
+        self.client.force_authenticate(self.user)
+        response = self.client.delete(reverse('tasks-detail', kwargs={'pk': self.task.pk}))
+        self.assertEqual(response.status_code, 204)
+
+    def test_missing_objects_return_404(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(reverse('board-detail', kwargs={'pk': 999})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('tasks-detail', kwargs={'pk': 999})).status_code, 404)
+        response = self.client.post(reverse('tasks-list'), {'board': 999, 'title': 'x'}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+
+class MembershipCacheTests(TaskboardTestCase):
+    """
+    Tests for the cross-request membership cache and its signal-based invalidation.
+    """
+    def setUp(self):
+        super().setUp()
+        self.board.members.set([self.other])
+        self.url = reverse('board-detail', kwargs={'pk': self.board.pk})
+
+    def test_role_is_cached_across_requests(self):
+        self.client.force_authenticate(self.other)
+        self.client.patch(self.url, {'title': 'One'}, format='json')
+        hits = membership_cache.stats()['hits']
+        self.client.patch(self.url, {'title': 'Two'}, format='json')
+        self.assertGreater(membership_cache.stats()['hits'], hits)
+        self.assertEqual(membership_cache.get_role(self.other.pk, self.board.pk), 'member')
+
+    def test_member_removal_invalidates_role(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.patch(self.url, {'title': 'One'}, format='json').status_code, 200)
+        self.board.members.remove(self.other)
+        self.assertIsNone(membership_cache.get_role(self.other.pk, self.board.pk))
+        self.assertEqual(self.client.patch(self.url, {'title': 'Two'}, format='json').status_code, 403)
+
+    def test_role_cached_before_commit_is_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.board.members.remove(self.other)
+            membership_cache.set_role(self.other.pk, self.board.pk, 'member')
+        self.assertIsNone(membership_cache.get_role(self.other.pk, self.board.pk))
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.patch(self.url, {'title': 'x'}, format='json').status_code, 403)
+
+    def test_owner_change_invalidates_roles(self):
+        self.client.force_authenticate(self.user)
+        self.client.get(reverse('board-list'))
+        self.assertEqual(membership_cache.get_role(self.user.pk, self.board.pk), 'owner')
+        self.board.owner = self.other
+        self.board.save()
+        self.assertIsNone(membership_cache.get_role(self.user.pk, self.board.pk))
+        self.assertEqual(self.client.patch(self.url, {'title': 'x'}, format='json').status_code, 403)
+
+    def test_board_list_reflects_new_membership(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(len(self.client.get(reverse('board-list')).data), 1)
+        other_board = Board.objects.create(title='Other', owner=self.other)
+        other_board.members.add(self.user)
+        self.assertEqual(len(self.client.get(reverse('board-list')).data), 2)
+
+
+class BoardListCacheTests(TaskboardTestCase):
+    """
+    Tests for the per-user board list cache and the events that invalidate it.
+    """
+    def setUp(self):
+        super().setUp()
+        self.board.members.set([self.user, self.other])
+        self.task = Task.objects.create(board=self.board, title='Task', status='review', priority='low', creator=self.user)
+        self.url = reverse('board-list')
+
+    def assert_cached(self, user=None):
+        self.client.force_authenticate(user or self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(len(queries), 0)
+        return response.data
+
+    def assert_refreshed(self, user=None):
+        self.client.force_authenticate(user or self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertGreater(len(queries), 0)
+        return response.data
+
+    def test_warm_list_runs_no_queries(self):
+        first = self.client.get(self.url).data
+        self.assertEqual(self.assert_cached(), first)
+        self.assertEqual(board_list_cache.stats()['hits'], 1)
+
+    def test_board_title_change_invalidates_every_member(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(self.other)
+        self.client.get(self.url)
+        self.board.title = 'Renamed'
+        self.board.save()
+        self.assertEqual(self.assert_refreshed()[0]['title'], 'Renamed')
+        self.assertEqual(self.assert_refreshed(self.other)[0]['title'], 'Renamed')
+
+    def test_membership_changes_invalidate(self):
+        stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        self.client.get(self.url)
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(self.url).data, [])
+        self.board.members.add(stranger)
+        self.assertEqual(len(self.assert_refreshed(stranger)), 1)
+        self.assertEqual(self.assert_refreshed()[0]['member_count'], 3)
+        stranger.board_members.remove(self.board)
+        self.assertEqual(self.assert_refreshed(stranger), [])
+        self.assertEqual(self.assert_refreshed()[0]['member_count'], 2)
+
+    def test_new_and_deleted_boards_invalidate(self):
+        self.client.get(self.url)
+        other = Board.objects.create(title='Other', owner=self.user)
+        self.assertEqual(len(self.assert_refreshed()), 2)
+        other.delete()
+        self.assertEqual(len(self.assert_refreshed()), 1)
+
+    def test_listed_counter_changes_invalidate(self):
+        self.client.get(self.url)
+        self.task.status = 'to-do'
+        self.task.save()
+        self.assertEqual(self.assert_refreshed()[0]['tasks_to_do_count'], 1)
+        self.task.priority = 'high'
+        self.task.save()
+        self.assertEqual(self.assert_refreshed()[0]['tasks_high_prio_count'], 1)
+        self.task.delete()
+        self.assertEqual(self.assert_refreshed()[0]['ticket_count'], 0)
+
+    def test_unlisted_task_changes_keep_the_list(self):
+        self.client.get(self.url)
+        self.task.title = 'Renamed'
+        self.task.status = 'done'
+        self.task.priority = 'medium'
+        self.task.save()
+        self.assert_cached()
+
+    def test_bulk_operations_invalidate(self):
+        self.client.get(self.url)
+        operations = [{'op': 'create', 'data': {'board': self.board.pk, 'title': 'New', 'status': 'to-do'}}]
+        self.assertEqual(self.client.post(reverse('tasks-bulk'), {'operations': operations}, format='json').status_code, 200)
+        board = self.assert_refreshed()[0]
+        self.assertEqual((board['ticket_count'], board['tasks_to_do_count']), (2, 1))
+
+    def test_member_profile_change_invalidates(self):
+        self.client.get(self.url)
+        self.other.last_name = 'Smith'
+        self.other.save()
+        names = [member['fullname'] for member in self.assert_refreshed()[0]['members']]
+        self.assertIn('other Smith', names)
+        self.other.save(update_fields=['last_login'])
+        self.assert_cached()
+
+    def test_paginated_requests_bypass_cache(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url, {'page_size': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(board_list_cache.stats()['hits'], 0)
+
+    def test_invalidation_during_fill_drops_entry(self):
+        state = board_list_cache.start_fill(self.user.pk)
+        board_list_cache.invalidate_boards([self.board.pk])
+        board_list_cache.set(self.user.pk, state, [self.board.pk], ['stale'])
+        self.assertIsNone(board_list_cache.get(self.user.pk))
+
+    def test_list_filled_before_commit_is_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.board.title = 'Renamed'
+            self.board.save()
+            state = board_list_cache.start_fill(self.user.pk)
+            board_list_cache.set(self.user.pk, state, [self.board.pk], ['stale'])
+            self.assertEqual(board_list_cache.get(self.user.pk), ['stale'])
+        self.assertIsNone(board_list_cache.get(self.user.pk))
+        self.assertEqual(self.assert_refreshed()[0]['title'], 'Renamed')
+
+    def test_disabled_cache(self):
+        board_list_cache.enabled = False
+        self.addCleanup(setattr, board_list_cache, 'enabled', True)
+        self.client.get(self.url)
+        self.assert_refreshed()
+
+
+class KeysetPaginationTests(TaskboardTestCase):
+    """
+    Tests for the opt-in keyset pagination of task, board and comment lists.
+    """
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            Task.objects.create(board=self.board, title=f'Task {index}', assignee=self.user, creator=self.user,
+                                due_date=date(2025, 1, 1 + index % 2))
+
+    def test_plain_list_is_not_paginated(self):
+        response = self.client.get(reverse('tasks-assignee'))
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+    def test_pages_follow_due_date_and_id(self):
+        url = reverse('tasks-assignee') + '?page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend((task['due_date'], task['id']) for task in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(seen, sorted(seen))
+
+    def test_board_list_pages(self):
+        Board.objects.create(title='Second', owner=self.user)
+        response = self.client.get(reverse('board-list') + '?page_size=1')
+        self.assertEqual(len(response.data['results']), 1)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['title'], 'Second')
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse('tasks-assignee') + '?cursor=broken')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_values_of_wrong_type_return_404(self):
+        def cursor(values):
+            return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        cases = [
+            (reverse('board-list'), ['x']),
+            (reverse('board-list'), [True]),
+            (reverse('tasks-assignee'), ['2025-01-01', 'x']),
+            (reverse('tasks-assignee'), [1, 1]),
+            (reverse('tasks-review'), ['2025-13-01', 1]),
+            (reverse('tasks-assignee') + '?ordering=priority', [None, '2025-01-01', 1]),
+            (reverse('tasks-review') + '?ordering=-priority', ['high', '2025-01-01', 1]),
+            (reverse('tasks-search') + '?q=task', ['best', 1]),
+        ]
+        for url, values in cases:
+            separator = '&' if '?' in url else '?'
+            response = self.client.get(f'{url}{separator}cursor={cursor(values)}')
+            self.assertEqual(response.status_code, 404, (url, values))
+        valid = self.client.get(reverse('tasks-search') + f"?q=task&cursor={cursor([0, 1])}")
+        self.assertEqual(valid.status_code, 200)
+
+
+class QueryPlanTests(TaskboardTestCase):
+    """
+    Runs EXPLAIN on every query issued by the taskboard endpoints.
+    Fails if any of them reads a table with a full scan instead of an index.
+    """
+    def setUp(self):
+        super().setUp()
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest('Query plans are only checked on SQLite and Postgres')
+        self.board.members.set([self.user, self.other])
+        self.task = Task.objects.create(board=self.board, title='Task', assignee=self.user, reviewer=self.other, creator=self.user)
+        self.comment = Comment.objects.create(task=self.task, author=self.user, content='hi')
+        self.client.force_authenticate(self.other)
+
+    def explain(self, sql):
+        """
+        Returns the plan lines for a captured statement on the active database.
+        """
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                return [row[-1] for row in cursor.fetchall()]
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + sql)
+            return [row[0] for row in cursor.fetchall()]
+
+    def full_scans(self, plan):
+        """
+        Returns the plan lines that describe a full table scan.
+        """
+        if connection.vendor == 'sqlite':
+            return [line for line in plan if re.fullmatch(r'SCAN \w+', line)]
+        return [line for line in plan if 'Seq Scan' in line]
+
+    def assert_indexed(self, method, url, data=None):
+        """
+        Calls an endpoint and asserts that none of its queries needs a full table scan.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 400, url)
+        for query in context.captured_queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+                continue
+            scans = self.full_scans(self.explain(sql))
+            self.assertEqual(scans, [], f'{method.upper()} {url} scans a full table:\n{sql}')
+
+    def test_board_endpoints(self):
+        self.assert_indexed('get', reverse('board-list'))
+        self.assert_indexed('get', reverse('board-list') + '?page_size=1')
+        self.assert_indexed('get', reverse('board-detail', kwargs={'pk': self.board.pk}))
+        self.assert_indexed('patch', reverse('board-detail', kwargs={'pk': self.board.pk}), {'title': 'Renamed'})
+
+    def test_task_endpoints(self):
+        self.assert_indexed('get', reverse('tasks-assignee'))
+        self.assert_indexed('get', reverse('tasks-review'))
+        self.assert_indexed('get', reverse('tasks-review') + '?page_size=1')
+        self.assert_indexed('get', reverse('tasks-detail', kwargs={'pk': self.task.pk}))
+        self.assert_indexed('post', reverse('tasks-list'), {'board': self.board.pk, 'title': 'New'})
+        self.assert_indexed('patch', reverse('tasks-detail', kwargs={'pk': self.task.pk}), {'status': 'done'})
+
+    def test_comment_endpoints(self):
+        url = reverse('comment-create', kwargs={'pk': self.task.pk})
+        self.assert_indexed('get', url)
+        self.assert_indexed('post', url, {'content': 'Hello'})
+        self.client.force_authenticate(self.user)
+        self.assert_indexed('delete', reverse('comment-delete', kwargs={'pk': self.task.pk, 'comment_id': self.comment.pk}))
+
+    def test_board_delete(self):
+        self.client.force_authenticate(self.user)
+        self.assert_indexed('delete', reverse('board-detail', kwargs={'pk': self.board.pk}))
+
+
+class BoardStatsTests(TaskboardTestCase):
+    """
+    Tests for the incrementally maintained BoardStats counters and their rebuild command.
+    """
+    def stats(self, board=None):
+        return BoardStats.objects.get(board=board or self.board)
+
+    def test_counters_follow_task_changes(self):
+        task = Task.objects.create(board=self.board, title='Task', status='to-do', priority='high', creator=self.user)
+        self.assertEqual((self.stats().ticket_count, self.stats().to_do_count, self.stats().high_priority_count), (1, 1, 1))
+
+        response = self.client.patch(reverse('tasks-detail', kwargs={'pk': task.pk}), {'status': 'done', 'priority': 'low'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        stats = self.stats()
+        self.assertEqual((stats.ticket_count, stats.to_do_count, stats.done_count), (1, 0, 1))
+        self.assertEqual((stats.high_priority_count, stats.low_priority_count), (0, 1))
+
+        self.client.delete(reverse('tasks-detail', kwargs={'pk': task.pk}))
+        self.assertEqual((self.stats().ticket_count, self.stats().done_count), (0, 0))
+
+    def test_moving_task_updates_both_boards(self):
+        other = Board.objects.create(title='Other', owner=self.user)
+        task = Task.objects.create(board=self.board, title='Task', creator=self.user)
+        task.board = other
+        task.save()
+        self.assertEqual(self.stats().ticket_count, 0)
+        self.assertEqual(self.stats(other).ticket_count, 1)
+
+    def test_board_list_reads_counters(self):
+        Task.objects.create(board=self.board, title='Task', priority='high', creator=self.user)
+        data = self.client.get(reverse('board-list')).data[0]
+        self.assertEqual((data['ticket_count'], data['tasks_to_do_count'], data['tasks_high_prio_count']), (1, 1, 1))
+
+    def test_stale_copies_count_from_the_stored_values(self):
+        task = Task.objects.create(board=self.board, title='Task', creator=self.user)
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        first.status = 'done'
+        first.save()
+        second.status = 'review'
+        second.save()
+        self.assertEqual(BoardStats.objects.get(board=self.board).review_count, 1)
+        first.delete()
+        second.delete()
+        stats = BoardStats.objects.filter(board=self.board).values(*BoardStats.counter_fields()).get()
+        self.assertEqual(stats, BoardStats.expected_counts()[self.board.pk])
+
+    def test_cascade_delete_removes_stats(self):
+        Task.objects.create(board=self.board, title='Task', creator=self.user)
+        self.board.delete()
+        self.assertFalse(BoardStats.objects.exists())
+
+    def test_rebuild_command_repairs_drift(self):
+        Task.objects.create(board=self.board, title='Task', creator=self.user)
+        BoardStats.objects.filter(board=self.board).update(ticket_count=7)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_board_stats', '--verify-only', stdout=StringIO())
+        call_command('rebuild_board_stats', stdout=StringIO())
+        self.assertEqual(self.stats().ticket_count, 1)
+
+
+class TaskBulkTests(TaskboardTestCase):
+    """
+    Tests for the bulk task endpoint, its permission checks and counter maintenance.
+    """
+    def setUp(self):
+        super().setUp()
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        self.task = Task.objects.create(board=self.board, title='Existing', creator=self.user)
+        self.doomed = Task.objects.create(board=self.board, title='Doomed', priority='high', creator=self.user)
+        self.url = reverse('tasks-bulk')
+
+    def test_mixed_operations_are_applied(self):
+        operations = [
+            {'op': 'create', 'data': {'board': self.board.pk, 'title': 'New', 'status': 'review'}},
+            {'op': 'update', 'id': self.task.pk, 'data': {'status': 'done', 'assignee_id': self.user.pk}},
+            {'op': 'delete', 'id': self.doomed.pk},
+        ]
+        response = self.client.post(self.url, {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 200, 204])
+        self.assertEqual(response.data['results'][1]['data']['assignee']['id'], self.user.pk)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'done')
+        self.assertFalse(Task.objects.filter(pk=self.doomed.pk).exists())
+        stats = BoardStats.objects.get(board=self.board)
+        self.assertEqual((stats.ticket_count, stats.review_count, stats.done_count, stats.high_priority_count), (2, 1, 1, 0))
+
+    def test_invalid_operation_rolls_back_batch(self):
+        operations = [
+            {'op': 'update', 'id': self.task.pk, 'data': {'status': 'done'}},
+            {'op': 'update', 'id': self.task.pk, 'data': {'title': 'Nope'}},
+            {'op': 'delete', 'id': 999},
+        ]
+        response = self.client.post(self.url, {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result['status'] for result in response.data['results']], [424, 400, 404])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'to-do')
+
+    def test_foreign_board_is_forbidden(self):
+        self.client.force_authenticate(self.stranger)
+        operations = [{'op': 'create', 'data': {'board': self.board.pk, 'title': 'New'}}]
+        response = self.client.post(self.url, {'operations': operations}, format='json')
+        self.assertEqual(response.data['results'][0]['status'], 403)
+
+    def test_removed_creator_cannot_delete(self):
+        self.board.members.add(self.stranger)
+        task = Task.objects.create(board=self.board, title='Mine', creator=self.stranger)
+        self.board.members.remove(self.stranger)
+        self.client.force_authenticate(self.stranger)
+        response = self.client.post(self.url, {'operations': [{'op': 'delete', 'id': task.pk}]}, format='json')
+        self.assertEqual(response.data['results'][0]['status'], 403)
+        self.assertTrue(Task.objects.filter(pk=task.pk).exists())
+        self.assertEqual(self.client.delete(reverse('tasks-detail', kwargs={'pk': task.pk})).status_code, 403)
+
+    def test_tasks_changed_after_validation(self):
+        validate = TaskBatch.validate
+
+        def validate_then_change(batch):
+            valid = validate(batch)
+            task = Task.objects.get(pk=self.task.pk)
+            task.status = 'done'
+            task.save()
+            return valid
+
+        operations = [{'op': 'update', 'id': self.task.pk, 'data': {'status': 'review'}}]
+        with mock.patch.object(TaskBatch, 'validate', validate_then_change):
+            self.assertEqual(self.client.post(self.url, {'operations': operations}, format='json').status_code, 200)
+        stats = BoardStats.objects.get(board=self.board)
+        self.assertEqual((stats.to_do_count, stats.review_count, stats.done_count), (1, 1, 0))
+
+        def validate_then_delete(batch):
+            valid = validate(batch)
+            self.doomed.delete()
+            return valid
+
+        operations = [{'op': 'update', 'id': self.task.pk, 'data': {'status': 'done'}}, {'op': 'delete', 'id': self.doomed.pk}]
+        with mock.patch.object(TaskBatch, 'validate', validate_then_delete):
+            response = self.client.post(self.url, {'operations': operations}, format='json')
+        self.assertEqual([result['status'] for result in response.data['results']], [424, 404])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'review')
+
+    def test_operation_limit(self):
+        operations = [{'op': 'delete', 'id': self.task.pk}] * 201
+        response = self.client.post(self.url, {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class ConditionalGetTests(TaskboardTestCase):
+    """
+    Tests for weak ETags and 304 responses on the polled board and task endpoints.
+    """
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(board=self.board, title='Task', assignee=self.user, creator=self.user)
+
+    def assert_revalidates(self, url, change):
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_board_detail_changes_with_tasks(self):
+        url = reverse('board-detail', kwargs={'pk': self.board.pk})
+        self.assert_revalidates(url, lambda: Task.objects.create(board=self.board, title='New', creator=self.user))
+        self.assert_revalidates(url, lambda: Comment.objects.create(task=self.task, author=self.user, content='hi'))
+        self.assert_revalidates(url, lambda: self.board.members.add(self.user))
+        self.assertIn('Last-Modified', self.client.get(url))
+
+    def test_assigned_tasks_change_with_comments(self):
+        url = reverse('tasks-assignee')
+        self.assert_revalidates(url, lambda: Comment.objects.create(task=self.task, author=self.user, content='hi'))
+        self.assert_revalidates(url, lambda: Task.objects.filter(pk=self.task.pk).delete())
+
+    def test_not_modified_skips_serialization(self):
+        url = reverse('board-detail', kwargs={'pk': self.board.pk})
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_validators_do_not_reveal_foreign_boards(self):
+        url = reverse('board-detail', kwargs={'pk': self.board.pk})
+        etag = self.client.get(url)['ETag']
+        future = 'Fri, 01 Jan 2100 00:00:00 GMT'
+        stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=future).status_code, 403)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=future).status_code, 401)
+
+    def test_profile_changes_revalidate(self):
+        reviewer = User.objects.create_user(username='reviewer', email='reviewer@example.com', password='pw')
+        Task.objects.filter(pk=self.task.pk).update(reviewer=reviewer)
+        self.board.members.add(self.user)
+
+        def rename(user, name):
+            def change():
+                user.last_name = name
+                user.save()
+            return change
+        url = reverse('board-detail', kwargs={'pk': self.board.pk})
+        self.assert_revalidates(url, rename(self.user, 'Owner'))
+        self.assert_revalidates(url, rename(reviewer, 'Reviewer'))
+        self.assert_revalidates(reverse('tasks-assignee'), rename(reviewer, 'Changed'))
+
+
+class BoardChangeFeedTests(TaskboardTestCase):
+    """
+    Tests for the board change log and the delta sync endpoint.
+    """
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('board-changes', kwargs={'pk': self.board.pk})
+
+    def test_returns_deltas_since_sequence(self):
+        since = self.client.get(self.url).data['last_seq']
+        task = Task.objects.create(board=self.board, title='Task', creator=self.user)
+        self.board.members.add(self.other)
+        comment = Comment.objects.create(task=task, author=self.user, content='hi')
+        task_id, comment_id = task.pk, comment.pk
+        task.delete()
+
+        response = self.client.get(self.url, {'since': since})
+        events = [(change['entity'], change['action'], change['object_id']) for change in response.data['changes']]
+        self.assertEqual(events, [
+            ('task', 'create', task_id),
+            ('member', 'create', self.other.pk),
+            ('comment', 'create', comment_id),
+            ('comment', 'delete', comment_id),
+            ('task', 'delete', task_id),
+        ])
+        self.assertEqual(response.data['changes'][1]['data']['email'], 'other@example.com')
+
+        last_seq = response.data['last_seq']
+        self.assertEqual(self.client.get(self.url, {'since': last_seq}).data['changes'], [])
+
+    def test_sequence_numbers_count_per_board(self):
+        other = Board.objects.create(title='Other', owner=self.user)
+        stale = Board.objects.get(pk=self.board.pk)
+        Task.objects.create(board=other, title='Elsewhere', creator=self.user)
+        operations = [{'op': 'create', 'data': {'board': self.board.pk, 'title': f'Task {number}'}} for number in range(3)]
+        self.client.post(reverse('tasks-bulk'), {'operations': operations}, format='json')
+        stale.title = 'Renamed'
+        stale.save()
+        Task.objects.create(board=self.board, title='Last', creator=self.user)
+
+        self.assertEqual(list(self.board.changes.order_by('id').values_list('seq', flat=True)), [1, 2, 3, 4, 5])
+        self.assertEqual(list(other.changes.values_list('seq', flat=True)), [1])
+        self.assertEqual(self.client.get(self.url).data['last_seq'], 5)
+        response = self.client.get(self.url, {'since': 3})
+        self.assertEqual([change['seq'] for change in response.data['changes']], [4, 5])
+
+    def test_board_delete_does_not_log(self):
+        Task.objects.create(board=self.board, title='Task', creator=self.user)
+        self.board.delete()
+        self.assertFalse(BoardChange.objects.exists())
+
+    def test_compacted_sequence_returns_410(self):
+        Task.objects.create(board=self.board, title='Task', creator=self.user)
+        BoardChange.objects.update(created_at=timezone.now() - timedelta(days=30))
+        call_command('compact_board_changes', stdout=StringIO())
+        self.assertEqual(self.client.get(self.url, {'since': 0}).status_code, 410)
+        last_seq = self.client.get(self.url).data['last_seq']
+        self.assertEqual(self.client.get(self.url, {'since': last_seq}).status_code, 200)
+
+    def test_non_member_is_rejected(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class BoardSocketTests(TaskboardTestCase):
+    """
+    Tests for the board WebSocket served by the ASGI application.
+    """
+    def setUp(self):
+        super().setUp()
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        self.token = Token.objects.create(user=self.user)
+
+    def scope(self, token, pk=None):
+        return {
+            'type': 'websocket',
+            'path': f'/ws/boards/{pk or self.board.pk}/',
+            'query_string': f'token={token}'.encode(),
+            'headers': [],
+        }
+
+    def connect(self, scope, action=None, replies=1):
+        """
+        Runs a socket session, performs the action once accepted and returns all sent messages.
+        """
+        async def session():
+            inbox, outbox = asyncio.Queue(), asyncio.Queue()
+            await inbox.put({'type': 'websocket.connect'})
+            socket = asyncio.ensure_future(board_socket(scope, inbox.get, outbox.put))
+            messages = [await asyncio.wait_for(outbox.get(), 5)]
+            if messages[0]['type'] == 'websocket.accept' and action:
+                await sync_to_async(action)()
+                for _ in range(replies):
+                    messages.append(await asyncio.wait_for(outbox.get(), 5))
+            await inbox.put({'type': 'websocket.disconnect', 'code': 1000})
+            await asyncio.wait_for(socket, 5)
+            return messages
+        return async_to_sync(session)()
+
+    def test_member_receives_committed_events(self):
+        def create_task():
+            with self.captureOnCommitCallbacks(execute=True):
+                Task.objects.create(board=self.board, title='Live', creator=self.user)
+        messages = self.connect(self.scope(self.token.key), create_task)
+        self.assertEqual(messages[0]['type'], 'websocket.accept')
+        event = json.loads(messages[1]['text'])
+        self.assertEqual((event['entity'], event['action'], event['data']['title']), ('task', 'create', 'Live'))
+
+    def test_board_deletion_closes_the_socket(self):
+        def delete_board():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.board.delete()
+        messages = self.connect(self.scope(self.token.key), delete_board, replies=2)
+        self.assertEqual(json.loads(messages[1]['text'])['action'], 'delete')
+        self.assertEqual(messages[2], {'type': 'websocket.close', 'code': 4404})
+
+    def test_owner_transfer_closes_the_old_owners_socket(self):
+        def transfer_board():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.board.owner = self.other
+                self.board.save()
+        messages = self.connect(self.scope(self.token.key), transfer_board, replies=2)
+        self.assertEqual(json.loads(messages[1]['text'])['data']['owner_id'], self.other.pk)
+        self.assertEqual(messages[2], {'type': 'websocket.close', 'code': 4403})
+
+    def test_invalid_token_is_rejected(self):
+        messages = self.connect(self.scope('nope'))
+        self.assertEqual(messages[0], {'type': 'websocket.close', 'code': 4401})
+
+    def test_non_member_is_rejected(self):
+        token = Token.objects.create(user=self.stranger)
+        self.assertEqual(self.connect(self.scope(token.key))[0]['code'], 4403)
+        self.assertEqual(self.connect(self.scope(self.token.key, pk=999))[0]['code'], 4404)
+
+
+class AsyncReadViewTests(TaskboardTestCase):
+    """
+    Tests that the async read endpoints return the same payloads as their sync counterparts.
+    """
+    def setUp(self):
+        super().setUp()
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        self.board.members.set([self.user])
+        Task.objects.create(board=self.board, title='Task', assignee=self.user, reviewer=self.user, creator=self.user)
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def assert_same_payload(self, sync_name, async_name, **kwargs):
+        sync_response = self.client.get(reverse(sync_name, kwargs=kwargs))
+        async_response = self.client.get(reverse(async_name, kwargs=kwargs))
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+    def test_payloads_match_sync_views(self):
+        self.assert_same_payload('board-list', 'async-board-list')
+        self.assert_same_payload('board-detail', 'async-board-detail', pk=self.board.pk)
+        self.assert_same_payload('tasks-assignee', 'async-tasks-assignee')
+        self.assert_same_payload('tasks-review', 'async-tasks-review')
+
+    def test_access_checks(self):
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse('async-board-list')).status_code, 401)
+        token = Token.objects.create(user=self.stranger)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(self.client.get(reverse('async-board-detail', kwargs={'pk': self.board.pk})).status_code, 403)
+        self.assertEqual(self.client.get(reverse('async-board-detail', kwargs={'pk': 999})).status_code, 404)
+
+    def test_board_deleted_after_role_check(self):
+        async def owner_role(user_id, board_id):
+            return OWNER
+        with mock.patch('taskboard.api.async_views.auser_board_role', owner_role):
+            self.assertEqual(self.client.get(reverse('async-board-detail', kwargs={'pk': 999})).status_code, 404)
+
+
+class TaskSearchTests(TaskboardTestCase):
+    """
+    Tests for the ranked full-text task search and its index triggers.
+    """
+    def setUp(self):
+        super().setUp()
+        self.foreign = Board.objects.create(title='Foreign', owner=self.other)
+
+    def search(self, query, **params):
+        return self.client.get(reverse('tasks-search'), {'q': query, **params})
+
+    def result_ids(self, response):
+        return [task['id'] for task in response.data['results']]
+
+    def test_ranks_title_hits_before_comment_hits(self):
+        commented = Task.objects.create(board=self.board, title='Cleanup', description='', creator=self.user)
+        Comment.objects.create(task=commented, author=self.user, content='the deploy failed again')
+        titled = Task.objects.create(board=self.board, title='Deploy pipeline', description='', creator=self.user)
+        Task.objects.create(board=self.foreign, title='Deploy elsewhere', creator=self.other)
+        response = self.search('deploy')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.result_ids(response), [titled.pk, commented.pk])
+        self.assertIsNone(response.data['next'])
+
+    def test_every_word_must_match_and_last_word_is_a_prefix(self):
+        match = Task.objects.create(board=self.board, title='Fix login', description='Token refresh fails', creator=self.user)
+        Task.objects.create(board=self.board, title='Fix layout', description='', creator=self.user)
+        self.assertEqual(self.result_ids(self.search('fix refr')), [match.pk])
+
+    def test_index_follows_changes(self):
+        task = Task.objects.create(board=self.board, title='Old name', creator=self.user)
+        comment = Comment.objects.create(task=task, author=self.user, content='banana')
+        self.assertEqual(self.result_ids(self.search('banana')), [task.pk])
+        comment.delete()
+        self.assertEqual(self.result_ids(self.search('banana')), [])
+        Task.objects.filter(pk=task.pk).update(title='New name')
+        self.assertEqual(self.result_ids(self.search('old')), [])
+        self.assertEqual(self.result_ids(self.search('new')), [task.pk])
+        task.delete()
+        self.assertEqual(self.result_ids(self.search('new')), [])
+
+    def test_cursor_pagination(self):
+        tasks = [Task.objects.create(board=self.board, title=f'Report {index}', creator=self.user) for index in range(5)]
+        first = self.search('report', page_size=2)
+        self.assertEqual(len(first.data['results']), 2)
+        second = self.client.get(first.data['next'])
+        third = self.client.get(second.data['next'])
+        ids = self.result_ids(first) + self.result_ids(second) + self.result_ids(third)
+        self.assertEqual(sorted(ids), [task.pk for task in tasks])
+        self.assertIsNone(third.data['next'])
+
+    def test_rejects_queries_without_words(self):
+        self.assertEqual(self.search('').status_code, 400)
+        self.assertEqual(self.search('"*()').status_code, 400)
+        Task.objects.create(board=self.board, title='Quote "AND" OR', creator=self.user)
+        self.assertEqual(self.search('"and OR').status_code, 200)
+
+
+class TaskFilterTests(TaskboardTestCase):
+    """
+    Tests for the whitelisted filters and orderings on the assigned and reviewing task lists.
+    """
+    def setUp(self):
+        super().setUp()
+        self.second = Board.objects.create(title='Second', owner=self.user)
+        today = timezone.localdate()
+        self.overdue = self.create_task(self.board, 'to-do', 'low', today - timedelta(days=2))
+        self.finished = self.create_task(self.board, 'done', 'high', today - timedelta(days=1))
+        self.upcoming = self.create_task(self.second, 'review', 'high', today + timedelta(days=3))
+        self.later = self.create_task(self.board, 'in-progress', 'medium', today + timedelta(days=10))
+
+    def create_task(self, board, status, priority, due_date):
+        return Task.objects.create(board=board, title=status, status=status, priority=priority, due_date=due_date,
+                                   assignee=self.user, creator=self.user)
+
+    def ids(self, url_name='tasks-assignee', **params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        return [task['id'] for task in results]
+
+    def test_default_order_is_due_date(self):
+        self.assertEqual(self.ids(), [self.overdue.pk, self.finished.pk, self.upcoming.pk, self.later.pk])
+
+    def test_filters(self):
+        self.assertEqual(self.ids(status='to-do,review'), [self.overdue.pk, self.upcoming.pk])
+        self.assertEqual(self.ids(priority='high'), [self.finished.pk, self.upcoming.pk])
+        self.assertEqual(self.ids(board=self.second.pk), [self.upcoming.pk])
+        today = timezone.localdate()
+        self.assertEqual(self.ids(due_after=today.isoformat(), due_before=(today + timedelta(days=5)).isoformat()), [self.upcoming.pk])
+        self.assertEqual(self.ids(overdue='true'), [self.overdue.pk])
+        self.assertEqual(self.ids(overdue='false'), [self.finished.pk, self.upcoming.pk, self.later.pk])
+
+    def test_orderings(self):
+        self.assertEqual(self.ids(ordering='-due_date'), [self.later.pk, self.upcoming.pk, self.finished.pk, self.overdue.pk])
+        self.assertEqual(self.ids(ordering='priority'), [self.finished.pk, self.upcoming.pk, self.later.pk, self.overdue.pk])
+        self.assertEqual(self.ids(ordering='-priority'), [self.overdue.pk, self.later.pk, self.finished.pk, self.upcoming.pk])
+
+    def test_keyset_pages_follow_the_ordering(self):
+        url = reverse('tasks-assignee')
+        response = self.client.get(url, {'ordering': 'priority', 'page_size': 3})
+        ids = [task['id'] for task in response.data['results']]
+        response = self.client.get(response.data['next'])
+        ids += [task['id'] for task in response.data['results']]
+        self.assertEqual(ids, [self.finished.pk, self.upcoming.pk, self.later.pk, self.overdue.pk])
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_parameters_are_rejected(self):
+        url = reverse('tasks-review')
+        for params in ({'status': 'open'}, {'board': 'x'}, {'due_after': '31.12.2024'}, {'overdue': 'yes'}, {'ordering': 'title'}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('error', response.data)
+
+    def test_async_list_applies_the_same_filters(self):
+        token = Token.objects.create(user=self.user)
+        response = self.client.get(reverse('async-tasks-assignee'), {'priority': 'high', 'ordering': '-due_date'},
+                                   HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual([task['id'] for task in response.json()], [self.upcoming.pk, self.finished.pk])
+        response = self.client.get(reverse('async-tasks-assignee'), {'status': 'open'}, HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(response.status_code, 400)
+
+
+class SparseFieldTests(TaskboardTestCase):
+    """
+    Tests for ?fields=, ?expand= and the compact mode with side-loaded users.
+    """
+    def setUp(self):
+        super().setUp()
+        self.board.members.set([self.user, self.other])
+        for index in range(3):
+            task = Task.objects.create(board=self.board, title=f'Task {index}', assignee=self.user, reviewer=self.other, creator=self.user)
+            Comment.objects.create(task=task, author=self.user, content='hi')
+
+    def test_head_requests(self):
+        urls = [
+            reverse('board-detail', kwargs={'pk': self.board.pk}),
+            reverse('tasks-assignee'),
+            reverse('tasks-review') + '?fields=id,title',
+            reverse('tasks-search') + '?q=task',
+            reverse('async-board-detail', kwargs={'pk': self.board.pk}),
+            reverse('async-tasks-assignee') + '?compact=true',
+        ]
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        for url in urls:
+            response = self.client.head(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(response.content, b'', url)
+
+    def test_default_payload_is_unchanged(self):
+        task = self.client.get(reverse('tasks-assignee')).data[0]
+        self.assertEqual(task['assignee']['id'], self.user.pk)
+        self.assertEqual(task['reviewer']['email'], 'other@example.com')
+        self.assertEqual(task['comments_count'], 1)
+
+    def test_sparse_fields_skip_joins_and_counts(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('tasks-assignee'), {'fields': 'id,title,status'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data[0]), {'id', 'title', 'status'})
+        task_query = [query['sql'] for query in queries if 'FROM "taskboard_task"' in query['sql']][-1]
+        self.assertNotIn('COUNT', task_query)
+        self.assertNotIn('auth_user', task_query)
+
+    def test_compact_mode_side_loads_each_user_once(self):
+        response = self.client.get(reverse('tasks-assignee'), {'compact': 'true'})
+        self.assertEqual(response.status_code, 200)
+        task = response.data['results'][0]
+        self.assertEqual(task['assignee'], self.user.pk)
+        self.assertEqual(task['reviewer'], self.other.pk)
+        self.assertEqual([user['id'] for user in response.data['users']], [self.user.pk, self.other.pk])
+
+    def test_expand_inlines_a_relation(self):
+        response = self.client.get(reverse('tasks-assignee'), {'compact': 'true', 'expand': 'assignee'})
+        task = response.data['results'][0]
+        self.assertEqual(task['assignee']['id'], self.user.pk)
+        self.assertEqual(task['reviewer'], self.other.pk)
+        self.assertEqual([user['id'] for user in response.data['users']], [self.other.pk])
+
+    def test_paginated_and_board_detail_payloads(self):
+        response = self.client.get(reverse('tasks-assignee'), {'compact': 'true', 'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIn('next', response.data)
+        self.assertEqual(len(response.data['users']), 2)
+        response = self.client.get(reverse('board-detail', kwargs={'pk': self.board.pk}), {'fields': 'id,assignee', 'compact': 'true'})
+        self.assertEqual(response.data['tasks'][0], {'id': response.data['tasks'][0]['id'], 'assignee': self.user.pk})
+        self.assertEqual([user['id'] for user in response.data['users']], [self.user.pk])
+
+    def test_unknown_names_are_rejected(self):
+        for params in ({'fields': 'id,secret'}, {'expand': 'creator'}, {'compact': 'yes'}):
+            self.assertEqual(self.client.get(reverse('tasks-assignee'), params).status_code, 400)
+            self.assertEqual(self.client.get(reverse('board-detail', kwargs={'pk': self.board.pk}), params).status_code, 400)
+
+    def test_async_list_supports_compact_mode(self):
+        token = Token.objects.create(user=self.user)
+        response = self.client.get(reverse('async-tasks-assignee'), {'compact': 'true', 'fields': 'id,reviewer'},
+                                   HTTP_AUTHORIZATION=f'Token {token.key}')
+        data = response.json()
+        self.assertEqual(set(data['results'][0]), {'id', 'reviewer'})
+        self.assertEqual([user['id'] for user in data['users']], [self.other.pk])
+
+
+class FastSerializerParityTests(TaskboardTestCase):
+    """
+    The fast read path must render byte-identical responses to the DRF serializers.
+    Every request is made with TASKBOARD_FAST_SERIALIZERS on and off and the bodies are compared.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user.last_name = 'Müller'
+        self.user.save()
+        self.board.title = 'Board ✓'
+        self.board.save()
+        self.board.members.set([self.other, self.user])
+        statuses = ['to-do', 'in-progress', 'review', 'done']
+        for index in range(8):
+            task = Task.objects.create(
+                board=self.board, title=f'Task "{index}"', description=None if index % 3 == 0 else f'Line\n{index}',
+                status=statuses[index % 4], priority=['low', 'medium', 'high'][index % 3],
+                assignee=self.user if index % 2 else None, reviewer=self.other if index % 3 else None,
+                due_date=date(2030, 1, 1) + timedelta(days=index % 4), creator=self.user,
+            )
+            for number in range(index % 3):
+                Comment.objects.create(task=task, author=self.other if number else self.user, content=f'Comment {number} ü')
+        self.task = task
+
+    def assert_same_body(self, url, params=None):
+        with self.settings(TASKBOARD_FAST_SERIALIZERS=False):
+            expected = self.client.get(url, params)
+        with self.settings(TASKBOARD_FAST_SERIALIZERS=True):
+            actual = self.client.get(url, params)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content)
+        return actual
+
+    def test_board_detail(self):
+        url = reverse('board-detail', kwargs={'pk': self.board.pk})
+        for params in ({}, {'fields': 'id,title,status'}, {'compact': 'true'}, {'compact': 'true', 'expand': 'reviewer'},
+                       {'fields': 'assignee,comments_count,due_date'}):
+            self.assert_same_body(url, params)
+
+    def test_task_lists(self):
+        for params in ({}, {'ordering': '-priority'}, {'status': 'review,done', 'fields': 'id,board,description'},
+                       {'compact': 'true', 'page_size': 2}, {'ordering': '-due_date', 'page_size': 3}):
+            response = self.assert_same_body(reverse('tasks-assignee'), params)
+        self.assertIsNotNone(response.data['next'])
+        self.assert_same_body(response.data['next'])
+
+    def test_comment_list(self):
+        url = reverse('comment-create', kwargs={'pk': self.task.pk})
+        response = self.assert_same_body(url)
+        self.assertEqual(len(response.data), 1)
+        self.assert_same_body(url, {'page_size': 1})
+
+
+
+class DatabaseConfigTests(TestCase):
+    """
+    Tests for the environment-driven database settings.
+    """
+    def test_sqlite_defaults(self):
+        config = database_config({}, Path('/srv/app'))
+        self.assertEqual(config['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(config['NAME'], Path('/srv/app/db.sqlite3'))
+        self.assertEqual(config['CONN_MAX_AGE'], 60)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual(config['OPTIONS']['timeout'], 5)
+        self.assertIn('PRAGMA journal_mode=WAL', config['OPTIONS']['init_command'])
+        self.assertIn('PRAGMA synchronous=NORMAL', config['OPTIONS']['init_command'])
+
+    def test_sqlite_overrides(self):
+        config = database_config({
+            'DB_NAME': '/data/taskboard.sqlite3', 'DB_CONN_MAX_AGE': 'none', 'DB_CONN_HEALTH_CHECKS': 'false',
+            'DB_SQLITE_BUSY_TIMEOUT': '20000', 'DB_SQLITE_MMAP_SIZE': '0',
+        }, Path('/srv/app'))
+        self.assertEqual(config['NAME'], '/data/taskboard.sqlite3')
+        self.assertIsNone(config['CONN_MAX_AGE'])
+        self.assertFalse(config['CONN_HEALTH_CHECKS'])
+        self.assertEqual(config['OPTIONS']['timeout'], 20)
+        self.assertIn('PRAGMA busy_timeout=20000', config['OPTIONS']['init_command'])
+        self.assertIn('PRAGMA mmap_size=0', config['OPTIONS']['init_command'])
+
+    def test_postgresql_pool(self):
+        env = {'DB_ENGINE': 'postgresql', 'DB_NAME': 'tasks', 'DB_HOST': 'db', 'DB_PORT': '5432', 'DB_USER': 'app'}
+        config = database_config(env, Path('/srv/app'))
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual((config['NAME'], config['HOST'], config['PORT'], config['USER']), ('tasks', 'db', '5432', 'app'))
+        self.assertEqual(config['CONN_MAX_AGE'], 60)
+        self.assertEqual(config['OPTIONS'], {})
+
+        config = database_config({**env, 'DB_POOL': 'true'}, Path('/srv/app'))
+        self.assertTrue(config['OPTIONS']['pool'])
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+
+    def test_replicas(self):
+        primary = database_config({}, Path('/srv/app'))
+        replicas = replica_configs({'DB_REPLICAS': '/data/a.sqlite3, /data/b.sqlite3'}, primary)
+        self.assertEqual(list(replicas), ['replica1', 'replica2'])
+        self.assertEqual(replicas['replica2']['NAME'], '/data/b.sqlite3')
+        self.assertEqual(replicas['replica1']['OPTIONS'], primary['OPTIONS'])
+        self.assertEqual(replicas['replica1']['TEST'], {'MIRROR': 'default'})
+        self.assertEqual(replica_configs({}, primary), {})
+
+        primary = database_config({'DB_ENGINE': 'postgresql', 'DB_HOST': 'db'}, Path('/srv/app'))
+        replicas = replica_configs({'DB_REPLICAS': 'db-replica'}, primary)
+        self.assertEqual((replicas['replica1']['HOST'], replicas['replica1']['NAME']), ('db-replica', 'taskboard'))
+
+    def test_invalid_values(self):
+        for env in ({'DB_ENGINE': 'oracle'}, {'DB_CONN_MAX_AGE': 'soon'}, {'DB_CONN_HEALTH_CHECKS': 'maybe'},
+                    {'DB_SQLITE_BUSY_TIMEOUT': '-1'}, {'DB_SQLITE_SYNCHRONOUS': 'FAST'}):
+            with self.assertRaises(ValueError):
+                database_config(env, Path('/srv/app'))
+
+    def test_pragmas_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+@override_settings(TASKBOARD_READ_REPLICAS={'ALIASES': ['default']})
+class ReplicaRoutingTests(TaskboardTestCase):
+    """
+    Tests for replica reads on the GET endpoints and sticky primary reads after a write.
+    The test database stands in for the replica, so the router's decisions are recorded.
+    The board list cache is disabled, as cached board lists are always filled from the primary.
+    """
+    def setUp(self):
+        super().setUp()
+        self.board.members.set([self.user])
+        self.routed = []
+        board_list_cache.enabled = False
+        self.addCleanup(setattr, board_list_cache, 'enabled', True)
+
+    def request(self, method, url, data=None):
+        self.routed = []
+        original = ReplicaRouter.db_for_read
+        def spy(replica_router, model, **hints):
+            alias = original(replica_router, model, **hints)
+            self.routed.append(alias)
+            return alias
+        with mock.patch.object(ReplicaRouter, 'db_for_read', spy):
+            return getattr(self.client, method)(url, data, format='json')
+
+    def test_router(self):
+        replica_router = ReplicaRouter()
+        self.assertIsNone(replica_router.db_for_read(Task))
+        with replica_reads('replica1'):
+            self.assertEqual(replica_router.db_for_read(Task), 'replica1')
+            self.assertEqual(router.db_for_write(Task), 'default')
+        self.assertEqual(router.db_for_read(Task), 'default')
+
+    def test_get_endpoints_read_from_replica(self):
+        for url in (reverse('board-list'), reverse('board-detail', kwargs={'pk': self.board.pk}),
+                    reverse('tasks-assignee'), reverse('email-check') + '?email=owner@example.com'):
+            response = self.request('get', url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('default', self.routed, url)
+
+    def test_reads_stick_to_primary_after_write(self):
+        response = self.request('post', reverse('tasks-list'), {'board': self.board.pk, 'title': 'New', 'status': 'to-do', 'priority': 'low'})
+        self.assertEqual(response.status_code, 201)
+        self.request('get', reverse('board-detail', kwargs={'pk': self.board.pk}))
+        self.assertEqual(set(self.routed), {None})
+
+        recent_writers.clear()
+        self.request('get', reverse('board-detail', kwargs={'pk': self.board.pk}))
+        self.assertIn('default', self.routed)
+
+    def test_failed_write_does_not_stick(self):
+        response = self.request('post', reverse('tasks-list'), {'board': self.board.pk})
+        self.assertEqual(response.status_code, 400)
+        self.request('get', reverse('board-list'))
+        self.assertIn('default', self.routed)
+
+    def test_permission_lookups_use_primary(self):
+        task = Task.objects.create(board=self.board, title='a', status='to-do', priority='low', creator=self.user)
+        self.request('get', reverse('tasks-detail', kwargs={'pk': task.pk}))
+        self.assertEqual(self.routed[0], None)
+        self.assertIn('default', self.routed)
+
+    def test_replica_board_list_is_not_cached(self):
+        self.request('get', reverse('board-list'))
+        self.assertIsNone(membership_cache.get_visible_board_ids(self.user.pk))
+
+    @override_settings(TASKBOARD_READ_REPLICAS={'ALIASES': []})
+    def test_without_replicas(self):
+        self.request('get', reverse('board-list'))
+        self.assertEqual(set(self.routed), {None})
+
+
+@override_settings(REQUEST_METRICS={'ENABLED': True, 'SERVER_TIMING': True, 'QUERY_ALARM': 30, 'TOKEN': 'secret'})
+class RequestMetricsTests(TaskboardTestCase):
+    """
+    Tests for the request metrics middleware, the Server-Timing header and the /metrics endpoint.
+    """
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+        self.board.members.set([self.user])
+
+    def test_server_timing_counts_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('board-list'))
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        for name in ('db', 'serialize', 'render', 'total'):
+            self.assertRegex(timing, rf'{name};dur=\d+\.\d')
+
+    def test_metrics_endpoint(self):
+        response = self.client.get(reverse('board-list'))
+        self.client.get(reverse('board-list'))
+        metrics = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(metrics.status_code, 200)
+        self.assertTrue(metrics['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = metrics.content.decode()
+        self.assertIn('http_requests_total{view="board-list",method="GET",status="200"} 2', text)
+        self.assertIn('http_request_queries_count{view="board-list"} 2', text)
+        self.assertIn(f'http_response_size_bytes_sum{{view="board-list"}} {2 * len(response.content)}', text)
+        self.assertIn('# TYPE http_request_db_seconds summary', text)
+
+    @override_settings(REQUEST_METRICS={'QUERY_ALARM': 1, 'TOKEN': 'secret'})
+    def test_query_alarm(self):
+        with self.assertLogs('core.metrics', 'WARNING') as logs:
+            self.client.get(reverse('board-list'))
+            board_list_cache.clear()
+            response = self.client.get(reverse('board-list'))
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn('Query alarm: GET /api/boards/ (board-list)', logs.output[0])
+        self.assertNotIn('Server-Timing', response)
+        self.assertIn('http_request_query_alarms_total{view="board-list"} 2', self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').content.decode())
+
+    @override_settings(REQUEST_METRICS={'TOKEN': 'secret'})
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(REQUEST_METRICS={'TOKEN': None})
+    def test_metrics_hidden_without_token(self):
+        self.client.get(reverse('board-list'))
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code, 404)
+
+    @override_settings(REQUEST_METRICS={'ENABLED': False})
+    def test_disabled(self):
+        response = self.client.get(reverse('board-list'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+
+class BenchmarkCommandTests(TaskboardTestCase):
+    """
+    Tests for the synthetic dataset generator and the API benchmark harness.
+    """
+    def generate(self, *args):
+        output = StringIO()
+        call_command('generate_dataset', '--users', '12', '--boards', '4', '--tasks-per-board', '6',
+                     '--comments-per-task', '1', '--seed', '7', *args, stdout=output)
+        return output.getvalue()
+
+    def snapshot(self):
+        boards = Board.objects.filter(owner__username__startswith='bench-').order_by('id')
+        return [
+            (board.title, board.owner.username, sorted(board.members.values_list('username', flat=True)),
+             list(board.tasks.order_by('id').values_list('title', 'status', 'priority', 'assignee__username')))
+            for board in boards
+        ]
+
+    def test_generate_dataset(self):
+        output = self.generate()
+        self.assertIn('Created 12 users, 4 boards', output)
+        self.assertEqual(User.objects.filter(email_lookup__email__startswith='bench-').count(), 12)
+        for board in Board.objects.filter(owner__username__startswith='bench-'):
+            self.assertIn(board.owner_id, board.members.values_list('id', flat=True))
+            self.assertTrue(set(board.tasks.values_list('assignee_id', flat=True)) <= {None, *board.members.values_list('id', flat=True)})
+        stats = {stats.board_id: {field: getattr(stats, field) for field in BoardStats.counter_fields()} for stats in BoardStats.objects.all()}
+        self.assertEqual(stats, BoardStats.expected_counts())
+
+    def test_generate_dataset_is_reproducible(self):
+        self.generate()
+        first = self.snapshot()
+        with self.assertRaises(CommandError):
+            self.generate()
+        self.generate('--clear')
+        self.assertEqual(self.snapshot(), first)
+
+    @override_settings(ALLOWED_HOSTS=['localhost'])
+    def test_benchmark_covers_every_route(self):
+        self.generate()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            errors = StringIO()
+            call_command('benchmark_api', '--requests', '2', '--login-requests', '1', '--warmup', '0', '--json', path,
+                         stdout=StringIO(), stderr=errors)
+            with open(path) as file:
+                report = json.load(file)
+
+        self.assertEqual(errors.getvalue(), '')
+        self.assertEqual(report['dataset']['users'], User.objects.count())
+        routes = {result['route'] for result in report['results']}
+        self.assertEqual(routes, {'board-list', 'board-detail', 'board-changes', 'tasks-list', 'tasks-bulk', 'tasks-search',
+                                  'tasks-detail', 'tasks-assignee', 'tasks-review', 'comment-create', 'comment-delete',
+                                  'async-board-list', 'async-board-detail', 'async-tasks-assignee', 'async-tasks-review',
+                                  'registration', 'login', 'email-check'})
+        for result in report['results']:
+            self.assertTrue(all(code.startswith('2') for code in result['statuses']), result)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertGreater(result['queries'], 0)
+        self.assertFalse(Board.objects.filter(title='Benchmark scratch').exists())
+        self.assertFalse(User.objects.filter(username__startswith='bench-register-').exists())
+        self.assertFalse(Token.objects.exists())
+
+    @override_settings(ALLOWED_HOSTS=['localhost'])
+    def test_benchmark_outside_the_dataset_keeps_existing_rows(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_api', '--user-id', self.user.pk, stdout=StringIO())
+        scratch = Board.objects.create(title='Benchmark scratch', owner=self.user)
+        token = Token.objects.create(user=self.user)
+        boards = set(Board.objects.values_list('id', flat=True))
+        call_command('benchmark_api', '--user-id', self.user.pk, '--yes', '--requests', '1', '--login-requests', '1',
+                     '--warmup', '0', '--only', 'board create,board detail', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(set(Board.objects.values_list('id', flat=True)), boards)
+        self.assertTrue(Board.objects.filter(pk=scratch.pk).exists())
+        self.assertEqual(list(Token.objects.values_list('key', flat=True)), [token.key])
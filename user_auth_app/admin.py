@@ -1,4 +1,5 @@
 from django.contrib import admin
-from user_auth_app.models import UserProfile
+from user_auth_app.models import UserProfile, UserEmail
 
-admin.site.register(UserProfile)
\ No newline at end of file
+admin.site.register(UserProfile)
+admin.site.register(UserEmail)
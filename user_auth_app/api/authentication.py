@@ -0,0 +1,89 @@
+from copy import copy
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+from taskboard.api.membership_cache import LocalLRUCache
+
+
+DEFAULTS = {
+    'MAX_SIZE': 10000,
+    'TTL': 300,
+}
+
+
+class TokenCache:
+    """
+    Process-local LRU cache mapping token keys to their token with the user loaded.
+    Keeps the key of every cached user so the entry can be dropped when the user changes.
+    """
+    def __init__(self, max_size, ttl):
+        self.store = LocalLRUCache(max_size, ttl)
+
+    def get(self, key):
+        """
+        Returns a copy of the cached token and user, or None on a miss.
+        Copies keep requests from sharing mutable model instances.
+        """
+        token = self.store.get(('token', key))
+        if token is None:
+            return None
+        token = copy(token)
+        token.user = copy(token.user)
+        return token
+
+    def set(self, token):
+        """
+        Stores a token whose user is already loaded.
+        """
+        self.store.set(('token', token.key), token)
+        self.store.set(('user', token.user_id), token.key)
+
+    def invalidate_token(self, key):
+        """
+        Drops a single token, e.g. after it was deleted or rotated.
+        """
+        self.store.delete_many([('token', key)])
+
+    def invalidate_user(self, user_id):
+        """
+        Drops the cached token of a user, e.g. after the user was deactivated or edited.
+        """
+        key = self.store.get(('user', user_id))
+        keys = [('user', user_id)]
+        if key is not None:
+            keys.append(('token', key))
+        self.store.delete_many(keys)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        self.store.clear()
+
+
+def build_token_cache():
+    """
+    Creates the token cache from the USER_AUTH_TOKEN_CACHE setting.
+    """
+    config = {**DEFAULTS, **getattr(settings, 'USER_AUTH_TOKEN_CACHE', {})}
+    return TokenCache(config['MAX_SIZE'], config['TTL'])
+
+
+token_cache = build_token_cache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that serves repeated lookups of the same key from the token cache.
+    Signals drop entries when a token is deleted or its user is saved or deleted.
+    """
+    def authenticate_credentials(self, key):
+        """
+        Returns (user, token) from the cache or falls back to the database lookup and caches the result.
+        Inactive users and unknown keys are rejected by the parent class and never cached.
+        """
+        token = token_cache.get(key)
+        if token is not None:
+            return (token.user, token)
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(token)
+        return (user, token)
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.db import IntegrityError, transaction
+from user_auth_app.hashers import run_hashing
+from user_auth_app.models import UserEmail
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -41,17 +44,17 @@ class RegistrationSerializer(serializers.ModelSerializer):
         
     def validate_email(self, value):
         """
-        Ensures that the provided email is not already in use.
+        Ensures that the provided email is not already in use, ignoring case.
         Raises a validation error if a duplicate is found.
         """
-        if User.objects.filter(email=value).exists():
+        if UserEmail.objects.filter(email=UserEmail.normalize(value)).exists():
             raise serializers.ValidationError('Email already exists')
         return value
 
     def save(self):
         """
         Parses full name into username and last_name, checks passwords, and creates the user.
-        Raises an error if passwords do not match or other validation fails.
+        Raises an error if passwords do not match, or on the clashing field if the email or name is taken.
         """
         fullname = self.validated_data['fullname']
         pw = self.validated_data['password']
@@ -71,8 +74,19 @@ class RegistrationSerializer(serializers.ModelSerializer):
         if pw != repeated_pw:
             raise serializers.ValidationError({'error': 'Passwords dont match'})
         
-        account.set_password(pw)
-        account.save()
+        if User.objects.filter(username=username).exists():
+            raise serializers.ValidationError({'fullname': ['A user with this name already exists']})
+
+        run_hashing(account.set_password, pw)
+        try:
+            with transaction.atomic():
+                account.save()
+        except IntegrityError:
+            if UserEmail.objects.filter(email=UserEmail.normalize(account.email)).exists():
+                raise serializers.ValidationError({'email': ['Email already exists']})
+            if User.objects.filter(username=username).exists():
+                raise serializers.ValidationError({'fullname': ['A user with this name already exists']})
+            raise
         return account
     
 class LoginTokenSerializer(serializers.Serializer):
@@ -85,18 +99,10 @@ class LoginTokenSerializer(serializers.Serializer):
 
     def validate(self, payload):
         """
-        Authenticates the user using email and password.
+        Authenticates the user through the email backend with a single user lookup.
         Adds the authenticated user to the validated payload or raises an error on failure.
         """
-        payload_email = payload.get('email')
-        payload_password = payload.get('password')
-
-        try:
-            user = User.objects.get(email=payload_email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Email or password is not match")
-
-        user = authenticate(username=user.username, password=payload_password)
+        user = authenticate(self.context.get('request'), email=payload.get('email'), password=payload.get('password'))
         if not user:
             raise serializers.ValidationError("Email or password is not match")
 
@@ -5,6 +5,8 @@ from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from django.contrib.auth.models import User
 from rest_framework.authtoken.views import ObtainAuthToken
+from user_auth_app.models import UserEmail
+from taskboard.replicas import ReplicaReadMixin
 from .serializers import RegistrationSerializer, LoginTokenSerializer, UserProfileSerializer
 
 
@@ -49,7 +51,7 @@ class CustomLoginView(ObtainAuthToken):
         Authenticates user via email and password, and returns token with user info.
         Returns 400 with error message if authentication fails.
         """
-        serializer = LoginTokenSerializer(data=request.data)
+        serializer = LoginTokenSerializer(data=request.data, context={'request': request})
         data = {}
 
         if serializer.is_valid():
@@ -67,7 +69,7 @@ class CustomLoginView(ObtainAuthToken):
         return Response(data)
 
 
-class EmailCheckView(APIView):
+class EmailCheckView(ReplicaReadMixin, APIView):
     """
     APIView to verify existence of a user by email and return basic user info.
     Requires authentication and handles missing or not found email cases with appropriate errors.
@@ -76,7 +78,7 @@ class EmailCheckView(APIView):
 
     def get(self, request):
         """
-        Checks if a user with the given email exists and returns basic user data.
+        Checks if a user with the given email exists, ignoring case, and returns basic user data.
         Returns 400 if email is missing and 404 if no user is found.
         """
         check_email = request.query_params.get('email')
@@ -85,7 +87,7 @@ class EmailCheckView(APIView):
             return Response({'error': 'No valid email'} ,status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            user = User.objects.get(email=check_email)
+            user = User.objects.get(email_lookup__email=UserEmail.normalize(check_email))
             user_data = UserProfileSerializer(user).data
             return Response(user_data)
         except User.DoesNotExist:
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UserAuthAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user_auth_app'
+
+    def ready(self):
+        """
+        Connects the signal handlers that keep the token cache consistent.
+        """
+        import user_auth_app.signals
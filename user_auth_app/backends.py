@@ -0,0 +1,62 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from user_auth_app.hashers import arun_hashing, hash_password, check_encoded_password, acheck_encoded_password
+from user_auth_app.models import UserEmail
+
+
+UserModel = get_user_model()
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticates by email and password with a single user lookup.
+    Hashing runs in the bounded hashing pool and outdated hashes are upgraded after a successful login.
+    """
+    def get_user_by_email(self, email):
+        """
+        Returns the user with the email, matched case-insensitively through the unique lookup index.
+        Returns None if there is no such user.
+        """
+        try:
+            return UserModel._default_manager.get(email_lookup__email=UserEmail.normalize(email))
+        except UserModel.DoesNotExist:
+            return None
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        """
+        Returns the active user matching email and password, or None.
+        Unknown emails still cost one hash so they cannot be told apart by timing.
+        """
+        if email is None or password is None:
+            return None
+        user = self.get_user_by_email(email)
+        if user is None:
+            hash_password(password)
+            return None
+        is_correct, must_update = check_encoded_password(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = hash_password(password)
+            user.save(update_fields=['password'])
+        return user
+
+    async def aauthenticate(self, request, email=None, password=None, **kwargs):
+        """
+        Async variant of authenticate; the event loop is never blocked by hashing.
+        """
+        if email is None or password is None:
+            return None
+        user = await sync_to_async(self.get_user_by_email)(email)
+        if user is None:
+            await arun_hashing(make_password, password)
+            return None
+        is_correct, must_update = await acheck_encoded_password(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = await arun_hashing(make_password, password)
+            await user.asave(update_fields=['password'])
+        return user
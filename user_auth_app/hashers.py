@@ -0,0 +1,66 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import BCryptSHA256PasswordHasher, make_password, verify_password
+
+
+DEFAULTS = {
+    'BCRYPT_ROUNDS': 12,
+    'THREADS': 4,
+}
+
+
+def hashing_config():
+    """
+    Returns the USER_AUTH_PASSWORD_HASHING setting merged with the defaults.
+    """
+    return {**DEFAULTS, **getattr(settings, 'USER_AUTH_PASSWORD_HASHING', {})}
+
+
+class TunedBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """
+    bcrypt_sha256 hasher whose work factor comes from USER_AUTH_PASSWORD_HASHING['BCRYPT_ROUNDS'].
+    Changing the rounds makes stored hashes outdated, so they are rehashed on the next login.
+    """
+    @property
+    def rounds(self):
+        return hashing_config()['BCRYPT_ROUNDS']
+
+
+hashing_pool = ThreadPoolExecutor(max_workers=hashing_config()['THREADS'], thread_name_prefix='password-hashing')
+
+
+def run_hashing(func, *args):
+    """
+    Runs a hashing function in the bounded pool and waits for the result.
+    Caps the number of concurrent hashes per process so login storms cannot take every worker thread.
+    """
+    return hashing_pool.submit(func, *args).result()
+
+
+async def arun_hashing(func, *args):
+    """
+    Runs a hashing function in the bounded pool without blocking the event loop.
+    """
+    return await asyncio.wrap_future(hashing_pool.submit(func, *args))
+
+
+def hash_password(password):
+    """
+    Returns the encoded password for the preferred hasher, computed in the hashing pool.
+    """
+    return run_hashing(make_password, password)
+
+
+def check_encoded_password(password, encoded):
+    """
+    Returns (is_correct, must_update) for an encoded password, computed in the hashing pool.
+    """
+    return run_hashing(verify_password, password, encoded)
+
+
+async def acheck_encoded_password(password, encoded):
+    """
+    Async variant of check_encoded_password.
+    """
+    return await arun_hashing(verify_password, password, encoded)
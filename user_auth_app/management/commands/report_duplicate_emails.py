@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from user_auth_app.models import UserEmail
+
+
+class Command(BaseCommand):
+    """
+    Management command listing users that cannot log in by email because they have no email lookup row.
+    These are mostly accounts sharing an address with another account from before emails were unique.
+    With --sync it creates the missing rows of users whose address is free.
+    """
+    help = 'Reports users without an email lookup row, e.g. because their email is shared with another account.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true', help='Create the lookup rows of addresses that are not taken.')
+
+    def handle(self, *args, **options):
+        """
+        Prints every user that still cannot log in by email and raises CommandError if there are any.
+        """
+        missing = [
+            (user_id, username, UserEmail.normalize(email))
+            for user_id, username, email in User.objects.filter(email_lookup__isnull=True).order_by('id').values_list('id', 'username', 'email')
+            if UserEmail.normalize(email)
+        ]
+        holders = dict(UserEmail.objects.filter(email__in={email for _, _, email in missing}).values_list('email', 'user_id'))
+
+        created = []
+        problems = []
+        for user_id, username, email in missing:
+            holder = holders.get(email)
+            if holder is None and options['sync']:
+                holders[email] = user_id
+                created.append(UserEmail(user_id=user_id, email=email))
+            elif holder is None:
+                problems.append(f'User {user_id} ({username}) has no lookup row for {email}; run with --sync to create it.')
+            else:
+                problems.append(f'User {user_id} ({username}) shares {email} with user {holder} and cannot log in by email.')
+
+        if created:
+            UserEmail.objects.bulk_create(created)
+            self.stdout.write(f'Created {len(created)} email lookup rows.')
+        for problem in problems:
+            self.stdout.write(problem)
+        if problems:
+            raise CommandError(f'{len(problems)} users cannot log in by email; change the shared addresses to resolve this.')
+        self.stdout.write(self.style.SUCCESS('Every user with an email can log in by email.'))
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:22
+
+import logging
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_user_emails(apps, schema_editor):
+    """
+    Creates the normalized email lookup row for every user with an email.
+    If several users share an email, the most recently active one gets the row, the lowest ID winning ties.
+    The others cannot log in by email until their address is changed; they are logged here and
+    listed by "manage.py report_duplicate_emails".
+    """
+    User = apps.get_model('auth', 'User')
+    UserEmail = apps.get_model('user_auth_app', 'UserEmail')
+
+    owners = {}
+    users = []
+    for user_id, email, last_login in User.objects.exclude(email='').order_by('id').values_list('id', 'email', 'last_login'):
+        normalized = email.strip().lower()
+        if not normalized:
+            continue
+        users.append((user_id, normalized))
+        current = owners.get(normalized)
+        if current is None or (last_login is not None and (current[1] is None or last_login > current[1])):
+            owners[normalized] = (user_id, last_login)
+
+    UserEmail.objects.bulk_create(
+        [UserEmail(user_id=user_id, email=email) for email, (user_id, last_login) in owners.items()],
+        batch_size=1000,
+    )
+
+    skipped_ids = [user_id for user_id, email in users if owners[email][0] != user_id]
+    if skipped_ids:
+        logger.warning(
+            'Users sharing their email with another account cannot log in by email: %s. '
+            'Run "manage.py report_duplicate_emails" for details.', ', '.join(map(str, skipped_ids)),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('user_auth_app', '0002_remove_userprofile_bio_remove_userprofile_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserEmail',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='email_lookup', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_user_emails, migrations.RunPython.noop),
+    ]
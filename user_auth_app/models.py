@@ -1,6 +1,5 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db import models
 
 class UserProfile(models.Model):
     """
@@ -13,4 +12,26 @@ class UserProfile(models.Model):
         """
         Returns the username of the associated user for readable display in admin or logs.
         """
-        return self.user.username
\ No newline at end of file
+        return self.user.username
+
+
+class UserEmail(models.Model):
+    """
+    Normalized, uniquely indexed email of a user used for every lookup by email.
+    auth_user.email is neither indexed nor unique, so logins and checks go through this table instead.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='email_lookup')
+    email = models.EmailField(unique=True)
+
+    @staticmethod
+    def normalize(email):
+        """
+        Returns the lookup form of an email: stripped and lowercased.
+        """
+        return (email or '').strip().lower()
+
+    def __str__(self):
+        """
+        Returns the normalized email for readable display in admin or logs.
+        """
+        return self.email
@@ -0,0 +1,62 @@
+import logging
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from user_auth_app.api.authentication import token_cache
+from user_auth_app.models import UserEmail
+
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Token)
+def forget_rotated_token(sender, instance, **kwargs):
+    """
+    Drops the previously cached token of the user when a token is created or rotated.
+    """
+    token_cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    """
+    Drops a deleted token so it stops authenticating immediately.
+    """
+    token_cache.invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_token(sender, instance, **kwargs):
+    """
+    Drops the cached token of a user that was saved or deleted, e.g. after deactivation.
+    """
+    token_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def sync_user_email(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """
+    Keeps the normalized email lookup row in line with auth_user.email.
+    Creating a user with an email another user already has raises an IntegrityError, which registration reports.
+    Existing users sharing an email, e.g. legacy duplicates, keep their current row and the conflict is logged.
+    """
+    if raw or (update_fields is not None and 'email' not in update_fields):
+        return
+    email = UserEmail.normalize(instance.email)
+    if created:
+        if email:
+            UserEmail.objects.create(user=instance, email=email)
+    elif email:
+        try:
+            with transaction.atomic():
+                UserEmail.objects.update_or_create(user=instance, defaults={'email': email})
+        except IntegrityError:
+            logger.warning(
+                'User %s uses an email that belongs to another account; its email lookup row was not updated. '
+                'Run "manage.py report_duplicate_emails" to list all conflicts.', instance.pk,
+            )
+    else:
+        UserEmail.objects.filter(user=instance).delete()
@@ -1,3 +1,241 @@
-from django.test import TestCase
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.contrib.auth import aauthenticate
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from user_auth_app.api.authentication import token_cache
+from user_auth_app.models import UserEmail
 
-# Create your tests here.
+
+FAST_PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class TokenCacheTests(TestCase):
+    """
+    Tests that repeated token lookups are cached and that stale tokens stop working immediately.
+    """
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='cached', email='cached@example.com', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = reverse('email-check') + '?email=cached@example.com'
+
+    def test_repeated_requests_skip_the_token_query(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], 'cached@example.com')
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(self.url)
+        self.token.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_rotated_token_replaces_the_old_one(self):
+        self.client.get(self.url)
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {new_token.key}')
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_login_and_registration_return_working_tokens(self):
+        client = APIClient()
+        response = client.post(reverse('registration'), {
+            'fullname': 'fresh user',
+            'email': 'fresh@example.com',
+            'password': 'secret-pw',
+            'repeated_password': 'secret-pw',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        user = User.objects.get(email='fresh@example.com')
+        self.assertEqual(response.data['token'], Token.objects.get(user=user).key)
+
+        response = client.post(reverse('login'), {'email': 'fresh@example.com', 'password': 'secret-pw'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['token'], Token.objects.get(user=user).key)
+        self.assertEqual(response.data['user_id'], user.pk)
+
+        client.credentials(HTTP_AUTHORIZATION=f'Token {response.data["token"]}')
+        self.assertEqual(client.get(reverse('email-check') + '?email=fresh@example.com').status_code, 200)
+
+
+@override_settings(USER_AUTH_PASSWORD_HASHING={'BCRYPT_ROUNDS': 4})
+class EmailLoginTests(TestCase):
+    """
+    Tests for the email authentication backend, the bcrypt hasher setup and rehashing on login.
+    Uses the lowest bcrypt work factor to keep the tests fast.
+    """
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='login', email='login@example.com', password='secret-pw')
+        self.client = APIClient()
+
+    def login(self, password='secret-pw'):
+        return self.client.post(reverse('login'), {'email': 'login@example.com', 'password': password}, format='json')
+
+    def test_new_passwords_use_bcrypt(self):
+        self.assertTrue(self.user.password.startswith('bcrypt_sha256$'))
+
+    def test_login_looks_up_the_user_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.login()
+        self.assertEqual(response.status_code, 200)
+        user_queries = [query for query in queries if 'FROM "auth_user"' in query['sql']]
+        self.assertEqual(len(user_queries), 1)
+
+    def test_wrong_password_and_unknown_email_are_rejected(self):
+        self.assertEqual(self.login('wrong').status_code, 400)
+        response = self.client.post(reverse('login'), {'email': 'nobody@example.com', 'password': 'secret-pw'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_pbkdf2_hash_is_upgraded_on_login(self):
+        self.user.password = make_password('secret-pw', hasher='pbkdf2_sha256')
+        self.user.save()
+        self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('bcrypt_sha256$'))
+        self.assertTrue(self.user.check_password('secret-pw'))
+
+    def test_changed_rounds_trigger_rehash(self):
+        with self.settings(USER_AUTH_PASSWORD_HASHING={'BCRYPT_ROUNDS': 5}):
+            self.assertEqual(self.login().status_code, 200)
+            self.user.refresh_from_db()
+            self.assertEqual(self.user.password.split('$')[3], '05')
+
+    def test_async_authentication(self):
+        user = async_to_sync(aauthenticate)(None, email='login@example.com', password='secret-pw')
+        self.assertEqual(user, self.user)
+        self.assertIsNone(async_to_sync(aauthenticate)(None, email='login@example.com', password='wrong'))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class UserEmailLookupTests(TestCase):
+    """
+    Tests for the normalized email lookup used by registration, login and the email check.
+    """
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='mixed', email='Mixed.Case@Example.com', password='secret-pw')
+        self.client = APIClient()
+
+    def test_lookup_row_follows_the_user_email(self):
+        self.assertEqual(self.user.email_lookup.email, 'mixed.case@example.com')
+        self.user.email = 'New@Example.com'
+        self.user.save()
+        self.assertEqual(UserEmail.objects.get(user=self.user).email, 'new@example.com')
+        self.user.email = ''
+        self.user.save()
+        self.assertFalse(UserEmail.objects.filter(user=self.user).exists())
+
+    def test_registration_rejects_email_in_other_case(self):
+        response = self.client.post(reverse('registration'), {
+            'fullname': 'other user',
+            'email': 'MIXED.case@example.com',
+            'password': 'pw-secret',
+            'repeated_password': 'pw-secret',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_registration_reports_the_clashing_field(self):
+        response = self.client.post(reverse('registration'), {
+            'fullname': 'mixed Other',
+            'email': 'other@example.com',
+            'password': 'pw-secret',
+            'repeated_password': 'pw-secret',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fullname', response.data)
+        self.assertNotIn('email', response.data)
+
+    def test_backfill_logs_nothing_without_duplicates(self):
+        migration = import_module('user_auth_app.migrations.0003_user_email')
+        UserEmail.objects.all().delete()
+        with self.assertNoLogs('user_auth_app.migrations.0003_user_email'):
+            migration.backfill_user_emails(apps, None)
+
+    def test_login_and_email_check_ignore_case(self):
+        response = self.client.post(reverse('login'), {'email': 'mixed.case@EXAMPLE.com', 'password': 'secret-pw'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {response.data["token"]}')
+        response = self.client.get(reverse('email-check') + '?email=MIXED.CASE@example.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], self.user.pk)
+
+    def test_lookup_uses_the_unique_index(self):
+        queryset = User.objects.filter(email_lookup__email='mixed.case@example.com')
+        plan = queryset.explain()
+        self.assertNotIn('SCAN user_auth_app_useremail', plan)
+
+    def test_backfill_keeps_the_most_recently_active_duplicate(self):
+        migration = import_module('user_auth_app.migrations.0003_user_email')
+        older, newer = User.objects.bulk_create([
+            User(username='older', email='Dup@example.com', last_login=timezone.now() - timedelta(days=3)),
+            User(username='newer', email='dup@example.com ', last_login=timezone.now()),
+        ])
+        UserEmail.objects.all().delete()
+        with self.assertLogs('user_auth_app.migrations.0003_user_email', 'WARNING') as logs:
+            migration.backfill_user_emails(apps, None)
+        self.assertIn(f'cannot log in by email: {older.pk}.', logs.output[0])
+        self.assertEqual(UserEmail.objects.get(email='dup@example.com').user_id, newer.pk)
+        self.assertEqual(UserEmail.objects.get(user=self.user).email, 'mixed.case@example.com')
+        self.assertEqual(UserEmail.objects.count(), 2)
+
+    def create_legacy_duplicate(self):
+        duplicate = User.objects.bulk_create([User(username='legacy', email='mixed.case@example.com')])[0]
+        return User.objects.get(pk=duplicate.pk)
+
+    def test_backfill_logs_skipped_duplicates(self):
+        migration = import_module('user_auth_app.migrations.0003_user_email')
+        duplicate = self.create_legacy_duplicate()
+        UserEmail.objects.all().delete()
+        with self.assertLogs('user_auth_app.migrations.0003_user_email', 'WARNING') as logs:
+            migration.backfill_user_emails(apps, None)
+        self.assertIn(f'cannot log in by email: {duplicate.pk}.', logs.output[0])
+        self.assertEqual(UserEmail.objects.get().user_id, self.user.pk)
+
+    def test_saving_a_legacy_duplicate_keeps_working(self):
+        duplicate = self.create_legacy_duplicate()
+        duplicate.first_name = 'Legacy'
+        with self.assertLogs('user_auth_app.signals', 'WARNING'):
+            duplicate.save()
+        self.assertFalse(UserEmail.objects.filter(user=duplicate).exists())
+        duplicate.email = 'legacy@example.com'
+        duplicate.save()
+        self.assertEqual(duplicate.email_lookup.email, 'legacy@example.com')
+
+    def test_report_duplicate_emails(self):
+        duplicate = self.create_legacy_duplicate()
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('report_duplicate_emails', stdout=out)
+        self.assertIn(f'User {duplicate.pk} (legacy) shares mixed.case@example.com with user {self.user.pk}', out.getvalue())
+
+        self.user.email = 'moved@example.com'
+        self.user.save()
+        call_command('report_duplicate_emails', '--sync', stdout=StringIO())
+        self.assertEqual(UserEmail.objects.get(user=duplicate).email, 'mixed.case@example.com')
+        call_command('report_duplicate_emails', stdout=StringIO())